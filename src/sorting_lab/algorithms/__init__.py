@@ -3,40 +3,75 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import partial
 from typing import Any, Callable, Sequence
 
+from .auto_sort import sort as auto_sort
+from .heap_sort import bottom_up_sort as heap_bottom_up_sort
 from .heap_sort import sort as heap_sort
+from .merge_sort import natural_sort
 from .merge_sort import sort as merge_sort
+from .parallel_merge import sort as parallel_merge_sort
+from .quick_sort import introsort
 from .quick_sort import sort as quick_sort
 from .radix_sort import sort as radix_sort
 from .shell_sort import sort as shell_sort
 
 
-AlgorithmFunc = Callable[[Sequence[Any]], tuple[list[Any], list[list[Any]]]]
+AlgorithmFunc = Callable[[Sequence[Any]], tuple[list[Any], Sequence[list[Any]]]]
 
 
 @dataclass(frozen=True)
 class Algorithm:
     key: str
     name: str
-    func: Callable[..., tuple[list[Any], list[list[Any]]]]
+    func: Callable[..., tuple[list[Any], Sequence[list[Any]]]]
+    # NumPy-aware algorithms take ndarrays (e.g. memory-mapped datasets) as-is;
+    # the rest get a list of Python ints so comparisons stay on the fast path.
+    accepts_arrays: bool = False
+    # Takes a ``workers`` option that spreads the sort over threads or processes.
+    parallel: bool = False
 
 
 ALGORITHMS: dict[str, Algorithm] = {
     "quick": Algorithm("quick", "Quick Sort", quick_sort),
+    "intro": Algorithm("intro", "Introsort", introsort),
     "heap": Algorithm("heap", "Heap Sort", heap_sort),
+    "heap_floyd": Algorithm("heap_floyd", "Heap Sort (Floyd)", heap_bottom_up_sort),
     "shell": Algorithm("shell", "Shell Sort", shell_sort),
     "merge": Algorithm("merge", "Merge Sort", merge_sort),
-    "radix": Algorithm("radix", "Radix Sort", radix_sort),
+    "natural": Algorithm("natural", "Natural Merge Sort", natural_sort),
+    "parallel_merge": Algorithm(
+        "parallel_merge", "Parallel Merge Sort", parallel_merge_sort, accepts_arrays=True, parallel=True
+    ),
+    "radix": Algorithm("radix", "Radix Sort", radix_sort, accepts_arrays=True, parallel=True),
+    "radix_py": Algorithm("radix_py", "Radix Sort (Python)", partial(radix_sort, backend="python")),
+    # Samples the input and dispatches to radix, natural, intro or insertion sort.
+    "auto": Algorithm("auto", "Auto (Adaptive)", auto_sort, accepts_arrays=True),
 }
 
 
-def run_algorithm(key: str, data: Sequence[Any], *, record_steps: bool = False, step_limit: int = 400) -> tuple[list[Any], list[list[Any]]]:
-    """Run an algorithm by key, returning sorted output and optional steps."""
+def run_algorithm(
+    key: str,
+    data: Sequence[Any],
+    *,
+    record_steps: bool = False,
+    step_limit: int | None = 400,
+    **options: Any,
+) -> tuple[list[Any], Sequence[list[Any]]]:
+    """Run an algorithm by key, returning sorted output and optional steps.
+
+    Recorded steps come back as a ``StepLog`` whose frame 0 is the input
+    (``step_limit=None`` records every operation). Extra keyword ``options`` are forwarded to the algorithm (e.g.
+    ``digit_bits`` for radix). NumPy arrays, including memory-mapped datasets, are
+    converted to lists only for algorithms that cannot consume them directly.
+    """
     algo = ALGORITHMS.get(key)
     if not algo:
         raise ValueError(f"Unknown algorithm key: {key}")
-    return algo.func(data, record_steps=record_steps, step_limit=step_limit)
+    if not algo.accepts_arrays and not isinstance(data, list) and hasattr(data, "tolist"):
+        data = data.tolist()
+    return algo.func(data, record_steps=record_steps, step_limit=step_limit, **options)
 
 
 def available_algorithms() -> list[Algorithm]:
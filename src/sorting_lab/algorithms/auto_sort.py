@@ -0,0 +1,237 @@
+"""Adaptive dispatcher: samples the input and hands it to the best-suited algorithm."""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+from dataclasses import asdict, dataclass, fields
+from numbers import Integral
+from pathlib import Path
+from typing import Any, List, Sequence, TypeVar
+
+import numpy as np
+
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+PROFILE_ENV = "SORTING_LAB_AUTO_PROFILE"
+CHOICES = ("insertion", "natural", "radix", "intro")
+
+_INT64_MIN = -(1 << 63)
+_INT64_MAX = (1 << 63) - 1
+_UINT64_MAX = (1 << 64) - 1
+
+
+@dataclass(frozen=True)
+class AutoProfile:
+    """Dispatch thresholds.
+
+    The defaults come from timing ``radix``, ``natural``, ``intro`` and insertion sort
+    on the stress datasets from 8 to 200k elements; ``save_profile`` / ``load_profile``
+    exchange them as JSON so a profile measured on another machine can be reused.
+    """
+
+    # At most this many elements: plain insertion sort.
+    insertion_max_n: int = 16
+    # Sampled disorder (min of descent and ascent share) at or below which one pass of
+    # natural merge sort beats everything, radix included.
+    sorted_max_disorder: float = 0.002
+    # Integers from this size use radix when the sampled range is narrow...
+    radix_min_n: int = 64
+    narrow_range_ratio: float = 1 << 16
+    # ...and from this size whatever the range.
+    radix_wide_min_n: int = 256
+    # Otherwise natural merge sort handles inputs with long runs...
+    natural_max_disorder: float = 0.1
+    # ...unless duplicates are common, where introsort's three-way partitioning wins.
+    intro_min_dup_ratio: float = 0.5
+    sample_size: int = 1024
+    sample_windows: int = 16
+
+
+@dataclass(frozen=True)
+class Features:
+    n: int
+    sampled: int
+    descents: float
+    ascents: float
+    dup_ratio: float
+    range_ratio: float | None
+    integer: bool
+
+    @property
+    def disorder(self) -> float:
+        # Strictly descending runs are reversed by natural merge sort, so both
+        # directions count as presorted.
+        return min(self.descents, self.ascents)
+
+
+@dataclass(frozen=True)
+class Decision:
+    algorithm: str
+    reason: str
+    features: Features
+
+
+def load_profile(path: str | Path) -> AutoProfile:
+    """Read thresholds from a JSON object; missing keys keep their defaults."""
+    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    if not isinstance(data, dict):
+        raise ValueError(f"{path} must hold a JSON object of thresholds.")
+    known = {f.name for f in fields(AutoProfile)}
+    unknown = sorted(set(data) - known)
+    if unknown:
+        raise ValueError(f"Unknown auto profile keys: {', '.join(unknown)}")
+    return AutoProfile(**data)
+
+
+def save_profile(profile: AutoProfile, path: str | Path) -> Path:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(asdict(profile), indent=2) + "\n", encoding="utf-8")
+    return path
+
+
+_profile: AutoProfile | None = None
+
+
+def set_profile(profile: AutoProfile | str | Path | None) -> AutoProfile:
+    """Install the process-wide profile (an ``AutoProfile`` or a JSON path); ``None`` resets it."""
+    global _profile
+    if profile is None:
+        _profile = None
+        return default_profile()
+    _profile = profile if isinstance(profile, AutoProfile) else load_profile(profile)
+    return _profile
+
+
+def default_profile() -> AutoProfile:
+    """Installed profile, else the JSON file named by ``SORTING_LAB_AUTO_PROFILE``, else defaults."""
+    global _profile
+    if _profile is None:
+        path = os.getenv(PROFILE_ENV, "").strip()
+        _profile = load_profile(path) if path else AutoProfile()
+    return _profile
+
+
+def _sample(items: Sequence[Any], profile: AutoProfile) -> List[List[Any]]:
+    """Evenly spaced windows of consecutive elements (the whole input when it is small)."""
+    n = len(items)
+    if n <= profile.sample_size:
+        return [list(items)]
+    windows = max(1, profile.sample_windows)
+    width = max(2, profile.sample_size // windows)
+    step = (n - width) / max(1, windows - 1)
+    return [list(items[int(k * step) : int(k * step) + width]) for k in range(windows)]
+
+
+def sample_features(items: Sequence[Any], profile: AutoProfile | None = None) -> Features:
+    """Estimate run structure, duplicates, value range and element type from a sample."""
+    profile = profile or default_profile()
+    n = len(items)
+    if isinstance(items, np.ndarray):
+        integer = items.dtype.kind in "iu"
+    else:
+        integer = None
+    windows = _sample(items, profile)
+    pairs = descents = ascents = 0
+    for window in windows:
+        for a, b in zip(window, window[1:]):
+            pairs += 1
+            if b < a:
+                descents += 1
+            elif a < b:
+                ascents += 1
+    values = [value for window in windows for value in window]
+    if integer is None:
+        integer = all(isinstance(value, Integral) for value in values)
+    try:
+        distinct = len(set(values))
+    except TypeError:
+        distinct = len(values)
+    range_ratio = None
+    if integer and values:
+        lo, hi = min(values), max(values)
+        # Radix keys must fit in int64, or uint64 when nothing is negative.
+        if _INT64_MIN <= lo and hi <= (_INT64_MAX if lo < 0 else _UINT64_MAX):
+            range_ratio = (int(hi) - int(lo)) / n
+    return Features(
+        n=n,
+        sampled=len(values),
+        descents=descents / pairs if pairs else 0.0,
+        ascents=ascents / pairs if pairs else 0.0,
+        dup_ratio=1 - distinct / len(values) if values else 0.0,
+        range_ratio=range_ratio,
+        integer=integer,
+    )
+
+
+def choose(items: Sequence[Any], profile: AutoProfile | None = None) -> Decision:
+    """Pick one of ``CHOICES`` for ``items`` from sampled features and profile thresholds."""
+    profile = profile or default_profile()
+    features = sample_features(items, profile)
+    n = features.n
+    if n <= profile.insertion_max_n:
+        return Decision("insertion", f"n={n} <= {profile.insertion_max_n}", features)
+    if features.disorder <= profile.sorted_max_disorder:
+        return Decision("natural", f"disorder {features.disorder:.4f} <= {profile.sorted_max_disorder}", features)
+    if features.range_ratio is not None and n >= profile.radix_min_n:
+        if features.range_ratio <= profile.narrow_range_ratio:
+            return Decision("radix", f"integers, range/n {features.range_ratio:.3g}", features)
+        if n >= profile.radix_wide_min_n:
+            return Decision("radix", f"integers, n={n} >= {profile.radix_wide_min_n}", features)
+    if features.disorder <= profile.natural_max_disorder and features.dup_ratio < profile.intro_min_dup_ratio:
+        return Decision("natural", f"disorder {features.disorder:.4f}, duplicates {features.dup_ratio:.2f}", features)
+    return Decision("intro", f"disorder {features.disorder:.4f}, duplicates {features.dup_ratio:.2f}", features)
+
+
+def sort(
+    items: Sequence[T],
+    *,
+    record_steps: bool = False,
+    step_limit: int | None = 400,
+    profile: AutoProfile | str | Path | None = None,
+) -> tuple[list[T], Sequence[list[T]]]:
+    """Sort items with the algorithm ``choose`` picks, logging the decision.
+
+    Insertion sort runs as introsort with a cutoff covering the whole input. If the
+    sample missed non-integer values, radix rejects them and introsort takes over.
+    """
+    from sorting_lab.algorithms import run_algorithm
+
+    if profile is not None and not isinstance(profile, AutoProfile):
+        profile = load_profile(profile)
+    decision = choose(items, profile)
+    logger.info("auto: %s for n=%d (%s)", decision.algorithm, decision.features.n, decision.reason)
+    options: dict[str, Any] = {"record_steps": record_steps, "step_limit": step_limit}
+    if decision.algorithm == "radix":
+        try:
+            return run_algorithm("radix", items, **options)
+        except ValueError:
+            logger.info("auto: radix rejected the input, falling back to intro")
+            return run_algorithm("intro", _as_list(items), **options)
+    if decision.algorithm == "insertion":
+        return run_algorithm("intro", _as_list(items), cutoff=max(1, len(items)), **options)
+    return run_algorithm(decision.algorithm, _as_list(items), **options)
+
+
+def _as_list(items: Sequence[T]) -> Sequence[T]:
+    return items.tolist() if hasattr(items, "tolist") and not isinstance(items, list) else items
+
+
+__all__ = [
+    "AutoProfile",
+    "CHOICES",
+    "Decision",
+    "Features",
+    "PROFILE_ENV",
+    "choose",
+    "default_profile",
+    "load_profile",
+    "sample_features",
+    "save_profile",
+    "set_profile",
+    "sort",
+]
@@ -1,19 +1,88 @@
 from __future__ import annotations
 
-from typing import List, MutableSequence, Sequence, TypeVar
+from typing import List, Sequence, TypeVar
+
+from .steps import new_log, steps_of
 
 T = TypeVar("T")
 
 
-def _record_state(states: list[list[T]], arr: MutableSequence[T], record_steps: bool, step_limit: int) -> None:
-    if record_steps and len(states) < step_limit:
-        states.append(list(arr))
+def _heap_sort_fast(arr: List[T]) -> None:
+    """Uninstrumented twin of sort(): the same swaps with heapify unrolled into a loop."""
+
+    def heapify(n: int, i: int) -> None:
+        while True:
+            largest = i
+            l = 2 * i + 1
+            r = l + 1
+            if l < n and arr[l] > arr[largest]:
+                largest = l
+            if r < n and arr[r] > arr[largest]:
+                largest = r
+            if largest == i:
+                return
+            arr[i], arr[largest] = arr[largest], arr[i]
+            i = largest
+
+    n = len(arr)
+    for i in range(n // 2 - 1, -1, -1):
+        heapify(n, i)
+    for i in range(n - 1, 0, -1):
+        arr[i], arr[0] = arr[0], arr[i]
+        heapify(i, 0)
+
+
+def _bottom_up_fast(arr: List[T], arity: int) -> None:
+    """Uninstrumented twin of bottom_up_sort()."""
 
+    def sift(start: int, end: int) -> None:
+        item = arr[start]
+        hole = start
+        child = arity * hole + 1
+        if arity == 2:
+            while child < end:
+                if child + 1 < end and arr[child + 1] > arr[child]:
+                    child += 1
+                arr[hole] = arr[child]
+                hole = child
+                child = 2 * hole + 1
+        else:
+            while child < end:
+                best = child
+                last = child + arity
+                if last > end:
+                    last = end
+                for c in range(child + 1, last):
+                    if arr[c] > arr[best]:
+                        best = c
+                arr[hole] = arr[best]
+                hole = best
+                child = arity * hole + 1
+        while hole > start:
+            parent = (hole - 1) // arity
+            if not item > arr[parent]:
+                break
+            arr[hole] = arr[parent]
+            hole = parent
+        arr[hole] = item
 
-def sort(items: Sequence[T], *, record_steps: bool = False, step_limit: int = 400) -> tuple[list[T], list[list[T]]]:
+    n = len(arr)
+    for i in range((n - 2) // arity, -1, -1):
+        sift(i, n)
+    for end in range(n - 1, 0, -1):
+        arr[end], arr[0] = arr[0], arr[end]
+        sift(0, end)
+
+
+def sort(
+    items: Sequence[T], *, record_steps: bool = False, step_limit: int | None = 400
+) -> tuple[list[T], Sequence[list[T]]]:
     """Sort items using heap sort and optionally capture states."""
     arr: List[T] = list(items)
-    steps: list[list[T]] = []
+    if not record_steps:
+        _heap_sort_fast(arr)
+        return arr, []
+    log = new_log(arr, record_steps, step_limit)
     n = len(arr)
 
     def heapify(n: int, i: int) -> None:
@@ -27,7 +96,7 @@ def sort(items: Sequence[T], *, record_steps: bool = False, step_limit: int = 40
             largest = r
         if largest != i:
             arr[i], arr[largest] = arr[largest], arr[i]
-            _record_state(steps, arr, record_steps, step_limit)
+            log.swap(i, largest)
             heapify(n, largest)
 
     # Build max heap
@@ -37,10 +106,80 @@ def sort(items: Sequence[T], *, record_steps: bool = False, step_limit: int = 40
     # Extract elements
     for i in range(n - 1, 0, -1):
         arr[i], arr[0] = arr[0], arr[i]
-        _record_state(steps, arr, record_steps, step_limit)
+        log.swap(i, 0)
         heapify(i, 0)
 
-    return arr, steps
+    return arr, steps_of(log)
+
+
+def bottom_up_sort(
+    items: Sequence[T],
+    *,
+    record_steps: bool = False,
+    step_limit: int | None = 400,
+    arity: int = 2,
+) -> tuple[list[T], Sequence[list[T]]]:
+    """Sort items using iterative heap sort with Floyd's bottom-up sift.
+
+    Each sift walks the hole down to a leaf along the largest child (``arity - 1``
+    comparisons per level instead of ``arity``), then moves the displaced element
+    back up, which rarely travels far. ``arity`` selects a binary, ternary, 4-ary...
+    heap; wider heaps are shallower.
+    """
+    if arity < 2:
+        raise ValueError("arity must be at least 2.")
+    arr: List[T] = list(items)
+    if not record_steps:
+        _bottom_up_fast(arr, arity)
+        return arr, []
+    log = new_log(arr, record_steps, step_limit)
+    n = len(arr)
+
+    def sift(start: int, end: int) -> None:
+        item = arr[start]
+        hole = start
+        child = arity * hole + 1
+        if arity == 2:
+            while child < end:
+                if child + 1 < end and arr[child + 1] > arr[child]:
+                    child += 1
+                arr[hole] = arr[child]
+                log.set(hole, arr[child])
+                hole = child
+                child = 2 * hole + 1
+        else:
+            while child < end:
+                best = child
+                last = child + arity
+                if last > end:
+                    last = end
+                for c in range(child + 1, last):
+                    if arr[c] > arr[best]:
+                        best = c
+                arr[hole] = arr[best]
+                log.set(hole, arr[best])
+                hole = best
+                child = arity * hole + 1
+        while hole > start:
+            parent = (hole - 1) // arity
+            if not item > arr[parent]:
+                break
+            arr[hole] = arr[parent]
+            log.set(hole, arr[parent])
+            hole = parent
+        arr[hole] = item
+        log.set(hole, item)
+
+    # Floyd construction: sift every internal node, deepest first.
+    for i in range((n - 2) // arity, -1, -1):
+        sift(i, n)
+
+    for end in range(n - 1, 0, -1):
+        arr[end], arr[0] = arr[0], arr[end]
+        log.swap(end, 0)
+        sift(0, end)
+
+    return arr, steps_of(log)
 
 
-__all__ = ["sort"]
+__all__ = ["bottom_up_sort", "sort"]
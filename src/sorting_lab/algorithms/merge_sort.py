@@ -1,55 +1,374 @@
 from __future__ import annotations
 
-from typing import List, MutableSequence, Sequence, TypeVar
+from bisect import bisect_left, bisect_right
+from typing import List, Sequence, TypeVar
+
+from .steps import new_log, steps_of
 
 T = TypeVar("T")
 
+MIN_GALLOP = 7
+# Longest slice taken in one piece when copying between merge buffers.
+COPY_CHUNK = 1024
 
-def _record_state(states: list[list[T]], arr: MutableSequence[T], record_steps: bool, step_limit: int) -> None:
-    if record_steps and len(states) < step_limit:
-        states.append(list(arr))
 
+def _copy(src: List[T], start: int, dst: List[T], at: int, count: int) -> None:
+    """dst[at:at+count] = src[start:start+count], through slices of at most COPY_CHUNK items.
 
-def sort(items: Sequence[T], *, record_steps: bool = False, step_limit: int = 400) -> tuple[list[T], list[list[T]]]:
-    """Sort items using merge sort and optionally capture states."""
-    arr: List[T] = list(items)
-    steps: list[list[T]] = []
+    A single slice would allocate a temporary list as long as the copied range (up
+    to n on the last pass); chunking keeps that bound constant at C copy speed.
+    """
+    for offset in range(0, count, COPY_CHUNK):
+        step = min(COPY_CHUNK, count - offset)
+        dst[at + offset : at + offset + step] = src[start + offset : start + offset + step]
 
-    def merge_sort(sub: List[T], left: int, right: int) -> None:
-        if left >= right:
-            return
-        mid = (left + right) // 2
-        merge_sort(sub, left, mid)
-        merge_sort(sub, mid + 1, right)
-        merge(sub, left, mid, right)
-
-    def merge(sub: List[T], left: int, mid: int, right: int) -> None:
-        left_part = sub[left : mid + 1]
-        right_part = sub[mid + 1 : right + 1]
-        i = j = 0
-        k = left
-        while i < len(left_part) and j < len(right_part):
-            if left_part[i] <= right_part[j]:
-                sub[k] = left_part[i]
-                i += 1
+
+def _merge_sort_fast(src: List[T]) -> List[T]:
+    """Uninstrumented twin of sort(); returns whichever buffer holds the result."""
+    n = len(src)
+    dst: List[T] = src[:]
+    width = 1
+    while width < n:
+        for lo in range(0, n, 2 * width):
+            mid = min(lo + width, n)
+            hi = min(lo + 2 * width, n)
+            if mid >= hi or src[mid - 1] <= src[mid]:
+                _copy(src, lo, dst, lo, hi - lo)
+                continue
+            i, j, k = lo, mid, lo
+            while i < mid and j < hi:
+                if src[j] < src[i]:
+                    dst[k] = src[j]
+                    j += 1
+                else:
+                    dst[k] = src[i]
+                    i += 1
+                k += 1
+            if i < mid:
+                _copy(src, i, dst, k, mid - i)
             else:
-                sub[k] = right_part[j]
+                _copy(src, j, dst, k, hi - j)
+        src, dst = dst, src
+        width *= 2
+    return src
+
+
+def sort(
+    items: Sequence[T], *, record_steps: bool = False, step_limit: int | None = 400
+) -> tuple[list[T], Sequence[list[T]]]:
+    """Sort items using bottom-up merge sort and optionally capture states.
+
+    Runs of doubling width are merged back and forth between the working list and a
+    single auxiliary buffer, so the sort needs n extra slots; ordered pairs and merge
+    tails are copied in slices of at most ``COPY_CHUNK`` items, so no temporary grows
+    with n. Pairs whose halves are already in order are copied across instead of merged.
+    Recorded steps show each merge writing its output over the logical array.
+    """
+    src: List[T] = list(items)
+    n = len(src)
+    if n >= 2 and not record_steps:
+        return _merge_sort_fast(src), []
+    log = new_log(src, record_steps, step_limit)
+    if n < 2:
+        return src, steps_of(log)
+    dst: List[T] = src[:]
+
+    def merge(lo: int, mid: int, hi: int) -> None:
+        i, j, k = lo, mid, lo
+        while i < mid and j < hi:
+            if src[j] < src[i]:
+                dst[k] = src[j]
                 j += 1
+            else:
+                dst[k] = src[i]
+                i += 1
+            log.set(k, dst[k])
             k += 1
-            _record_state(steps, arr, record_steps, step_limit)
-        while i < len(left_part):
-            sub[k] = left_part[i]
-            i += 1
-            k += 1
-            _record_state(steps, arr, record_steps, step_limit)
-        while j < len(right_part):
-            sub[k] = right_part[j]
-            j += 1
-            k += 1
-            _record_state(steps, arr, record_steps, step_limit)
+        if i < mid:
+            _copy(src, i, dst, k, mid - i)
+        else:
+            _copy(src, j, dst, k, hi - j)
+        if record_steps:
+            log.set_range(k, dst[k:hi])
+
+    width = 1
+    while width < n:
+        for lo in range(0, n, 2 * width):
+            mid = min(lo + width, n)
+            hi = min(lo + 2 * width, n)
+            if mid >= hi or src[mid - 1] <= src[mid]:
+                _copy(src, lo, dst, lo, hi - lo)
+            else:
+                merge(lo, mid, hi)
+        src, dst = dst, src
+        width *= 2
+    return src, steps_of(log)
+
+
+def _min_run(n: int) -> int:
+    """Timsort's minimum run length: n / 2**k rounded up, within [32, 64]."""
+    r = 0
+    while n >= 64:
+        r |= n & 1
+        n >>= 1
+    return n + r
+
+
+def _node_power(s1: int, n1: int, n2: int, n: int) -> int:
+    """Powersort depth of the boundary between runs [s1, s1+n1) and [s1+n1, s1+n1+n2)."""
+    a = 2 * s1 + n1
+    b = a + n1 + n2
+    power = 0
+    while True:
+        power += 1
+        if a >= n:
+            a -= n
+            b -= n
+        elif b >= n:
+            return power
+        a <<= 1
+        b <<= 1
+
+
+def _gallop_right(key: T, a: Sequence[T], lo: int, hi: int) -> int:
+    """First index in a[lo:hi] holding a value greater than key (exponential + binary search)."""
+    prev, ofs = lo, 1
+    while lo + ofs - 1 < hi and not key < a[lo + ofs - 1]:
+        prev = lo + ofs
+        ofs <<= 1
+    return bisect_right(a, key, prev, min(lo + ofs - 1, hi))
+
+
+def _gallop_left(key: T, a: Sequence[T], lo: int, hi: int) -> int:
+    """First index in a[lo:hi] holding a value not less than key (exponential + binary search)."""
+    prev, ofs = lo, 1
+    while lo + ofs - 1 < hi and a[lo + ofs - 1] < key:
+        prev = lo + ofs
+        ofs <<= 1
+    return bisect_left(a, key, prev, min(lo + ofs - 1, hi))
+
+
+def _natural_sort_fast(arr: List[T]) -> None:
+    """Uninstrumented twin of natural_sort()."""
+    n = len(arr)
+
+    def count_run(lo: int) -> int:
+        hi = lo + 1
+        if hi == n:
+            return 1
+        if arr[hi] < arr[lo]:
+            while hi + 1 < n and arr[hi + 1] < arr[hi]:
+                hi += 1
+            arr[lo : hi + 1] = arr[lo : hi + 1][::-1]
+        else:
+            while hi + 1 < n and not arr[hi + 1] < arr[hi]:
+                hi += 1
+        return hi - lo + 1
+
+    def binary_insertion(lo: int, start: int, hi: int) -> None:
+        for i in range(start, hi):
+            item = arr[i]
+            pos = bisect_right(arr, item, lo, i)
+            arr[pos + 1 : i + 1] = arr[pos:i]
+            arr[pos] = item
+
+    def merge_runs(lo: int, mid: int, hi: int) -> None:
+        lo = _gallop_right(arr[mid], arr, lo, mid)
+        if lo == mid:
+            return
+        hi = _gallop_left(arr[mid - 1], arr, mid, hi)
+        tmp = arr[lo:mid]
+        ni = len(tmp)
+        i, j, k = 0, mid, lo
+        min_gallop = MIN_GALLOP
+        while i < ni and j < hi:
+            count_a = count_b = 0
+            while i < ni and j < hi:
+                if arr[j] < tmp[i]:
+                    arr[k] = arr[j]
+                    j += 1
+                    count_b += 1
+                    count_a = 0
+                else:
+                    arr[k] = tmp[i]
+                    i += 1
+                    count_a += 1
+                    count_b = 0
+                k += 1
+                if count_a >= min_gallop or count_b >= min_gallop:
+                    break
+            while i < ni and j < hi:
+                end = _gallop_right(arr[j], tmp, i, ni)
+                count_a = end - i
+                arr[k : k + count_a] = tmp[i:end]
+                k += count_a
+                i = end
+                if i >= ni:
+                    break
+                end = _gallop_left(tmp[i], arr, j, hi)
+                count_b = end - j
+                arr[k : k + count_b] = arr[j:end]
+                k += count_b
+                j = end
+                if count_a < MIN_GALLOP and count_b < MIN_GALLOP:
+                    min_gallop += 1
+                    break
+                min_gallop = max(1, min_gallop - 1)
+        if i < ni:
+            arr[k : k + ni - i] = tmp[i:]
+
+    runs: list[list[int]] = []
+
+    def merge_at(idx: int) -> None:
+        start, length, _ = runs[idx]
+        nxt_start, nxt_length, _ = runs[idx + 1]
+        merge_runs(start, nxt_start, nxt_start + nxt_length)
+        runs[idx][1] = length + nxt_length
+        del runs[idx + 1]
+
+    min_run = _min_run(n)
+    lo = 0
+    while lo < n:
+        run_len = count_run(lo)
+        if run_len < min_run:
+            forced = min(min_run, n - lo)
+            binary_insertion(lo, lo + run_len, lo + forced)
+            run_len = forced
+        if runs:
+            power = _node_power(runs[-1][0], runs[-1][1], run_len, n)
+            while len(runs) > 1 and runs[-2][2] > power:
+                merge_at(len(runs) - 2)
+            runs[-1][2] = power
+        runs.append([lo, run_len, 0])
+        lo += run_len
+    while len(runs) > 1:
+        merge_at(len(runs) - 2)
+
+
+def natural_sort(
+    items: Sequence[T], *, record_steps: bool = False, step_limit: int | None = 400
+) -> tuple[list[T], Sequence[list[T]]]:
+    """Sort items using run-adaptive natural merge sort and optionally capture states.
+
+    Ascending and strictly descending runs are detected (the latter reversed in place),
+    short runs are extended to a minimum length with binary insertion, and runs are
+    merged through a Powersort run stack. Merges switch to galloping once one side has
+    won ``MIN_GALLOP`` times in a row.
+    """
+    arr: List[T] = list(items)
+    n = len(arr)
+    if n >= 2 and not record_steps:
+        _natural_sort_fast(arr)
+        return arr, []
+    log = new_log(arr, record_steps, step_limit)
+    if n < 2:
+        return arr, steps_of(log)
+
+    def count_run(lo: int) -> int:
+        hi = lo + 1
+        if hi == n:
+            return 1
+        if arr[hi] < arr[lo]:
+            while hi + 1 < n and arr[hi + 1] < arr[hi]:
+                hi += 1
+            arr[lo : hi + 1] = arr[lo : hi + 1][::-1]
+            if record_steps:
+                log.set_range(lo, arr[lo : hi + 1])
+        else:
+            while hi + 1 < n and not arr[hi + 1] < arr[hi]:
+                hi += 1
+        return hi - lo + 1
+
+    def binary_insertion(lo: int, start: int, hi: int) -> None:
+        for i in range(start, hi):
+            item = arr[i]
+            pos = bisect_right(arr, item, lo, i)
+            arr[pos + 1 : i + 1] = arr[pos:i]
+            arr[pos] = item
+            if record_steps:
+                log.set_range(pos, arr[pos : i + 1])
+
+    def merge_runs(lo: int, mid: int, hi: int) -> None:
+        # Elements already in their final place at either end are left untouched.
+        lo = _gallop_right(arr[mid], arr, lo, mid)
+        if lo == mid:
+            return
+        hi = _gallop_left(arr[mid - 1], arr, mid, hi)
+        tmp = arr[lo:mid]
+        ni = len(tmp)
+        i, j, k = 0, mid, lo
+        min_gallop = MIN_GALLOP
+        while i < ni and j < hi:
+            count_a = count_b = 0
+            while i < ni and j < hi:
+                if arr[j] < tmp[i]:
+                    arr[k] = arr[j]
+                    j += 1
+                    count_b += 1
+                    count_a = 0
+                else:
+                    arr[k] = tmp[i]
+                    i += 1
+                    count_a += 1
+                    count_b = 0
+                log.set(k, arr[k])
+                k += 1
+                if count_a >= min_gallop or count_b >= min_gallop:
+                    break
+            while i < ni and j < hi:
+                end = _gallop_right(arr[j], tmp, i, ni)
+                count_a = end - i
+                arr[k : k + count_a] = tmp[i:end]
+                if record_steps:
+                    log.set_range(k, tmp[i:end])
+                k += count_a
+                i = end
+                if i >= ni:
+                    break
+                end = _gallop_left(tmp[i], arr, j, hi)
+                count_b = end - j
+                arr[k : k + count_b] = arr[j:end]
+                if record_steps:
+                    log.set_range(k, arr[k : k + count_b])
+                k += count_b
+                j = end
+                if count_a < MIN_GALLOP and count_b < MIN_GALLOP:
+                    min_gallop += 1
+                    break
+                min_gallop = max(1, min_gallop - 1)
+        if i < ni:
+            arr[k : k + ni - i] = tmp[i:]
+            if record_steps:
+                log.set_range(k, tmp[i:])
+
+    # Run stack entries are [start, length, power of the boundary after the run].
+    runs: list[list[int]] = []
+
+    def merge_at(idx: int) -> None:
+        start, length, _ = runs[idx]
+        nxt_start, nxt_length, _ = runs[idx + 1]
+        merge_runs(start, nxt_start, nxt_start + nxt_length)
+        runs[idx][1] = length + nxt_length
+        del runs[idx + 1]
 
-    merge_sort(arr, 0, len(arr) - 1)
-    return arr, steps
+    min_run = _min_run(n)
+    lo = 0
+    while lo < n:
+        run_len = count_run(lo)
+        if run_len < min_run:
+            forced = min(min_run, n - lo)
+            binary_insertion(lo, lo + run_len, lo + forced)
+            run_len = forced
+        if runs:
+            power = _node_power(runs[-1][0], runs[-1][1], run_len, n)
+            while len(runs) > 1 and runs[-2][2] > power:
+                merge_at(len(runs) - 2)
+            runs[-1][2] = power
+        runs.append([lo, run_len, 0])
+        lo += run_len
+    while len(runs) > 1:
+        merge_at(len(runs) - 2)
+    return arr, steps_of(log)
 
 
-__all__ = ["sort"]
+__all__ = ["COPY_CHUNK", "MIN_GALLOP", "natural_sort", "sort"]
@@ -0,0 +1,202 @@
+"""Parallel merge sort: chunks sorted in worker processes, then a k-way merge."""
+
+from __future__ import annotations
+
+import atexit
+import heapq
+import math
+import multiprocessing
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, List, Sequence, TypeVar
+
+import numpy as np
+
+T = TypeVar("T")
+
+DEFAULT_CHUNK_ALGORITHM = "merge"
+
+_EXECUTORS: dict[int, ProcessPoolExecutor] = {}
+
+
+def _mp_context() -> Any:
+    # forkserver avoids forking a (possibly multi-threaded) GUI process.
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+def _executor(workers: int) -> ProcessPoolExecutor:
+    """Process pool for ``workers``, kept alive between sorts to amortise start-up."""
+    executor = _EXECUTORS.get(workers)
+    if executor is not None and getattr(executor, "_broken", False):
+        # A crashed worker poisons the whole pool; start a fresh one.
+        executor.shutdown(wait=False, cancel_futures=True)
+        executor = None
+    if executor is None:
+        executor = ProcessPoolExecutor(max_workers=workers, mp_context=_mp_context())
+        _EXECUTORS[workers] = executor
+    return executor
+
+
+def shutdown_pools() -> None:
+    """Shut down every cached worker pool."""
+    while _EXECUTORS:
+        _, executor = _EXECUTORS.popitem()
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+atexit.register(shutdown_pools)
+
+
+def _sort_list(chunk: List[T], algorithm: str) -> List[T]:
+    from sorting_lab.algorithms import run_algorithm
+
+    return run_algorithm(algorithm, chunk)[0]
+
+
+def _sort_shared_chunk(name: str, n: int, lo: int, hi: int, algorithm: str) -> None:
+    """Sort ``[lo, hi)`` of the shared int64 buffer ``name`` in place."""
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        view = np.ndarray((n,), dtype=np.int64, buffer=shm.buf)
+        view[lo:hi] = _sort_list(view[lo:hi].tolist(), algorithm)
+        del view
+    finally:
+        shm.close()
+
+
+def _merge_shared_ranges(src_name: str, dst_name: str, n: int, ranges: list[tuple[int, int]], offset: int) -> None:
+    """k-way merge sorted ranges of the shared source buffer into ``dst[offset:]``."""
+    src_shm = shared_memory.SharedMemory(name=src_name)
+    dst_shm = shared_memory.SharedMemory(name=dst_name)
+    try:
+        src = np.ndarray((n,), dtype=np.int64, buffer=src_shm.buf)
+        dst = np.ndarray((n,), dtype=np.int64, buffer=dst_shm.buf)
+        total = sum(hi - lo for lo, hi in ranges)
+        runs = [src[lo:hi].tolist() for lo, hi in ranges if hi > lo]
+        dst[offset : offset + total] = np.fromiter(heapq.merge(*runs), dtype=np.int64, count=total)
+        del src, dst
+    finally:
+        src_shm.close()
+        dst_shm.close()
+
+
+def _chunk_bounds(n: int, chunk_size: int) -> list[tuple[int, int]]:
+    return [(lo, min(lo + chunk_size, n)) for lo in range(0, n, chunk_size)]
+
+
+def _as_int64(items: Sequence[Any]) -> "np.ndarray | None":
+    values = items if isinstance(items, np.ndarray) else np.asarray(items)
+    if values.ndim != 1 or not (values.dtype.kind == "i" or (values.dtype.kind == "u" and values.dtype.itemsize < 8)):
+        return None
+    return values.astype(np.int64, copy=False)
+
+
+def _splitters(chunks: list[list[Any]] | list["np.ndarray"], parts: int) -> list[Any]:
+    """parts - 1 value boundaries drawn from evenly spaced samples of every sorted chunk."""
+    samples: list[Any] = []
+    for chunk in chunks:
+        m = len(chunk)
+        if m:
+            samples.extend(chunk[(m * q) // parts] for q in range(parts))
+    samples.sort()
+    if not samples:
+        return []
+    return [samples[(len(samples) * q) // parts] for q in range(1, parts)]
+
+
+def _sort_shared(values: "np.ndarray", workers: int, chunk_size: int, algorithm: str) -> list[int]:
+    n = len(values)
+    bounds = _chunk_bounds(n, chunk_size)
+    src_shm = shared_memory.SharedMemory(create=True, size=n * 8)
+    dst_shm = shared_memory.SharedMemory(create=True, size=n * 8)
+    try:
+        src = np.ndarray((n,), dtype=np.int64, buffer=src_shm.buf)
+        src[:] = values
+        pool: Executor | None = _executor(workers) if workers > 1 else None
+
+        def run_all(func: Any, jobs: list[tuple[Any, ...]]) -> None:
+            if pool is None:
+                for job in jobs:
+                    func(*job)
+            else:
+                for future in [pool.submit(func, *job) for job in jobs]:
+                    future.result()
+
+        run_all(_sort_shared_chunk, [(src_shm.name, n, lo, hi, algorithm) for lo, hi in bounds])
+
+        chunks = [src[lo:hi] for lo, hi in bounds]
+        splitters = _splitters(chunks, workers)
+        edges = [[lo] + [lo + int(np.searchsorted(chunk, s, side="left")) for s in splitters] + [hi]
+                 for (lo, hi), chunk in zip(bounds, chunks)]
+        jobs = []
+        offset = 0
+        for part in range(len(splitters) + 1):
+            ranges = [(edge[part], edge[part + 1]) for edge in edges]
+            jobs.append((src_shm.name, dst_shm.name, n, ranges, offset))
+            offset += sum(hi - lo for lo, hi in ranges)
+        run_all(_merge_shared_ranges, jobs)
+
+        dst = np.ndarray((n,), dtype=np.int64, buffer=dst_shm.buf)
+        result = dst.tolist()
+        del src, dst, chunks
+        return result
+    finally:
+        for shm in (src_shm, dst_shm):
+            shm.close()
+            shm.unlink()
+
+
+def _sort_pickled(arr: List[T], workers: int, chunk_size: int, algorithm: str) -> List[T]:
+    chunks = [arr[lo:hi] for lo, hi in _chunk_bounds(len(arr), chunk_size)]
+    if workers > 1:
+        runs = list(_executor(workers).map(_sort_list, chunks, [algorithm] * len(chunks)))
+    else:
+        runs = [_sort_list(chunk, algorithm) for chunk in chunks]
+    return list(heapq.merge(*runs))
+
+
+def sort(
+    items: Sequence[T],
+    *,
+    record_steps: bool = False,
+    step_limit: int | None = 400,
+    workers: int | None = None,
+    chunk_size: int | None = None,
+    chunk_algorithm: str = DEFAULT_CHUNK_ALGORITHM,
+) -> tuple[list[T], Sequence[list[T]]]:
+    """Sort items by sorting chunks in a process pool and k-way merging them.
+
+    64-bit integer input is handed to workers through ``multiprocessing.shared_memory``:
+    chunks are sorted in place in a shared input buffer, then each worker k-way merges
+    one value range (bounded by sampled splitters) of every chunk straight into its
+    slot of a shared output buffer. Other element types are pickled to the workers and
+    merged in the parent. ``workers`` defaults to the CPU count and ``chunk_size`` to
+    an even split; ``workers=1`` runs the same pipeline in-process. Recording steps
+    falls back to the serial ``chunk_algorithm``.
+    """
+    if record_steps:
+        from sorting_lab.algorithms import run_algorithm
+
+        return run_algorithm(chunk_algorithm, items, record_steps=True, step_limit=step_limit)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError("workers must be at least 1.")
+    n = len(items)
+    if n < 2:
+        return (items.tolist() if isinstance(items, np.ndarray) else list(items)), []
+    if chunk_size is None:
+        chunk_size = math.ceil(n / workers)
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1.")
+
+    values = _as_int64(items)
+    if values is not None:
+        return _sort_shared(values, workers, chunk_size, chunk_algorithm), []
+    arr: List[T] = list(items)
+    return _sort_pickled(arr, workers, chunk_size, chunk_algorithm), []
+
+
+__all__ = ["DEFAULT_CHUNK_ALGORITHM", "shutdown_pools", "sort"]
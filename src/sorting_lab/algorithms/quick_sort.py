@@ -1,49 +1,132 @@
 from __future__ import annotations
 
-from typing import List, MutableSequence, Sequence, TypeVar
+import math
+from typing import List, Sequence, TypeVar
+
+from .heap_sort import sort as heap_sort
+from .steps import new_log, steps_of
 
 T = TypeVar("T")
 
+DEFAULT_CUTOFF = 16
+
+
+def _median_of_three(arr: Sequence[T], lo: int, mid: int, hi: int) -> int:
+    a, b, c = arr[lo], arr[mid], arr[hi]
+    if a <= b:
+        if b <= c:
+            return mid
+        return hi if a <= c else lo
+    if a <= c:
+        return lo
+    return hi if b <= c else mid
+
+
+def _choose_pivot(arr: Sequence[T], lo: int, hi: int) -> T:
+    mid = (lo + hi) // 2
+    if hi - lo < 64:
+        return arr[_median_of_three(arr, lo, mid, hi)]
+    # Tukey's ninther: plain median-of-three degrades on the layouts that
+    # three-way partitioning leaves behind on descending input.
+    step = (hi - lo) // 8
+    a = _median_of_three(arr, lo, lo + step, lo + 2 * step)
+    b = _median_of_three(arr, mid - step, mid, mid + step)
+    c = _median_of_three(arr, hi - 2 * step, hi - step, hi)
+    return arr[_median_of_three(arr, a, b, c)]
+
+
+def _quick_sort_fast(arr: List[T]) -> None:
+    """Uninstrumented twin of sort(): identical partitions, no recorder calls."""
+    stack: list[tuple[int, int]] = [(0, len(arr) - 1)]
+    while stack:
+        lo, hi = stack.pop()
+        while lo < hi:
+            pivot_index = _median_of_three(arr, lo, (lo + hi) // 2, hi)
+            if pivot_index != hi:
+                arr[pivot_index], arr[hi] = arr[hi], arr[pivot_index]
+            pivot = arr[hi]
+            i = lo
+            for j in range(lo, hi):
+                if arr[j] <= pivot:
+                    arr[i], arr[j] = arr[j], arr[i]
+                    i += 1
+            arr[i], arr[hi] = arr[hi], arr[i]
+            if i - lo < hi - i:
+                stack.append((i + 1, hi))
+                hi = i - 1
+            else:
+                stack.append((lo, i - 1))
+                lo = i + 1
+
 
-def _record_state(states: list[list[T]], arr: MutableSequence[T], record_steps: bool, step_limit: int) -> None:
-    """Optionally append a copy of the current array state."""
-    if record_steps and len(states) < step_limit:
-        states.append(list(arr))
+def _introsort_fast(arr: List[T], cutoff: int, max_depth: int) -> None:
+    """Uninstrumented twin of introsort()."""
+    n = len(arr)
+    stack: list[tuple[int, int, int]] = [(0, n - 1, 0)]
+    while stack:
+        lo, hi, depth = stack.pop()
+        while hi - lo >= cutoff:
+            if depth >= max_depth:
+                arr[lo : hi + 1] = heap_sort(arr[lo : hi + 1])[0]
+                break
+            depth += 1
+            pivot = _choose_pivot(arr, lo, hi)
+            lt, i, gt = lo, lo, hi
+            while i <= gt:
+                value = arr[i]
+                if value < pivot:
+                    arr[lt], arr[i] = value, arr[lt]
+                    lt += 1
+                    i += 1
+                elif value > pivot:
+                    arr[i], arr[gt] = arr[gt], value
+                    gt -= 1
+                else:
+                    i += 1
+            if lt - lo < hi - gt:
+                stack.append((gt + 1, hi, depth))
+                hi = lt - 1
+            else:
+                stack.append((lo, lt - 1, depth))
+                lo = gt + 1
+        else:
+            for i in range(lo + 1, hi + 1):
+                item = arr[i]
+                j = i - 1
+                while j >= lo and arr[j] > item:
+                    arr[j + 1] = arr[j]
+                    j -= 1
+                arr[j + 1] = item
 
 
-def sort(items: Sequence[T], *, record_steps: bool = False, step_limit: int = 400) -> tuple[list[T], list[list[T]]]:
+def sort(
+    items: Sequence[T], *, record_steps: bool = False, step_limit: int | None = 400
+) -> tuple[list[T], Sequence[list[T]]]:
     """Sort items using quick sort.
 
-    Returns a tuple of (sorted_list, steps). Steps contains snapshots of array states if requested.
+    Returns a tuple of (sorted_list, steps). Steps is a StepLog of array states if requested.
     """
     arr: List[T] = list(items)
-    steps: list[list[T]] = []
-
-    def median_of_three(lo: int, mid: int, hi: int) -> int:
-        a, b, c = arr[lo], arr[mid], arr[hi]
-        if a <= b:
-            if b <= c:
-                return mid
-            return hi if a <= c else lo
-        if a <= c:
-            return lo
-        return hi if b <= c else mid
+    if not record_steps:
+        _quick_sort_fast(arr)
+        return arr, []
+    log = new_log(arr, record_steps, step_limit)
 
     def partition(lo: int, hi: int) -> int:
         mid = (lo + hi) // 2
-        pivot_index = median_of_three(lo, mid, hi)
+        pivot_index = _median_of_three(arr, lo, mid, hi)
         if pivot_index != hi:
             arr[pivot_index], arr[hi] = arr[hi], arr[pivot_index]
-            _record_state(steps, arr, record_steps, step_limit)
+            log.swap(pivot_index, hi)
         pivot = arr[hi]
         i = lo
         for j in range(lo, hi):
             if arr[j] <= pivot:
                 arr[i], arr[j] = arr[j], arr[i]
-                _record_state(steps, arr, record_steps, step_limit)
+                log.swap(i, j)
                 i += 1
         arr[i], arr[hi] = arr[hi], arr[i]
-        _record_state(steps, arr, record_steps, step_limit)
+        log.swap(i, hi)
         return i
 
     # Iterative quicksort to avoid deep recursion (QThread stack overflow).
@@ -59,7 +142,90 @@ def sort(items: Sequence[T], *, record_steps: bool = False, step_limit: int = 40
             else:
                 stack.append((lo, p - 1))
                 lo = p + 1
-    return arr, steps
+    return arr, steps_of(log)
+
+
+def introsort(
+    items: Sequence[T],
+    *,
+    record_steps: bool = False,
+    step_limit: int | None = 400,
+    cutoff: int = DEFAULT_CUTOFF,
+    max_depth: int | None = None,
+) -> tuple[list[T], Sequence[list[T]]]:
+    """Sort items using introsort.
+
+    Three-way (Dutch flag) partitioning around a median-of-three pivot (Tukey's
+    ninther from 64 elements) keeps runs of equal keys out of further recursion,
+    partitions of at most ``cutoff`` elements are finished with insertion sort, and
+    ranges still unsorted after ``max_depth`` partition levels (default 2*log2(n))
+    fall back to heap sort.
+    """
+    if cutoff < 1:
+        raise ValueError("cutoff must be at least 1.")
+    if max_depth is not None and max_depth < 0:
+        raise ValueError("max_depth must not be negative.")
+    arr: List[T] = list(items)
+    n = len(arr)
+    if max_depth is None:
+        max_depth = 2 * int(math.log2(n)) if n else 0
+    if n >= 2 and not record_steps:
+        _introsort_fast(arr, cutoff, max_depth)
+        return arr, []
+    log = new_log(arr, record_steps, step_limit)
+    if n < 2:
+        return arr, steps_of(log)
+
+    def insertion_sort(lo: int, hi: int) -> None:
+        for i in range(lo + 1, hi + 1):
+            item = arr[i]
+            j = i - 1
+            while j >= lo and arr[j] > item:
+                arr[j + 1] = arr[j]
+                log.set(j + 1, arr[j])
+                j -= 1
+            arr[j + 1] = item
+            log.set(j + 1, item)
+
+    def partition3(lo: int, hi: int) -> tuple[int, int]:
+        pivot = _choose_pivot(arr, lo, hi)
+        lt, i, gt = lo, lo, hi
+        while i <= gt:
+            value = arr[i]
+            if value < pivot:
+                arr[lt], arr[i] = value, arr[lt]
+                log.swap(lt, i)
+                lt += 1
+                i += 1
+            elif value > pivot:
+                arr[i], arr[gt] = arr[gt], value
+                log.swap(i, gt)
+                gt -= 1
+            else:
+                i += 1
+        return lt, gt
+
+    # Same explicit stack as sort(); each entry carries its partition depth.
+    stack: list[tuple[int, int, int]] = [(0, n - 1, 0)]
+    while stack:
+        lo, hi, depth = stack.pop()
+        while hi - lo >= cutoff:
+            if depth >= max_depth:
+                arr[lo : hi + 1] = heap_sort(arr[lo : hi + 1])[0]
+                if record_steps:
+                    log.set_range(lo, arr[lo : hi + 1])
+                break
+            depth += 1
+            lt, gt = partition3(lo, hi)
+            if lt - lo < hi - gt:
+                stack.append((gt + 1, hi, depth))
+                hi = lt - 1
+            else:
+                stack.append((lo, lt - 1, depth))
+                lo = gt + 1
+        else:
+            insertion_sort(lo, hi)
+    return arr, steps_of(log)
 
 
-__all__ = ["sort"]
+__all__ = ["DEFAULT_CUTOFF", "introsort", "sort"]
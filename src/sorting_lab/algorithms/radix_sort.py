@@ -1,37 +1,216 @@
+"""Radix sort with a pure-Python LSD path and a NumPy histogram backend."""
+
 from __future__ import annotations
 
-from typing import List, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from numbers import Integral
+from typing import Any, List, Sequence
 
+import numpy as np
 
-def sort(items: Sequence[int], *, record_steps: bool = False, step_limit: int = 400) -> tuple[list[int], list[list[int]]]:
-    """Sort items using LSD radix sort (base 10)."""
-    arr: List[int] = list(items)
-    steps: list[list[int]] = []
-    if not arr:
-        return arr, steps
-    if any(x < 0 for x in arr):
-        raise ValueError("Radix sort only supports non-negative integers.")
+from .steps import new_log, steps_of
+
+DIGIT_BITS = (8, 11, 16)
+BACKENDS = ("auto", "numpy", "python")
+
+_SIGN_BIAS = 1 << 63
+
+# Stripes smaller than this spend more time in thread hand-offs than in NumPy.
+MIN_STRIPE = 1 << 15
 
+
+def _python_sort_fast(arr: List[int]) -> None:
+    """Uninstrumented twin of _python_sort(): buckets are flattened in one C-level pass."""
+    if any(not isinstance(x, Integral) for x in arr):
+        raise ValueError("Radix sort only supports integers.")
+    offset = min(arr)
+    max_key = max(arr) - offset
     exp = 1
-    max_val = max(arr)
+    while max_key // exp > 0:
+        buckets: list[list[int]] = [[] for _ in range(10)]
+        for num in arr:
+            buckets[((num - offset) // exp) % 10].append(num)
+        arr[:] = [num for bucket in buckets for num in bucket]
+        exp *= 10
+
 
-    def record():
-        if record_steps and len(steps) < step_limit:
-            steps.append(list(arr))
+def _python_sort(arr: List[int], record_steps: bool, step_limit: int | None) -> Sequence[list[int]]:
+    """Base-10 LSD passes over ``arr`` in place; negatives are shifted by the minimum."""
+    if any(not isinstance(x, Integral) for x in arr):
+        raise ValueError("Radix sort only supports integers.")
 
-    while max_val // exp > 0:
+    offset = min(arr)
+    max_key = max(arr) - offset
+    exp = 1
+    log = new_log(arr, record_steps, step_limit)
+
+    while max_key // exp > 0:
         buckets = [list() for _ in range(10)]
         for num in arr:
-            index = (num // exp) % 10
+            index = ((num - offset) // exp) % 10
             buckets[index].append(num)
         pos = 0
         for bucket in buckets:
             for num in bucket:
                 arr[pos] = num
+                log.set(pos, num)
                 pos += 1
-                record()
         exp *= 10
+    return steps_of(log)
+
+
+def _as_int_array(items: Sequence[Any]) -> "np.ndarray | None":
+    """Return ``items`` as a 1-D int64/uint64 array, or None if it does not fit."""
+    values = items if isinstance(items, np.ndarray) else np.asarray(items)
+    if values.ndim != 1 or values.dtype.kind not in "iu":
+        return None
+    if values.dtype.kind == "u":
+        return values.astype(np.uint64, copy=False)
+    return values.astype(np.int64, copy=False)
+
+
+def _default_digit_bits(n: int) -> int:
+    # A 2**16 histogram only pays off once there are enough elements to fill it.
+    if n < 1 << 14:
+        return 8
+    if n < 1 << 20:
+        return 11
+    return 16
+
+
+def _threaded_passes(
+    keys: "np.ndarray", bits: int, digit_bits: int, digit_dtype: Any, workers: int
+) -> "np.ndarray":
+    """LSD passes over ``keys`` with per-thread stripes sharing one scatter target.
+
+    Every pass runs in two phases on the pool: each thread extracts its stripe's
+    digits, local histogram and stable local order; the histograms are then combined
+    into per-(digit, stripe) global offsets (stripe t's elements of digit d follow
+    those of stripes 0..t-1), and each thread scatters its stripe into the output
+    buffer. The heavy NumPy calls release the GIL, so stripes proceed in parallel.
+    """
+    n = len(keys)
+    radix = 1 << digit_bits
+    mask = np.uint64(radix - 1)
+    bounds = np.linspace(0, n, workers + 1).astype(np.intp)
+    stripes = list(zip(bounds[:-1], bounds[1:]))
+    out = np.empty_like(keys)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for shift in range(0, bits, digit_bits):
+            src = keys
+
+            def histogram(stripe: tuple[int, int]) -> tuple[Any, Any, Any]:
+                lo, hi = stripe
+                digits = ((src[lo:hi] >> np.uint64(shift)) & mask).astype(digit_dtype)
+                order = np.argsort(digits, kind="stable")
+                return digits[order], order, np.bincount(digits, minlength=radix)
+
+            local = list(pool.map(histogram, stripes))
+            counts = np.stack([c for _, _, c in local])  # (stripes, radix)
+            if counts.sum(axis=0).max() == n:
+                continue
+            # Exclusive prefix sum in digit-major, stripe-minor order.
+            flat = counts.T.ravel()
+            offsets = (np.cumsum(flat) - flat).reshape(radix, workers).T
+            local_starts = np.cumsum(counts, axis=1) - counts
+
+            def scatter(t: int) -> None:
+                lo, hi = stripes[t]
+                sorted_digits, order, _ = local[t]
+                dest = np.arange(hi - lo) + (offsets[t] - local_starts[t])[sorted_digits]
+                out[dest] = src[lo:hi][order]
+
+            list(pool.map(scatter, range(workers)))
+            keys, out = out, src
+    return keys
+
+
+def radix_sort_array(values: "np.ndarray", digit_bits: int | None = None, workers: int = 1) -> "np.ndarray":
+    """Sort a 1-D integer ndarray with LSD passes over ``digit_bits``-wide digits.
+
+    Signed values are mapped to order-preserving unsigned keys by flipping the sign
+    bit, then rebased on the minimum key so only the occupied bits are visited.
+    Each pass builds a ``np.bincount`` histogram; passes where every element shares
+    the same digit are skipped. The stable per-digit scatter is delegated to NumPy's
+    stable argsort, which is a C counting sort for digit arrays of 16 bits or less.
+    With ``workers > 1`` the passes are split into per-thread stripes (at least
+    ``MIN_STRIPE`` elements each) run on a thread pool.
+    """
+    n = len(values)
+    if digit_bits is None:
+        digit_bits = _default_digit_bits(n)
+    if digit_bits not in DIGIT_BITS:
+        raise ValueError(f"digit_bits must be one of {DIGIT_BITS}, got {digit_bits}.")
+    if workers < 1:
+        raise ValueError("workers must be at least 1.")
+    if n < 2:
+        return values.copy()
+
+    dtype = values.dtype
+    if dtype.kind not in "iu":
+        raise ValueError("Radix sort only supports integers.")
+    signed = dtype.kind == "i"
+    if signed:
+        keys = values.astype(np.int64, copy=False).view(np.uint64) ^ np.uint64(_SIGN_BIAS)
+    else:
+        keys = values.astype(np.uint64)
+    base = keys.min()
+    keys = keys - base
+    bits = int(keys.max()).bit_length()
+
+    radix = 1 << digit_bits
+    mask = np.uint64(radix - 1)
+    digit_dtype = np.uint8 if digit_bits <= 8 else np.uint16
+    workers = min(workers, max(1, n // MIN_STRIPE))
+    if workers > 1:
+        keys = _threaded_passes(keys, bits, digit_bits, digit_dtype, workers)
+    else:
+        for shift in range(0, bits, digit_bits):
+            digits = ((keys >> np.uint64(shift)) & mask).astype(digit_dtype)
+            counts = np.bincount(digits, minlength=radix)
+            if counts.max() == n:
+                continue
+            order = np.argsort(digits, kind="stable")
+            keys = keys[order]
+
+    keys += base
+    if signed:
+        keys = (keys ^ np.uint64(_SIGN_BIAS)).view(np.int64)
+    return keys.astype(dtype, copy=False)
+
+
+def sort(
+    items: Sequence[int],
+    *,
+    record_steps: bool = False,
+    step_limit: int | None = 400,
+    backend: str = "auto",
+    digit_bits: int | None = None,
+    workers: int = 1,
+) -> tuple[list[int], Sequence[list[int]]]:
+    """Sort integers using LSD radix sort.
+
+    ``backend="auto"`` uses the NumPy engine unless steps are recorded or the values
+    do not fit in 64 bits; ``"python"`` forces the base-10 bucket implementation.
+    ``workers`` threads share the NumPy passes; the Python path ignores it.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown radix backend: {backend}")
+    if len(items) == 0:
+        return [], []
+    if backend != "python" and not record_steps:
+        values = _as_int_array(items)
+        if values is not None:
+            return radix_sort_array(values, digit_bits=digit_bits, workers=workers).tolist(), []
+        if backend == "numpy":
+            raise ValueError("NumPy radix backend only supports 64-bit integers.")
+
+    arr: List[int] = list(items)
+    if not record_steps:
+        _python_sort_fast(arr)
+        return arr, []
+    steps = _python_sort(arr, record_steps, step_limit)
     return arr, steps
 
 
-__all__ = ["sort"]
+__all__ = ["BACKENDS", "DIGIT_BITS", "MIN_STRIPE", "radix_sort_array", "sort"]
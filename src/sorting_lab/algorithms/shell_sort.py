@@ -2,34 +2,158 @@
 
 from __future__ import annotations
 
-from typing import List, MutableSequence, Sequence, TypeVar
+from typing import Callable, List, Sequence, TypeVar
+
+from .steps import new_log, steps_of
 
 T = TypeVar("T")
 
+GapFunc = Callable[[int], List[int]]
 
-def _record_state(states: list[list[T]], arr: MutableSequence[T], record_steps: bool, step_limit: int) -> None:
-    if record_steps and len(states) < step_limit:
-        states.append(list(arr))
+_CIURA_BASE = [1, 4, 10, 23, 57, 132, 301, 701, 1750]
 
 
-def sort(items: Sequence[T], *, record_steps: bool = False, step_limit: int = 400) -> tuple[list[T], list[list[T]]]:
-    """Sort items using shell sort and optionally capture states."""
-    arr: List[T] = list(items)
-    steps: list[list[T]] = []
-    n = len(arr)
+def shell_gaps(n: int) -> List[int]:
+    """Shell's original halving sequence: n/2, n/4, ..., 1."""
+    gaps: List[int] = []
     gap = n // 2
     while gap > 0:
+        gaps.append(gap)
+        gap //= 2
+    return gaps
+
+
+def knuth_gaps(n: int) -> List[int]:
+    """Knuth's (3^k - 1) / 2 sequence: 1, 4, 13, 40, ..."""
+    gaps: List[int] = []
+    gap = 1
+    while gap < n:
+        gaps.append(gap)
+        gap = 3 * gap + 1
+    return gaps[::-1]
+
+
+def ciura_gaps(n: int) -> List[int]:
+    """Ciura's empirical sequence, extended past 1750 by a factor of 2.25."""
+    gaps = [gap for gap in _CIURA_BASE if gap < n]
+    if gaps and gaps[-1] == _CIURA_BASE[-1]:
+        gap = int(gaps[-1] * 2.25)
+        while gap < n:
+            gaps.append(gap)
+            gap = int(gap * 2.25)
+    return gaps[::-1]
+
+
+def tokuda_gaps(n: int) -> List[int]:
+    """Tokuda's sequence: ceil((9^k - 4^k) / (5 * 4^(k-1))) = 1, 4, 9, 20, 46, ..."""
+    gaps: List[int] = []
+    k = 1
+    while True:
+        num = 9**k - 4**k
+        den = 5 * 4 ** (k - 1)
+        gap = -(-num // den)
+        if gap >= n:
+            break
+        gaps.append(gap)
+        k += 1
+    return gaps[::-1]
+
+
+def sedgewick_gaps(n: int) -> List[int]:
+    """Sedgewick's 1986 sequence: 1 followed by 4^k + 3 * 2^(k-1) + 1 = 8, 23, 77, ..."""
+    gaps: List[int] = [1] if n > 1 else []
+    k = 1
+    while True:
+        gap = 4**k + 3 * 2 ** (k - 1) + 1
+        if gap >= n:
+            break
+        gaps.append(gap)
+        k += 1
+    return gaps[::-1]
+
+
+def pratt_gaps(n: int) -> List[int]:
+    """Pratt's 3-smooth numbers 2^p * 3^q below n."""
+    gaps: List[int] = []
+    pow3 = 1
+    while pow3 < n:
+        gap = pow3
+        while gap < n:
+            gaps.append(gap)
+            gap *= 2
+        pow3 *= 3
+    return sorted(gaps, reverse=True)
+
+
+GAP_SEQUENCES: dict[str, GapFunc] = {
+    "shell": shell_gaps,
+    "knuth": knuth_gaps,
+    "ciura": ciura_gaps,
+    "tokuda": tokuda_gaps,
+    "sedgewick": sedgewick_gaps,
+    "pratt": pratt_gaps,
+}
+
+
+def gap_sequence(name: str, n: int) -> List[int]:
+    """Return the named gap sequence for n elements, largest gap first."""
+    func = GAP_SEQUENCES.get(name)
+    if func is None:
+        raise ValueError(f"Unknown gap sequence: {name}")
+    return func(n)
+
+
+def _shell_sort_fast(arr: List[T], gaps: List[int]) -> None:
+    """Uninstrumented twin of sort()."""
+    n = len(arr)
+    for gap in gaps:
         for i in range(gap, n):
             temp = arr[i]
             j = i
             while j >= gap and arr[j - gap] > temp:
                 arr[j] = arr[j - gap]
                 j -= gap
-                _record_state(steps, arr, record_steps, step_limit)
             arr[j] = temp
-            _record_state(steps, arr, record_steps, step_limit)
-        gap //= 2
-    return arr, steps
 
 
-__all__ = ["sort"]
+def sort(
+    items: Sequence[T],
+    *,
+    record_steps: bool = False,
+    step_limit: int | None = 400,
+    gaps: str = "shell",
+) -> tuple[list[T], Sequence[list[T]]]:
+    """Sort items using shell sort and optionally capture states.
+
+    ``gaps`` names an entry of ``GAP_SEQUENCES``.
+    """
+    arr: List[T] = list(items)
+    n = len(arr)
+    if not record_steps:
+        _shell_sort_fast(arr, gap_sequence(gaps, n))
+        return arr, []
+    log = new_log(arr, record_steps, step_limit)
+    for gap in gap_sequence(gaps, n):
+        for i in range(gap, n):
+            temp = arr[i]
+            j = i
+            while j >= gap and arr[j - gap] > temp:
+                arr[j] = arr[j - gap]
+                log.set(j, arr[j])
+                j -= gap
+            arr[j] = temp
+            log.set(j, temp)
+    return arr, steps_of(log)
+
+
+__all__ = [
+    "GAP_SEQUENCES",
+    "ciura_gaps",
+    "gap_sequence",
+    "knuth_gaps",
+    "pratt_gaps",
+    "sedgewick_gaps",
+    "shell_gaps",
+    "sort",
+    "tokuda_gaps",
+]
@@ -0,0 +1,227 @@
+"""Compact operation log used for step recording."""
+
+from __future__ import annotations
+
+import sys
+import zlib
+from array import array
+from collections.abc import Sequence
+from typing import Any, Generic, Iterable, List, TypeVar
+
+T = TypeVar("T")
+
+OP_SET = 0
+OP_SWAP = 1
+# Operations per compressed chunk of the log.
+CHUNK_OPS = 1 << 16
+_CHUNK_MASK = CHUNK_OPS - 1
+# Upper bound on the bytes held in playback keyframes.
+KEYFRAME_BUDGET = 2 * 1024 * 1024
+
+_INT_TYPECODES = ("b", "h", "i", "q")
+
+
+def _int_typecode(lo: int, hi: int) -> str | None:
+    """Smallest signed array typecode able to hold every value in [lo, hi]."""
+    for code in _INT_TYPECODES:
+        bound = 1 << (array(code).itemsize * 8 - 1)
+        if -bound <= lo and hi < bound:
+            return code
+    return None
+
+
+def _pack(values: array) -> bytes:
+    """zlib-compress an integer array one byte plane at a time."""
+    raw = values.tobytes()
+    size = values.itemsize
+    return zlib.compress(b"".join(raw[k::size] for k in range(size)), 1)
+
+
+def _unpack(blob: bytes, code: str) -> array:
+    planes = zlib.decompress(blob)
+    values = array(code)
+    size = values.itemsize
+    count = len(planes) // size
+    raw = bytearray(len(planes))
+    for k in range(size):
+        raw[k::size] = planes[k * count : (k + 1) * count]
+    values.frombytes(raw)
+    return values
+
+
+class StepLog(Sequence, Generic[T]):
+    """Recorded array states stored as an operation log instead of snapshots.
+
+    ``log[0]`` is the initial array and ``log[k]`` the array after the k-th
+    operation; ``limit`` counts frames, the initial one included.
+    """
+
+    def __init__(self, initial: Iterable[T], *, limit: int | None = None, keyframe_every: int | None = None) -> None:
+        base = list(initial)
+        n = len(base)
+        self.limit = limit
+        self.keyframe_every = keyframe_every or max(1024, 4 * n)
+        # Frame 0 is the initial state, so ``limit`` frames leave room for limit - 1 operations.
+        self._cap = sys.maxsize if limit is None else max(0, limit - 1)
+        code = None
+        if all(type(value) is int for value in base):
+            lo, hi = min(base, default=0), max(base, default=0)
+            code = _int_typecode(min(lo, -n, 0), max(hi, n))
+        self._code = code
+        self._index_code = _int_typecode(0, 2 * n + 1) or "q"
+        self._index = array(self._index_code)
+        self._arg: Any = array(code) if code else []
+        self._sealed: list[tuple[bytes, Any]] = []
+        self._count = 0
+        self._decoded: tuple[int, array, Any] | None = None
+        frame_bytes = max(1, n * (array(code).itemsize if code else 8))
+        self._max_keyframes = max(2, KEYFRAME_BUDGET // frame_bytes)
+        self._keyframes: list[Any] = [self._freeze(base)]
+        # Playback state, built from a keyframe on first access.
+        self._cursor_pos = -1
+        self._cursor_state: List[T] = []
+
+    def _freeze(self, state: List[T]) -> Any:
+        return array(self._code, state) if self._code else list(state)
+
+    # Recording -----------------------------------------------------------------
+
+    def set(self, i: int, value: T) -> None:
+        """Record ``arr[i] = value``."""
+        if self._count < self._cap:
+            self._index.append(i << 1)
+            self._arg.append(value)
+            self._count += 1
+            if not self._count & _CHUNK_MASK:
+                self._seal()
+
+    def swap(self, i: int, j: int) -> None:
+        """Record ``arr[i], arr[j] = arr[j], arr[i]``."""
+        if self._count < self._cap:
+            self._index.append((i << 1) | OP_SWAP)
+            self._arg.append(j - i)
+            self._count += 1
+            if not self._count & _CHUNK_MASK:
+                self._seal()
+
+    def set_range(self, start: int, values: Iterable[T]) -> None:
+        """Record ``arr[start:start + len(values)] = values`` one element at a time."""
+        for offset, value in enumerate(values):
+            self.set(start + offset, value)
+
+    def _seal(self) -> None:
+        """Compress the open operation buffers into a sealed chunk."""
+        arg: Any = _pack(self._arg) if self._code else self._arg
+        self._sealed.append((_pack(self._index), arg))
+        self._index = array(self._index_code)
+        self._arg = array(self._code) if self._code else []
+
+    def _chunk(self, c: int) -> tuple[array, Any]:
+        """Packed indices and arguments of chunk ``c`` (the open buffers last)."""
+        if c == len(self._sealed):
+            return self._index, self._arg
+        if self._decoded is None or self._decoded[0] != c:
+            index_blob, arg = self._sealed[c]
+            if self._code:
+                arg = _unpack(arg, self._code)
+            self._decoded = (c, _unpack(index_blob, self._index_code), arg)
+        return self._decoded[1], self._decoded[2]
+
+    # Playback ------------------------------------------------------------------
+
+    @property
+    def initial(self) -> List[T]:
+        """Array state before the first recorded operation."""
+        return list(self._keyframes[0])
+
+    @property
+    def operations(self) -> int:
+        """Number of recorded ``set``/``swap`` operations."""
+        return self._count
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate payload size of the operation buffers, sealed chunks and keyframes."""
+        total = self._index.itemsize * len(self._index)
+        for index_blob, arg in self._sealed:
+            total += len(index_blob) + (len(arg) if self._code else 8 * len(arg))
+        if self._code:
+            total += self._arg.itemsize * len(self._arg)
+            total += sum(frame.itemsize * len(frame) for frame in self._keyframes)
+        else:
+            total += 8 * len(self._arg) + sum(8 * len(frame) for frame in self._keyframes)
+        return total
+
+    def _state_after(self, count: int) -> List[T]:
+        """Live (shared) state after applying the first ``count`` operations."""
+        every = self.keyframe_every
+        kf = min(count // every, len(self._keyframes) - 1)
+        if not (kf * every <= self._cursor_pos <= count):
+            self._cursor_state = list(self._keyframes[kf])
+            self._cursor_pos = kf * every
+        state = self._cursor_state
+        pos = self._cursor_pos
+        while pos < count:
+            c, offset = divmod(pos, CHUNK_OPS)
+            stop = min(count, (pos // every + 1) * every, (c + 1) * CHUNK_OPS)
+            index, arg = self._chunk(c)
+            for p in range(offset, offset + stop - pos):
+                packed = index[p]
+                i = packed >> 1
+                if packed & OP_SWAP:
+                    j = i + arg[p]
+                    state[i], state[j] = state[j], state[i]
+                else:
+                    state[i] = arg[p]
+            pos = stop
+            if pos % every == 0 and pos // every == len(self._keyframes):
+                self._keyframes.append(self._freeze(state))
+                if len(self._keyframes) > self._max_keyframes:
+                    self._keyframes = self._keyframes[::2]
+                    self.keyframe_every = every = every * 2
+        self._cursor_pos = pos
+        return state
+
+    def __len__(self) -> int:
+        return 0 if self.limit == 0 else self._count + 1
+
+    def __getitem__(self, k: Any) -> Any:
+        if isinstance(k, slice):
+            return [self[i] for i in range(*k.indices(len(self)))]
+        n = len(self)
+        if k < 0:
+            k += n
+        if not 0 <= k < n:
+            raise IndexError("step index out of range")
+        return list(self._state_after(k))
+
+
+class _NullLog:
+    """Stand-in recorder used when steps are not captured."""
+
+    def set(self, i: int, value: Any) -> None:
+        pass
+
+    def swap(self, i: int, j: int) -> None:
+        pass
+
+    def set_range(self, start: int, values: Iterable[Any]) -> None:
+        pass
+
+
+NULL_LOG = _NullLog()
+
+
+def new_log(initial: Iterable[T], record_steps: bool, step_limit: int | None) -> Any:
+    """Return a StepLog over ``initial`` when recording, otherwise the no-op recorder."""
+    if not record_steps:
+        return NULL_LOG
+    return StepLog(initial, limit=step_limit)
+
+
+def steps_of(log: Any) -> Any:
+    """Steps value returned by algorithms: the log itself, or [] when not recording."""
+    return log if isinstance(log, StepLog) else []
+
+
+__all__ = ["CHUNK_OPS", "KEYFRAME_BUDGET", "NULL_LOG", "OP_SET", "OP_SWAP", "StepLog", "new_log", "steps_of"]
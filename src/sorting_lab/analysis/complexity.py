@@ -0,0 +1,136 @@
+"""Empirical complexity fits of runtime against input size."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable, Iterable, Sequence
+
+import numpy as np
+import pandas as pd
+
+# Model slug -> (label, growth function). Each is fitted as t = c * g(n).
+MODELS: dict[str, tuple[str, Callable[[np.ndarray], np.ndarray]]] = {
+    "n": ("n", lambda n: n),
+    "nlogn": ("n log n", lambda n: n * np.log2(n)),
+    "n1.5": ("n^1.5", lambda n: n**1.5),
+    "n2": ("n^2", lambda n: n**2),
+}
+# Tried in order when looking for the runtime column of a results table.
+TIME_COLUMNS = ("median_time_s", "avg_time_s", "time_s")
+# Columns that split a series beyond algorithm and dataset when present.
+SERIES_COLUMNS = ("algorithm", "dataset", "gap_sequence", "workers", "gc_mode")
+
+
+@dataclass(frozen=True)
+class ComplexityFit:
+    sizes: tuple[int, ...]
+    # Free power law t = constant * n^exponent, fitted on log-log data.
+    exponent: float
+    constant: float
+    r2: float | None
+    # Per model: least-squares c of t = c * g(n) and RMS log residual.
+    constants: dict[str, float]
+    residuals: dict[str, float]
+
+    @property
+    def best_model(self) -> str:
+        """Model slug with the smallest RMS log residual."""
+        return min(self.residuals, key=self.residuals.__getitem__)
+
+    def predict(self, n: int | float, model: str | None = None) -> float:
+        """Runtime at ``n`` from ``model`` (default: the best model)."""
+        model = model or self.best_model
+        if model not in MODELS:
+            raise ValueError(f"Unknown complexity model: {model}")
+        return float(self.constants[model] * MODELS[model][1](np.asarray(float(n))))
+
+    def columns(self, extrapolate: Iterable[int] = ()) -> dict[str, object]:
+        """Flat record fields for result tables, with predictions for ``extrapolate`` sizes."""
+        record: dict[str, object] = {
+            "points": len(self.sizes),
+            "min_size": min(self.sizes),
+            "max_size": max(self.sizes),
+            "exponent": self.exponent,
+            "constant": self.constant,
+            "r2": self.r2,
+            "best_model": MODELS[self.best_model][0],
+        }
+        for slug in MODELS:
+            record[f"c_{slug}"] = self.constants[slug]
+            record[f"rms_{slug}"] = self.residuals[slug]
+        for n in extrapolate:
+            record[f"predicted_s_{n}"] = self.predict(n)
+        return record
+
+
+def fit_series(sizes: Sequence[int], times: Sequence[float]) -> ComplexityFit:
+    """Fit runtimes against sizes.
+
+    Everything is fitted on log-log data so that every size weighs the same:
+    ``log t = log c + log g(n)`` for each of ``MODELS`` (the least-squares ``c`` is
+    the geometric mean of ``t / g(n)``), and ``log t = a + b log n`` for the free
+    exponent ``b``. Residuals are RMS errors in natural-log units, so 0.1 is
+    roughly a 10% typical deviation. Repeated sizes are reduced to their median.
+    """
+    frame = pd.DataFrame({"size": np.asarray(sizes, dtype=float), "time": np.asarray(times, dtype=float)})
+    frame = frame[(frame["size"] > 1) & (frame["time"] > 0)].groupby("size", as_index=False)["time"].median()
+    if len(frame) < 2:
+        raise ValueError("Complexity fitting needs positive timings for at least two sizes above 1.")
+    n = frame["size"].to_numpy()
+    log_t = np.log(frame["time"].to_numpy())
+    log_n = np.log(n)
+    slope, intercept = np.polyfit(log_n, log_t, 1)
+    total = float(((log_t - log_t.mean()) ** 2).sum())
+    fitted = intercept + slope * log_n
+    r2 = 1 - float(((log_t - fitted) ** 2).sum()) / total if total > 0 else None
+    constants: dict[str, float] = {}
+    residuals: dict[str, float] = {}
+    for slug, (_, growth) in MODELS.items():
+        log_g = np.log(growth(n))
+        log_c = float((log_t - log_g).mean())
+        constants[slug] = float(np.exp(log_c))
+        residuals[slug] = float(np.sqrt(((log_t - log_g - log_c) ** 2).mean()))
+    return ComplexityFit(
+        sizes=tuple(int(x) for x in n),
+        exponent=float(slope),
+        constant=float(np.exp(intercept)),
+        r2=r2,
+        constants=constants,
+        residuals=residuals,
+    )
+
+
+def fit_results(
+    results: pd.DataFrame, time_column: str | None = None, extrapolate: Iterable[int] = ()
+) -> pd.DataFrame:
+    """Fit every algorithm x dataset series (and gap/worker/GC variant) of a results table.
+
+    ``time_column`` defaults to the first of ``TIME_COLUMNS`` present. Series with
+    fewer than two sizes are skipped. ``extrapolate`` adds ``predicted_s_<n>``
+    columns from each series' best model.
+    """
+    if time_column is None:
+        time_column = next((c for c in TIME_COLUMNS if c in results.columns), None)
+        if time_column is None:
+            raise ValueError(f"Results have none of the time columns {', '.join(TIME_COLUMNS)}.")
+    elif time_column not in results.columns:
+        raise ValueError(f"Results have no {time_column} column.")
+    targets = list(extrapolate)
+    keys = [c for c in SERIES_COLUMNS if c in results.columns]
+    records: list[dict[str, object]] = []
+    for group, series in results.groupby(keys, dropna=False, sort=False):
+        group = group if isinstance(group, tuple) else (group,)
+        if series["size"].nunique() < 2:
+            continue
+        try:
+            fit = fit_series(series["size"].tolist(), series[time_column].tolist())
+        except ValueError:
+            continue
+        record: dict[str, object] = dict(zip(keys, group))
+        record["time_column"] = time_column
+        record.update(fit.columns(targets))
+        records.append(record)
+    return pd.DataFrame.from_records(records)
+
+
+__all__ = ["ComplexityFit", "MODELS", "SERIES_COLUMNS", "TIME_COLUMNS", "fit_results", "fit_series"]
@@ -0,0 +1,287 @@
+"""SQLite history of benchmark results and regression checks between runs."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import os
+import platform
+import sqlite3
+import subprocess
+from contextlib import closing
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+
+try:
+    import psutil
+except ImportError:  # pragma: no cover - dependency expected
+    psutil = None
+
+DEFAULT_DB = "data/results/history.sqlite"
+# A cell is algorithm x dataset x size, split further by these columns when present.
+VARIANT_COLUMNS = ("gap_sequence", "workers", "gc_mode", "measure_mode", "isolated")
+# Relative increase needed before a cell counts as slower / hungrier. Run-to-run
+# drift of small cells on one machine reaches 5-15%, well beyond the within-run CIs.
+DEFAULT_TIME_THRESHOLD = 0.15
+DEFAULT_MEMORY_THRESHOLD = 0.10
+# Allocation deltas below this (MB) are too small to compare.
+MEMORY_FLOOR_MB = 0.5
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    git_commit TEXT,
+    git_dirty INTEGER,
+    timestamp TEXT NOT NULL,
+    python TEXT NOT NULL,
+    machine TEXT NOT NULL,
+    machine_info TEXT NOT NULL,
+    label TEXT
+);
+CREATE TABLE IF NOT EXISTS results (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    algorithm TEXT NOT NULL,
+    dataset TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    variant TEXT NOT NULL,
+    record TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_run ON results(run_id);
+CREATE INDEX IF NOT EXISTS runs_commit ON runs(git_commit);
+"""
+
+
+def git_commit(cwd: str | Path | None = None) -> tuple[str | None, bool]:
+    """HEAD commit of the repository around ``cwd`` and whether tracked files changed.
+
+    ``cwd`` defaults to this package's directory, so the commit is that of the code
+    being benchmarked, wherever the runner is started from.
+    """
+    cwd = Path(__file__).resolve().parent if cwd is None else cwd
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=cwd, capture_output=True, text=True, check=True, timeout=10
+        ).stdout.strip()
+        status = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            cwd=cwd,
+            capture_output=True,
+            text=True,
+            check=True,
+            timeout=30,
+        ).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None, False
+    return commit or None, bool(status.strip())
+
+
+def machine_info() -> dict[str, Any]:
+    """Hardware and OS facts that affect timings; hashed into the machine fingerprint."""
+    info: dict[str, Any] = {
+        "system": platform.system(),
+        "release": platform.release(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpus": os.cpu_count(),
+        "implementation": platform.python_implementation(),
+    }
+    if psutil is not None:
+        info["memory_bytes"] = psutil.virtual_memory().total
+    return info
+
+
+def machine_fingerprint(info: dict[str, Any] | None = None) -> str:
+    info = machine_info() if info is None else info
+    return hashlib.sha1(json.dumps(info, sort_keys=True).encode("utf-8")).hexdigest()[:12]
+
+
+def connect(db_path: str | Path = DEFAULT_DB) -> sqlite3.Connection:
+    path = Path(db_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA foreign_keys = ON")
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def _variant(row: dict[str, Any]) -> str:
+    parts = []
+    for column in VARIANT_COLUMNS:
+        value = row.get(column)
+        if value is None or (isinstance(value, float) and math.isnan(value)):
+            continue
+        parts.append(f"{column}={value}")
+    return ",".join(parts)
+
+
+def _plain(value: Any) -> Any:
+    # NumPy scalars and NaN from DataFrame rows, as JSON-friendly Python values.
+    if hasattr(value, "item"):
+        value = value.item()
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+def record_run(
+    results: pd.DataFrame,
+    db_path: str | Path = DEFAULT_DB,
+    *,
+    label: str | None = None,
+    commit: str | None = None,
+    timestamp: datetime | None = None,
+) -> int:
+    """Store a ``run_experiments`` table as one run and return its id.
+
+    The run is keyed by the git commit (detected unless given), UTC timestamp,
+    Python version and machine fingerprint; every row keeps all its columns.
+    """
+    missing = {"algorithm", "dataset", "size"} - set(results.columns)
+    if missing:
+        raise ValueError(f"Results are missing columns: {', '.join(sorted(missing))}")
+    dirty = False
+    if commit is None:
+        commit, dirty = git_commit()
+    info = machine_info()
+    stamp = (timestamp or datetime.now(timezone.utc)).isoformat(timespec="seconds")
+    with closing(connect(db_path)) as conn, conn:
+        cursor = conn.execute(
+            "INSERT INTO runs (git_commit, git_dirty, timestamp, python, machine, machine_info, label)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (commit, int(dirty), stamp, platform.python_version(), machine_fingerprint(info), json.dumps(info), label),
+        )
+        run_id = int(cursor.lastrowid)
+        rows = []
+        for row in results.to_dict(orient="records"):
+            record = {key: _plain(value) for key, value in row.items()}
+            rows.append(
+                (run_id, record["algorithm"], record["dataset"], int(record["size"]), _variant(record), json.dumps(record))
+            )
+        conn.executemany(
+            "INSERT INTO results (run_id, algorithm, dataset, size, variant, record) VALUES (?, ?, ?, ?, ?, ?)", rows
+        )
+    return run_id
+
+
+def list_runs(db_path: str | Path = DEFAULT_DB) -> pd.DataFrame:
+    with closing(connect(db_path)) as conn:
+        return pd.read_sql_query(
+            "SELECT r.id, r.git_commit, r.git_dirty, r.timestamp, r.python, r.machine, r.label,"
+            " COUNT(x.run_id) AS cells FROM runs r LEFT JOIN results x ON x.run_id = r.id"
+            " GROUP BY r.id ORDER BY r.id",
+            conn,
+        )
+
+
+def resolve_run(conn: sqlite3.Connection, ref: str | int) -> int:
+    """Run id for ``ref``: an id, ``latest``, ``latest~N``, or a commit prefix (its latest run)."""
+    text = str(ref).strip()
+    if text == "latest" or text.startswith("latest~"):
+        back = text.partition("~")[2]
+        if back and not back.isdigit():
+            raise ValueError(f"Invalid run reference: {ref}")
+        row = conn.execute("SELECT id FROM runs ORDER BY id DESC LIMIT 1 OFFSET ?", (int(back or 0),)).fetchone()
+    else:
+        row = None
+        if text.isdigit():
+            row = conn.execute("SELECT id FROM runs WHERE id = ?", (int(text),)).fetchone()
+        if row is None and text:
+            row = conn.execute(
+                "SELECT id FROM runs WHERE git_commit LIKE ? ORDER BY id DESC LIMIT 1", (text + "%",)
+            ).fetchone()
+    if row is None:
+        raise ValueError(f"No benchmark run matches {ref}.")
+    return int(row[0])
+
+
+def load_run(db_path: str | Path, ref: str | int) -> tuple[dict[str, Any], pd.DataFrame]:
+    """Run metadata and its result rows (with a ``variant`` column) for ``ref``."""
+    with closing(connect(db_path)) as conn:
+        run_id = resolve_run(conn, ref)
+        cursor = conn.execute("SELECT * FROM runs WHERE id = ?", (run_id,))
+        meta = dict(zip([c[0] for c in cursor.description], cursor.fetchone()))
+        rows = conn.execute("SELECT variant, record FROM results WHERE run_id = ?", (run_id,)).fetchall()
+    records = [{**json.loads(record), "variant": variant} for variant, record in rows]
+    return meta, pd.DataFrame.from_records(records)
+
+
+def compare_runs(
+    baseline: pd.DataFrame,
+    candidate: pd.DataFrame,
+    time_threshold: float = DEFAULT_TIME_THRESHOLD,
+    memory_threshold: float = DEFAULT_MEMORY_THRESHOLD,
+) -> pd.DataFrame:
+    """Cell-by-cell comparison of two runs' result rows.
+
+    A cell is ``slower`` when its time (median if both runs have it, else mean)
+    rose by more than ``time_threshold`` and the runs separate robustly: where
+    both carry sample percentiles, the candidate's fastest sample must also be
+    ``time_threshold`` above the baseline's fastest and above the baseline's p95; otherwise, where both carry 95% CIs, the
+    intervals must not overlap. It has ``more_memory`` when the tracemalloc delta
+    rose by more than ``memory_threshold`` and the larger value is at least
+    ``MEMORY_FLOOR_MB``. Only cells present in both runs are compared.
+    """
+    keys = ["algorithm", "dataset", "size", "variant"]
+    both = set(baseline.columns) & set(candidate.columns)
+    time_column = "median_time_s" if "median_time_s" in both else "avg_time_s"
+    robust = {"min_time_s", "p95_time_s"} <= both
+    merged = baseline.merge(candidate, on=keys, suffixes=("_base", "_cand"))
+    rows: list[dict[str, object]] = []
+    for _, row in merged.iterrows():
+        base_time, cand_time = row[f"{time_column}_base"], row[f"{time_column}_cand"]
+        time_ratio = cand_time / base_time if base_time and base_time > 0 else None
+        slower = time_ratio is not None and time_ratio > 1 + time_threshold
+        spread = (row["min_time_s_base"], row["p95_time_s_base"], row["min_time_s_cand"]) if robust else ()
+        if spread and not any(pd.isna(v) for v in spread):
+            base_min, base_p95, cand_min = spread
+            slower = slower and cand_min > base_p95 and cand_min > base_min * (1 + time_threshold)
+        elif "ci95_low_s" in both:
+            base_ci = (row["ci95_low_s_base"], row["ci95_high_s_base"])
+            cand_ci = (row["ci95_low_s_cand"], row["ci95_high_s_cand"])
+            if not any(pd.isna(v) for v in base_ci + cand_ci):
+                slower = slower and cand_ci[0] > base_ci[1]
+        base_mem = row.get("memory_mb_base")
+        cand_mem = row.get("memory_mb_cand")
+        memory_ratio = None
+        more_memory = False
+        if base_mem is not None and cand_mem is not None and not pd.isna(base_mem) and not pd.isna(cand_mem):
+            if base_mem > 0:
+                memory_ratio = cand_mem / base_mem
+            more_memory = cand_mem >= MEMORY_FLOOR_MB and cand_mem > base_mem * (1 + memory_threshold)
+        rows.append(
+            {
+                **{key: row[key] for key in keys},
+                "base_time_s": base_time,
+                "cand_time_s": cand_time,
+                "time_ratio": time_ratio,
+                "base_memory_mb": base_mem,
+                "cand_memory_mb": cand_mem,
+                "memory_ratio": memory_ratio,
+                "slower": bool(slower),
+                "more_memory": bool(more_memory),
+                "regression": bool(slower or more_memory),
+            }
+        )
+    return pd.DataFrame.from_records(rows)
+
+
+__all__ = [
+    "DEFAULT_DB",
+    "DEFAULT_MEMORY_THRESHOLD",
+    "DEFAULT_TIME_THRESHOLD",
+    "MEMORY_FLOOR_MB",
+    "VARIANT_COLUMNS",
+    "compare_runs",
+    "connect",
+    "git_commit",
+    "list_runs",
+    "load_run",
+    "machine_fingerprint",
+    "machine_info",
+    "record_run",
+    "resolve_run",
+]
@@ -0,0 +1,209 @@
+"""Presortedness and value statistics of benchmark inputs."""
+
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+from typing import Any, List, Sequence
+
+import numpy as np
+
+# Above this size inversions are estimated from sampled pairs unless exact=True.
+EXACT_LIMIT = 1 << 20
+DEFAULT_SAMPLE_PAIRS = 200_000
+
+
+@dataclass(frozen=True)
+class InputStats:
+    n: int
+    ascending_runs: int
+    longest_run: int
+    inversions: int
+    inversions_exact: bool
+    duplicate_ratio: float
+    value_min: Any
+    value_max: Any
+
+    @property
+    def inversion_ratio(self) -> float:
+        """Inversions over the n(n-1)/2 of a reversed input: 0 sorted, 1 reversed."""
+        pairs = self.n * (self.n - 1) // 2
+        return self.inversions / pairs if pairs else 0.0
+
+    @property
+    def value_range(self) -> Any:
+        try:
+            return self.value_max - self.value_min
+        except TypeError:
+            # Empty input, or values without subtraction (e.g. strings).
+            return None
+
+    def columns(self) -> dict[str, Any]:
+        """Flat record fields for runner and GUI result tables."""
+        record = asdict(self)
+        del record["n"]
+        record["inversion_ratio"] = self.inversion_ratio
+        record["value_range"] = self.value_range
+        return record
+
+
+def _merge_count(items: List[Any]) -> int:
+    """Bottom-up merge sort of ``items`` in place, returning the inversions it removed."""
+    n = len(items)
+    src, dst = items, items[:]
+    total = 0
+    width = 1
+    while width < n:
+        for lo in range(0, n, 2 * width):
+            mid = min(lo + width, n)
+            hi = min(lo + 2 * width, n)
+            i, j, k = lo, mid, lo
+            while i < mid and j < hi:
+                if src[j] < src[i]:
+                    # Every remaining left element is greater than src[j].
+                    total += mid - i
+                    dst[k] = src[j]
+                    j += 1
+                else:
+                    dst[k] = src[i]
+                    i += 1
+                k += 1
+            dst[k : k + mid - i] = src[i:mid]
+            k += mid - i
+            dst[k : k + hi - j] = src[j:hi]
+        src, dst = dst, src
+        width *= 2
+    return total
+
+
+def _merge_count_array(values: np.ndarray) -> int:
+    """Vectorised merge-based inversion count, O(n log n).
+
+    Values are replaced by their stable ranks (so equal values are never counted)
+    and merged level by level. At each level every block's left half is sorted, so
+    keys ``block * n + rank`` of all left halves form one sorted array: a single
+    ``searchsorted`` then counts, for every right-half element, the left elements of
+    its own block that are greater. The stable sort that merges the halves sees two
+    runs per block and runs in linear time.
+    """
+    n = len(values)
+    ranks = np.empty(n, dtype=np.int64)
+    ranks[np.argsort(values, kind="stable")] = np.arange(n)
+    index = np.arange(n)
+    total = 0
+    width = 1
+    while width < n:
+        block = index // (2 * width)
+        right = (index % (2 * width)) >= width
+        keys = block * n + ranks
+        pos = np.searchsorted(keys[~right], keys[right], side="right")
+        # A block with a right half has a full left half, so blocks 0..b hold (b+1)*width left elements.
+        total += int(((block[right] + 1) * width - pos).sum())
+        ranks = np.sort(keys, kind="stable") - block * n
+        width *= 2
+    return total
+
+
+def count_inversions(values: Sequence[Any]) -> int:
+    """Exact number of pairs i < j with values[i] > values[j]."""
+    if isinstance(values, np.ndarray) or (len(values) and isinstance(values[0], (int, float))):
+        try:
+            array = np.asarray(values)
+        except (TypeError, ValueError, OverflowError):
+            array = None
+        if array is not None and array.ndim == 1 and array.dtype.kind in "iuf":
+            return _merge_count_array(array) if len(array) > 1 else 0
+    return _merge_count(list(values))
+
+
+def estimate_inversions(values: Sequence[Any], pairs: int = DEFAULT_SAMPLE_PAIRS, seed: int = 0) -> int:
+    """Inversions extrapolated from ``pairs`` uniformly sampled index pairs."""
+    n = len(values)
+    if n < 2:
+        return 0
+    rng = np.random.default_rng(seed)
+    i = rng.integers(0, n, size=pairs)
+    j = rng.integers(0, n, size=pairs)
+    keep = i != j
+    lo, hi = np.minimum(i, j)[keep], np.maximum(i, j)[keep]
+    if isinstance(values, np.ndarray):
+        inverted = int((values[lo] > values[hi]).sum())
+    else:
+        inverted = sum(values[a] > values[b] for a, b in zip(lo.tolist(), hi.tolist()))
+    return round(inverted / max(1, len(lo)) * (n * (n - 1) // 2))
+
+
+def analyze(
+    values: Sequence[Any],
+    exact: bool | None = None,
+    sample_pairs: int = DEFAULT_SAMPLE_PAIRS,
+    seed: int = 0,
+) -> InputStats:
+    """Runs, longest run, inversions, duplicate ratio and value bounds of ``values``.
+
+    Runs are maximal non-decreasing stretches. Inversions are counted exactly when
+    ``exact`` is true, or by default for inputs of at most ``EXACT_LIMIT`` elements;
+    otherwise they are estimated from ``sample_pairs`` random pairs. Numeric lists and
+    arrays (including memory-mapped datasets) take a NumPy path; other comparable
+    items fall back to pure Python.
+    """
+    n = len(values)
+    if exact is None:
+        exact = n <= EXACT_LIMIT
+    array = values if isinstance(values, np.ndarray) else None
+    if array is None and n and isinstance(values[0], (int, float)):
+        try:
+            array = np.asarray(values)
+        except (TypeError, ValueError, OverflowError):
+            array = None
+        if array is not None and (array.ndim != 1 or array.dtype.kind not in "iuf"):
+            array = None
+    if n == 0:
+        return InputStats(0, 0, 0, 0, True, 0.0, None, None)
+
+    if array is not None:
+        breaks = np.flatnonzero(array[1:] < array[:-1]) + 1
+        bounds = np.concatenate(([0], breaks, [n]))
+        longest = int(np.diff(bounds).max())
+        ordered = np.sort(array)
+        distinct = 1 + int(np.count_nonzero(ordered[1:] != ordered[:-1]))
+        value_min, value_max = ordered[0].item(), ordered[-1].item()
+        run_count = len(breaks) + 1
+    else:
+        items = list(values)
+        run_count = longest = current = 1
+        for a, b in zip(items, items[1:]):
+            if b < a:
+                run_count += 1
+                current = 1
+            else:
+                current += 1
+                longest = max(longest, current)
+        ordered_items = sorted(items)
+        distinct = 1 + sum(1 for a, b in zip(ordered_items, ordered_items[1:]) if a != b)
+        value_min, value_max = ordered_items[0], ordered_items[-1]
+
+    source = array if array is not None else values
+    if exact:
+        inversions = count_inversions(source)
+    else:
+        inversions = estimate_inversions(source, sample_pairs, seed)
+    return InputStats(
+        n=n,
+        ascending_runs=run_count,
+        longest_run=longest,
+        inversions=inversions,
+        inversions_exact=exact,
+        duplicate_ratio=1 - distinct / n,
+        value_min=value_min,
+        value_max=value_max,
+    )
+
+
+__all__ = [
+    "DEFAULT_SAMPLE_PAIRS",
+    "EXACT_LIMIT",
+    "InputStats",
+    "analyze",
+    "count_inversions",
+    "estimate_inversions",
+]
@@ -3,16 +3,32 @@
 from __future__ import annotations
 
 from pathlib import Path
+from typing import Iterable
+
 import pandas as pd
 
+from sorting_lab.analysis import complexity
+
+
+def generate_report(results_path: str, output_path: str, extrapolate: Iterable[int] = ()) -> None:
+    """Create a lightweight HTML report from a CSV results file.
 
-def generate_report(results_path: str, output_path: str) -> None:
-    """Create a lightweight HTML report from a CSV results file."""
+    When the results cover at least two sizes a complexity section lists the
+    ``complexity.fit_results`` fits, with predictions for the ``extrapolate`` sizes.
+    """
     df = pd.read_csv(results_path)
-    summary_fields = {"avg_time_s": "mean", "memory_mb": "mean"}
-    if "memory_peak_mb" in df.columns:
-        summary_fields["memory_peak_mb"] = "mean"
+    summary_fields = {
+        column: "mean" for column in ("avg_time_s", "memory_mb", "memory_peak_mb") if column in df.columns
+    }
     summary = df.groupby("algorithm").agg(summary_fields).reset_index()
+    fits = complexity.fit_results(df, extrapolate=extrapolate) if "size" in df.columns else pd.DataFrame()
+    fit_section = ""
+    if not fits.empty:
+        fit_section = f"""
+    <h2>Karmaşıklık Uyumu</h2>
+    <p>Log-log en küçük kareler: üs serbest kuvvet yasasından, en iyi model en küçük RMS log artığından.</p>
+    {fits.to_html(index=False)}
+    """
 
     html = f"""
     <html>
@@ -24,6 +40,7 @@ def generate_report(results_path: str, output_path: str) -> None:
     {df.to_html(index=False)}
     <h2>Özet</h2>
     {summary.to_html(index=False)}
+    {fit_section}
     </body>
     </html>
     """
@@ -2,13 +2,50 @@
 
 from __future__ import annotations
 
+import time
+from contextlib import nullcontext
 from pathlib import Path
-from typing import Iterable
+from typing import Any, Callable, Iterable
 
 import pandas as pd
 
 from sorting_lab import algorithms
-from sorting_lab.utils import data_gen, metrics
+from sorting_lab.analysis import history, presortedness
+from sorting_lab.utils import data_gen, dataset_cache, isolation, metrics
+
+# Recording falls back to another algorithm (the serial chunk sort, or the one auto
+# picks), so there is no instrumentation overhead of their own to measure.
+OVERHEAD_SKIPPED = ("parallel_merge", "auto")
+# Keeps both overhead runs on the implementation that records steps.
+_OVERHEAD_OPTIONS: dict[str, dict[str, Any]] = {"radix": {"backend": "python"}}
+
+
+def _comparisons(algo_key: str, data: list[int], options: dict[str, Any]) -> int | None:
+    if algorithms.ALGORITHMS[algo_key].parallel:
+        # Counting wrappers cannot be pickled to a process pool; count in-process.
+        options = {**options, "workers": 1}
+    try:
+        return metrics.count_comparisons(lambda items: algorithms.run_algorithm(algo_key, items, **options), data)
+    except (TypeError, ValueError):
+        # Radix-style sorts inspect digits instead of comparing elements.
+        return None
+
+
+def _dataset(dataset: str, size: int, data_file: str | None, params: dict[str, Any] | None = None) -> Any:
+    """Cached generated data, or the first ``size`` elements of a memory-mapped dataset file."""
+    if data_file is None:
+        return dataset_cache.default_cache().get(dataset, size, **(params or {}))
+    data = data_gen.load_dataset(data_file)
+    if len(data) < size:
+        raise ValueError(f"{data_file} holds {len(data)} elements, fewer than {size}.")
+    return data[:size]
+
+
+def _input_for(algo_key: str, data: Any) -> Any:
+    # Convert cached or memory-mapped arrays once, outside the timed region, for list-based sorts.
+    if algorithms.ALGORITHMS[algo_key].accepts_arrays:
+        return data
+    return data.tolist()
 
 
 def run_experiments(
@@ -17,31 +54,217 @@ def run_experiments(
     dataset: str,
     runs: int = 3,
     save_path: str | None = "data/results/experiments.csv",
+    count_comparisons: bool = False,
+    gap_sequences: Iterable[str] | None = None,
+    data_file: str | None = None,
+    dataset_params: dict[str, Any] | None = None,
+    measure_mode: str = "separate",
+    isolate: bool = False,
+    recycle_after: int = isolation.DEFAULT_RECYCLE_AFTER,
+    adaptive: bool | metrics.AdaptiveConfig = True,
+    gc_mode: str = "enabled",
+    history_db: str | None = None,
+    history_label: str | None = None,
 ) -> pd.DataFrame:
-    """Run benchmarks across algorithms and sizes, optionally persisting results."""
+    """Benchmark every algorithm x size cell; one row each, with the input's presortedness.
+
+    ``runs``: minimum timed samples (``min_runs`` column; ``samples`` is what was taken).
+    ``adaptive``: stopping rules (``AdaptiveConfig``), defaults (True) or exactly ``runs`` (False).
+    ``measure_mode`` / ``gc_mode``: one of ``metrics.MODES`` / ``metrics.GC_MODES``.
+    ``isolate``: trials in a forkserver worker replaced every ``recycle_after`` tasks.
+    ``count_comparisons``: adds ``comparisons`` from an untimed pass (None for radix).
+    ``gap_sequences``: one ``shell`` row per sequence, tagged ``gap_sequence``.
+    ``data_file``: prefixes of a ``data_gen.write_dataset`` file instead of ``dataset``.
+    ``save_path`` / ``history_db``: CSV to write and SQLite history to append to.
+    """
     records: list[dict[str, object]] = []
+    if data_file is not None:
+        dataset = Path(data_file).name
     algo_list = list(algorithms_keys)
     size_list = list(sizes)
-    for size in size_list:
-        base_data = data_gen.generate(dataset, size)
+    gap_list = list(gap_sequences or [])
+    if gap_list and "shell" not in algo_list:
+        raise ValueError("gap_sequences only apply to shell sort, which is not among the algorithms.")
+    config: metrics.AdaptiveConfig | None = None
+    if isinstance(adaptive, metrics.AdaptiveConfig):
+        config = adaptive
+    elif adaptive:
+        config = metrics.AdaptiveConfig(min_runs=max(2, runs), max_runs=max(runs, metrics.AdaptiveConfig.max_runs))
+    with isolation.IsolatedRunner(recycle_after) if isolate else nullcontext() as runner:
+        for size in size_list:
+            size_data = _dataset(dataset, size, data_file, dataset_params)
+            input_stats = presortedness.analyze(size_data).columns()
+            handle = runner.share(size_data) if runner is not None else None
+            for algo_key in algo_list:
+                base_data = _input_for(algo_key, size_data)
+                variants: list[dict[str, Any]] = [{}]
+                if algo_key == "shell" and gap_list:
+                    variants = [{"gaps": gaps} for gaps in gap_list]
+                for options in variants:
+                    if runner is not None:
+                        trial_stats = isolation.run_trials(
+                            runner,
+                            algo_key,
+                            handle,
+                            runs,
+                            mode=measure_mode,
+                            options=options,
+                            adaptive=config,
+                            gc_mode=gc_mode,
+                        )
+                    else:
+                        trial_stats = metrics.run_trials(
+                            lambda: algorithms.run_algorithm(algo_key, base_data, **options)[0],
+                            runs=runs,
+                            mode=measure_mode,
+                            adaptive=config,
+                            gc_mode=gc_mode,
+                        )
+                    record: dict[str, object] = {
+                        "algorithm": algo_key,
+                        "dataset": dataset,
+                        "size": size,
+                        "min_runs": runs,
+                        "avg_time_s": trial_stats.avg,
+                        "std_time_s": trial_stats.std,
+                        "memory_mb": trial_stats.memory_mb,
+                        "memory_peak_mb": trial_stats.memory_peak_mb,
+                        "measure_mode": trial_stats.mode,
+                        "isolated": isolate,
+                        "gc_mode": trial_stats.gc_mode,
+                        "gc_collections": trial_stats.gc_collections,
+                        "gc_pause_s": trial_stats.gc_pause_s,
+                    }
+                    if trial_stats.summary is not None:
+                        record.update(trial_stats.summary.columns())
+                    if isolate:
+                        record["rss_delta_mb"] = trial_stats.rss_delta_mb
+                    if "gaps" in options:
+                        record["gap_sequence"] = options["gaps"]
+                    if count_comparisons:
+                        record["comparisons"] = _comparisons(algo_key, base_data, options)
+                    record.update(input_stats)
+                    records.append(record)
+
+    df = pd.DataFrame.from_records(records)
+    if save_path:
+        out_path = Path(save_path)
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        df.to_csv(out_path, index=False)
+    if history_db and not df.empty:
+        history.record_run(df, history_db, label=history_label)
+    return df
+
+
+def _best_time(func: Callable[[], Any], runs: int) -> float:
+    best = float("inf")
+    for _ in range(max(1, runs)):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_instrumentation_overhead(
+    algorithms_keys: Iterable[str],
+    sizes: Iterable[int],
+    dataset: str,
+    runs: int = 3,
+    data_file: str | None = None,
+    dataset_params: dict[str, Any] | None = None,
+) -> pd.DataFrame:
+    """Time each algorithm's uninstrumented path against its step-recording path.
+
+    The instrumented run uses ``step_limit=0`` so every recorder call is made but
+    nothing is stored, isolating the cost of the instrumentation itself. Both sides
+    are timed with bare ``perf_counter`` calls (best of ``runs``) because allocation
+    tracing in ``metrics.measure`` would dwarf the difference being measured.
+    Radix runs its pure-Python backend on both sides; algorithms whose recording
+    path is a different algorithm altogether (``OVERHEAD_SKIPPED``) are left out.
+    """
+    records: list[dict[str, object]] = []
+    if data_file is not None:
+        dataset = Path(data_file).name
+    algo_list = list(algorithms_keys)
+    for size in sizes:
+        size_data = _dataset(dataset, size, data_file, dataset_params)
+        input_stats = presortedness.analyze(size_data).columns()
         for algo_key in algo_list:
-            trial_stats = metrics.run_trials(lambda: algorithms.run_algorithm(algo_key, base_data)[0], runs=runs)
+            if algo_key in OVERHEAD_SKIPPED:
+                continue
+            base_data = _input_for(algo_key, size_data)
+            options = _OVERHEAD_OPTIONS.get(algo_key, {})
+            fast = _best_time(lambda: algorithms.run_algorithm(algo_key, base_data, **options), runs)
+            instrumented = _best_time(
+                lambda: algorithms.run_algorithm(algo_key, base_data, record_steps=True, step_limit=0, **options),
+                runs,
+            )
             records.append(
                 {
                     "algorithm": algo_key,
                     "dataset": dataset,
                     "size": size,
                     "runs": runs,
-                    "avg_time_s": trial_stats.avg,
-                    "std_time_s": trial_stats.std,
-                    "memory_mb": trial_stats.memory_mb,
-                    "memory_peak_mb": trial_stats.memory_peak_mb,
+                    "fast_time_s": fast,
+                    "instrumented_time_s": instrumented,
+                    "overhead_ratio": instrumented / fast if fast > 0 else None,
+                    **input_stats,
                 }
             )
+    return pd.DataFrame.from_records(records)
 
-    df = pd.DataFrame.from_records(records)
-    if save_path:
-        out_path = Path(save_path)
-        out_path.parent.mkdir(parents=True, exist_ok=True)
-        df.to_csv(out_path, index=False)
-    return df
+
+def run_scaling(
+    algorithms_keys: Iterable[str],
+    sizes: Iterable[int],
+    dataset: str,
+    worker_counts: Iterable[int],
+    runs: int = 3,
+    data_file: str | None = None,
+    dataset_params: dict[str, Any] | None = None,
+) -> pd.DataFrame:
+    """Time parallel algorithms across worker counts and report the speedup.
+
+    Each algorithm is run with its ``workers`` option set to every count (a single
+    worker is always included as the baseline); only ``parallel`` algorithms take
+    that option, so any other key raises ``ValueError``. ``speedup`` is the one-worker time
+    divided by the time at that count and ``efficiency`` is speedup per worker.
+    Timings are best-of-``runs`` ``perf_counter`` measurements; the first call for
+    each count is untimed so pool start-up is not charged to the sort.
+    """
+    records: list[dict[str, object]] = []
+    if data_file is not None:
+        dataset = Path(data_file).name
+    algo_list = list(algorithms_keys)
+    serial = [
+        key for key in algo_list if key in algorithms.ALGORITHMS and not algorithms.ALGORITHMS[key].parallel
+    ]
+    if serial:
+        raise ValueError(f"Worker scaling needs parallel algorithms; {', '.join(serial)} take no workers.")
+    counts = sorted(set(worker_counts) | {1})
+    for size in sizes:
+        size_data = _dataset(dataset, size, data_file, dataset_params)
+        input_stats = presortedness.analyze(size_data).columns()
+        for algo_key in algo_list:
+            base_data = _input_for(algo_key, size_data)
+            baseline: float | None = None
+            for workers in counts:
+                algorithms.run_algorithm(algo_key, base_data, workers=workers)
+                elapsed = _best_time(lambda: algorithms.run_algorithm(algo_key, base_data, workers=workers), runs)
+                if baseline is None:
+                    baseline = elapsed
+                speedup = baseline / elapsed if elapsed > 0 else None
+                records.append(
+                    {
+                        "algorithm": algo_key,
+                        "dataset": dataset,
+                        "size": size,
+                        "workers": workers,
+                        "runs": runs,
+                        "time_s": elapsed,
+                        "speedup": speedup,
+                        "efficiency": speedup / workers if speedup is not None else None,
+                        **input_stats,
+                    }
+                )
+    return pd.DataFrame.from_records(records)
@@ -1,28 +1,433 @@
 """Command-line interface for running batch experiments."""
 
 import argparse
+import sqlite3
+import sys
 from typing import List
 
-from sorting_lab.analysis.runner import run_experiments
+import pandas as pd
+
+from sorting_lab import algorithms
+from sorting_lab.algorithms.auto_sort import set_profile as set_auto_profile
+from sorting_lab.algorithms.shell_sort import GAP_SEQUENCES
+from sorting_lab.analysis import complexity, history
+from sorting_lab.analysis.report import generate_report
+from sorting_lab.analysis.runner import run_experiments, run_instrumentation_overhead, run_scaling
+from sorting_lab.utils import data_gen, dataset_cache, external_sort, isolation, metrics
 
 
 def parse_args(argv: List[str] | None = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Sorting Lab batch runner")
     parser.add_argument("--algos", default="quick,heap,merge", help="Comma-separated algorithm list")
     parser.add_argument("--sizes", default="1000,10000", help="Comma-separated dataset sizes")
-    parser.add_argument("--dataset", default="random", choices=["random", "partial", "reverse"], help="Dataset type")
-    parser.add_argument("--runs", type=int, default=3, help="Repeat count per scenario")
+    parser.add_argument("--dataset", default="random", choices=data_gen.dataset_names(), help="Dataset type")
+    parser.add_argument(
+        "--dataset-param",
+        action="append",
+        default=[],
+        metavar="KEY=VALUE",
+        help="Generator parameter, repeatable (e.g. unique=4, inversions=100, a=1.2)",
+    )
+    parser.add_argument(
+        "--runs", type=int, default=3, help="Repeat count per scenario (the minimum unless --fixed-runs)"
+    )
+    parser.add_argument(
+        "--fixed-runs",
+        action="store_true",
+        help="Time exactly --runs calls instead of sampling until the confidence interval is tight",
+    )
+    parser.add_argument(
+        "--target-ci",
+        type=float,
+        default=metrics.AdaptiveConfig.target_ci,
+        help="Stop sampling once the 95%% CI half-width is this fraction of the mean",
+    )
+    parser.add_argument(
+        "--time-budget",
+        type=float,
+        default=metrics.AdaptiveConfig.time_budget_s,
+        help="Seconds of sampling per algorithm/size cell before giving up on --target-ci",
+    )
+    parser.add_argument(
+        "--warmup", type=int, default=metrics.AdaptiveConfig.warmup, help="Untimed calls before sampling"
+    )
+    parser.add_argument(
+        "--measure-mode",
+        default="separate",
+        choices=metrics.MODES,
+        help="separate: untraced timing runs plus a traced memory run; combined: both from traced runs",
+    )
+    parser.add_argument(
+        "--gc",
+        default="enabled",
+        choices=metrics.GC_MODES,
+        help="Cyclic GC during measured calls: enabled, disabled, or freeze (only scan new objects)",
+    )
+    parser.add_argument(
+        "--fit",
+        action="store_true",
+        help="After the run, fit n, n log n, n^1.5 and n^2 models per algorithm/dataset across --sizes",
+    )
+    parser.add_argument(
+        "--isolate",
+        action="store_true",
+        help="Run every trial in a forkserver worker that reads the dataset from shared memory",
+    )
+    parser.add_argument(
+        "--recycle-after",
+        type=int,
+        default=isolation.DEFAULT_RECYCLE_AFTER,
+        help="With --isolate, replace the worker process after this many trials",
+    )
+    parser.add_argument(
+        "--data-file", default=None, help="Benchmark prefixes of a .npy or raw dataset file instead of --dataset"
+    )
     parser.add_argument("--save", default="data/results/experiments.csv", help="CSV output path (empty to skip)")
+    parser.add_argument(
+        "--history", default=history.DEFAULT_DB, help="SQLite benchmark history to append this run to (empty to skip)"
+    )
+    parser.add_argument("--label", default=None, help="Free-form label stored with the run in --history")
+    parser.add_argument(
+        "--cache-dir",
+        default=dataset_cache.DEFAULT_DIR,
+        help="Directory for cached generated datasets (empty for in-process only)",
+    )
+    parser.add_argument(
+        "--cache-mb",
+        type=int,
+        default=dataset_cache.DEFAULT_DISK_BUDGET // (1024 * 1024),
+        help="On-disk dataset cache budget (MB); least recently used datasets are evicted",
+    )
+    parser.add_argument(
+        "--auto-profile", default=None, help="JSON thresholds for the auto algorithm (fields of AutoProfile)"
+    )
+    parser.add_argument("--comparisons", action="store_true", help="Also count element comparisons per algorithm")
+    parser.add_argument(
+        "--gaps",
+        default="",
+        help=f"Comma-separated shell sort gap sequences to sweep ({', '.join(GAP_SEQUENCES)})",
+    )
+    parser.add_argument(
+        "--overhead",
+        action="store_true",
+        help="Compare uninstrumented and step-recording paths instead of running experiments",
+    )
+    parser.add_argument(
+        "--workers",
+        default="",
+        help="Comma-separated worker counts; reports speedup of parallel algorithms instead of running experiments",
+    )
+    return parser.parse_args(argv)
+
+
+def parse_sort_file_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="sorting_lab.cli sort-file", description="Sort an integer file larger than memory"
+    )
+    parser.add_argument(
+        "paths",
+        nargs="+",
+        metavar="[INPUT] OUTPUT",
+        help="Input file (binary values, one integer per line, or a make-dataset file) and output file in "
+        "the same format; only OUTPUT with --generate",
+    )
+    parser.add_argument(
+        "--generate",
+        default=None,
+        choices=data_gen.dataset_names(),
+        help="Sort a generated dataset streamed in chunks instead of reading INPUT",
+    )
+    parser.add_argument("--size", type=int, default=None, help="Element count for --generate")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed for --generate")
+    parser.add_argument(
+        "--dataset-param", action="append", default=[], metavar="KEY=VALUE", help="Generator parameter, repeatable"
+    )
+    parser.add_argument("--algo", default="radix", choices=algorithms.keys(), help="Algorithm for in-memory chunks")
+    parser.add_argument(
+        "--memory-mb",
+        type=int,
+        default=external_sort.DEFAULT_MEMORY_BUDGET // (1024 * 1024),
+        help="Memory budget for chunks and merge buffers (MB)",
+    )
+    parser.add_argument("--fan-in", type=int, default=external_sort.DEFAULT_FAN_IN, help="Runs merged per pass")
+    parser.add_argument("--format", default="auto", choices=external_sort.FORMATS, help="File format (auto: by suffix)")
+    parser.add_argument("--dtype", default="int64", choices=external_sort.DTYPES, help="Binary value type")
+    parser.add_argument("--tmp-dir", default=None, help="Directory for spilled runs")
+    return parser.parse_args(argv)
+
+
+def parse_make_dataset_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="sorting_lab.cli make-dataset", description="Write a dataset file")
+    parser.add_argument("dataset", choices=data_gen.dataset_names(), help="Dataset type")
+    parser.add_argument("size", type=int, help="Element count")
+    parser.add_argument("output", help="Output path (.npy, otherwise raw with a small header)")
+    parser.add_argument("--dtype", default="int64", choices=list(data_gen.DATASET_DTYPES), help="Stored value type")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed")
+    parser.add_argument(
+        "--dataset-param", action="append", default=[], metavar="KEY=VALUE", help="Generator parameter, repeatable"
+    )
+    parser.add_argument(
+        "--chunk-size", type=int, default=1 << 20, help="Values generated and written per chunk"
+    )
+    return parser.parse_args(argv)
+
+
+def parse_fit_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="sorting_lab.cli fit", description="Fit n, n log n, n^1.5 and n^2 models to a results CSV"
+    )
+    parser.add_argument("results", help="CSV written by the batch runner (needs at least two sizes)")
+    parser.add_argument(
+        "--time-column", default=None, help=f"Runtime column (default: first of {', '.join(complexity.TIME_COLUMNS)})"
+    )
+    parser.add_argument("--extrapolate", default="", help="Comma-separated sizes to predict runtime for")
+    parser.add_argument("--save", default=None, help="Write the fits to this CSV")
+    parser.add_argument("--report", default=None, help="Write an HTML report with the fits to this path")
+    return parser.parse_args(argv)
+
+
+def parse_history_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="sorting_lab.cli history", description="List stored benchmark runs")
+    parser.add_argument("--db", default=history.DEFAULT_DB, help="SQLite benchmark history")
+    return parser.parse_args(argv)
+
+
+def parse_compare_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="sorting_lab.cli compare",
+        description="Flag cells slower or hungrier than a baseline run; exits with status 1 on regressions",
+    )
+    parser.add_argument("baseline", help="Baseline run: id, latest, latest~N, or git commit prefix")
+    parser.add_argument("candidate", nargs="?", default="latest", help="Run to check (default: latest)")
+    parser.add_argument("--db", default=history.DEFAULT_DB, help="SQLite benchmark history")
+    parser.add_argument(
+        "--time-threshold",
+        type=float,
+        default=history.DEFAULT_TIME_THRESHOLD,
+        help="Relative slowdown of the median (and of the fastest sample) that counts as a regression",
+    )
+    parser.add_argument(
+        "--memory-threshold",
+        type=float,
+        default=history.DEFAULT_MEMORY_THRESHOLD,
+        help="Relative growth of memory_mb that counts as a regression",
+    )
+    parser.add_argument("--all", action="store_true", help="Print every compared cell, not only regressions")
     return parser.parse_args(argv)
 
 
+def parse_dataset_params(pairs: List[str]) -> dict[str, int | float]:
+    """Parse KEY=VALUE generator parameters into ints or floats."""
+    params: dict[str, int | float] = {}
+    for pair in pairs:
+        key, sep, raw = pair.partition("=")
+        if not sep or not key.strip():
+            raise SystemExit(f"Dataset parameter must look like KEY=VALUE: {pair}")
+        try:
+            value: int | float = int(raw)
+        except ValueError:
+            try:
+                value = float(raw)
+            except ValueError:
+                raise SystemExit(f"Dataset parameter {key} must be numeric: {raw}") from None
+        params[key.strip()] = value
+    return params
+
+
+def make_dataset(argv: List[str]) -> None:
+    args = parse_make_dataset_args(argv)
+    try:
+        params = parse_dataset_params(args.dataset_param)
+        data_gen.generate(args.dataset, 2, **params)
+        chunks = data_gen.iter_chunks(args.dataset, args.size, args.chunk_size, seed=args.seed, **params)
+        path = data_gen.write_dataset_chunks(args.output, chunks, args.dtype, size=args.size)
+    except (TypeError, ValueError) as exc:
+        raise SystemExit(str(exc)) from exc
+    print(f"wrote {args.size} {args.dtype} values to {path}")
+
+
+def fit(argv: List[str]) -> None:
+    args = parse_fit_args(argv)
+    try:
+        targets = [int(x) for x in args.extrapolate.split(",") if x.strip()]
+        results = pd.read_csv(args.results)
+        fits = complexity.fit_results(results, args.time_column, targets)
+    except (OSError, ValueError) as exc:
+        raise SystemExit(str(exc)) from exc
+    if fits.empty:
+        raise SystemExit(f"{args.results} has no series with two or more sizes to fit.")
+    print(fits.to_string(index=False))
+    if args.save:
+        fits.to_csv(args.save, index=False)
+    if args.report:
+        generate_report(args.results, args.report, targets)
+
+
+def list_history(argv: List[str]) -> None:
+    args = parse_history_args(argv)
+    runs = history.list_runs(args.db)
+    print(runs.to_string(index=False) if not runs.empty else f"No runs stored in {args.db}.")
+
+
+def compare(argv: List[str]) -> None:
+    args = parse_compare_args(argv)
+    try:
+        base_meta, base = history.load_run(args.db, args.baseline)
+        cand_meta, cand = history.load_run(args.db, args.candidate)
+    except (sqlite3.Error, ValueError) as exc:
+        raise SystemExit(str(exc)) from exc
+    for name, meta in (("baseline", base_meta), ("candidate", cand_meta)):
+        print(f"{name}: run {meta['id']} commit {meta['git_commit'] or '-'} {meta['timestamp']} python {meta['python']}")
+    for field in ("machine", "python"):
+        if base_meta[field] != cand_meta[field]:
+            print(f"warning: runs differ in {field}; timings may not be comparable")
+    cells = history.compare_runs(base, cand, args.time_threshold, args.memory_threshold)
+    if cells.empty:
+        raise SystemExit("The runs share no algorithm/dataset/size cells.")
+    regressions = cells[cells["regression"]]
+    shown = cells if args.all else regressions
+    if not shown.empty:
+        print(shown.to_string(index=False))
+    print(f"{len(regressions)} of {len(cells)} cells regressed.")
+    if not regressions.empty:
+        sys.exit(1)
+
+
+def sort_file(argv: List[str]) -> None:
+    args = parse_sort_file_args(argv)
+    options = dict(
+        algorithm=args.algo,
+        memory_budget=args.memory_mb * 1024 * 1024,
+        fan_in=args.fan_in,
+        fmt=args.format,
+        dtype=args.dtype,
+        tmp_dir=args.tmp_dir,
+    )
+    try:
+        if args.generate:
+            if len(args.paths) != 1 or args.size is None:
+                raise SystemExit("--generate takes only OUTPUT and requires --size")
+            params = parse_dataset_params(args.dataset_param)
+            data_gen.generate(args.generate, 2, **params)
+            chunks = data_gen.iter_chunks(args.generate, args.size, seed=args.seed, **params)
+            stats = external_sort.sort_chunks(chunks, args.paths[0], **options)
+        else:
+            if len(args.paths) != 2:
+                raise SystemExit("sort-file needs INPUT and OUTPUT (or --generate KIND --size N OUTPUT)")
+            stats = external_sort.external_sort(args.paths[0], args.paths[1], **options)
+    except (TypeError, ValueError, OverflowError) as exc:
+        raise SystemExit(str(exc)) from exc
+    except OSError as exc:
+        raise SystemExit(f"sort-file: {exc}") from exc
+    print(f"items:            {stats.items}")
+    print(f"runs:             {stats.runs}")
+    print(f"merge passes:     {stats.merge_passes}")
+    print(f"run generation s: {stats.run_generation_s:.3f}")
+    print(f"merge s:          {stats.merge_s:.3f}")
+    print(f"total s:          {stats.total_s:.3f}")
+
+
 def main(argv: List[str] | None = None) -> None:
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == "sort-file":
+        sort_file(argv[1:])
+        return
+    if argv and argv[0] == "make-dataset":
+        make_dataset(argv[1:])
+        return
+    if argv and argv[0] == "fit":
+        fit(argv[1:])
+        return
+    if argv and argv[0] == "history":
+        list_history(argv[1:])
+        return
+    if argv and argv[0] == "compare":
+        compare(argv[1:])
+        return
     args = parse_args(argv)
+    dataset_cache.configure(args.cache_dir or None, disk_budget=args.cache_mb * 1024 * 1024)
+    if args.auto_profile:
+        try:
+            set_auto_profile(args.auto_profile)
+        except (OSError, TypeError, ValueError) as exc:
+            raise SystemExit(f"Invalid auto profile {args.auto_profile}: {exc}") from exc
     algo_list = [a.strip() for a in args.algos.split(",") if a.strip()]
     size_list = [int(x) for x in args.sizes.split(",") if x.strip()]
     save_path = args.save if args.save else None
-    df = run_experiments(algo_list, size_list, args.dataset, runs=args.runs, save_path=save_path)
+    params = parse_dataset_params(args.dataset_param)
+    try:
+        data_gen.generate(args.dataset, 2, **params)
+    except (TypeError, ValueError) as exc:
+        raise SystemExit(f"Invalid parameters for dataset {args.dataset}: {exc}") from exc
+    if args.overhead:
+        df = run_instrumentation_overhead(
+            algo_list, size_list, args.dataset, runs=args.runs, data_file=args.data_file, dataset_params=params
+        )
+        print(df.to_string(index=False))
+        return
+    if args.workers:
+        worker_list = [int(x) for x in args.workers.split(",") if x.strip()]
+        if any(w < 1 for w in worker_list):
+            raise SystemExit("Worker counts must be at least 1")
+        serial = [
+            key for key in algo_list if key in algorithms.ALGORITHMS and not algorithms.ALGORITHMS[key].parallel
+        ]
+        if serial:
+            parallel = ",".join(key for key, algo in algorithms.ALGORITHMS.items() if algo.parallel)
+            raise SystemExit(
+                f"--workers only applies to parallel algorithms ({parallel}); drop {','.join(serial)} from --algos"
+            )
+        df = run_scaling(
+            algo_list,
+            size_list,
+            args.dataset,
+            worker_list,
+            runs=args.runs,
+            data_file=args.data_file,
+            dataset_params=params,
+        )
+        print(df.to_string(index=False))
+        return
+    gap_list = [g.strip() for g in args.gaps.split(",") if g.strip()]
+    unknown = [g for g in gap_list if g not in GAP_SEQUENCES]
+    if unknown:
+        raise SystemExit(f"Unknown gap sequence(s): {', '.join(unknown)}")
+    if gap_list and "shell" not in algo_list:
+        raise SystemExit("--gaps sweeps shell sort gap sequences; add shell to --algos")
+    adaptive: bool | metrics.AdaptiveConfig = False
+    if not args.fixed_runs:
+        adaptive = metrics.AdaptiveConfig(
+            min_runs=max(2, args.runs),
+            max_runs=max(args.runs, metrics.AdaptiveConfig.max_runs),
+            warmup=args.warmup,
+            target_ci=args.target_ci,
+            time_budget_s=args.time_budget,
+        )
+    df = run_experiments(
+        algo_list,
+        size_list,
+        args.dataset,
+        runs=args.runs,
+        save_path=save_path,
+        count_comparisons=args.comparisons,
+        gap_sequences=gap_list,
+        data_file=args.data_file,
+        dataset_params=params,
+        measure_mode=args.measure_mode,
+        isolate=args.isolate,
+        recycle_after=args.recycle_after,
+        adaptive=adaptive,
+        gc_mode=args.gc,
+        history_db=args.history or None,
+        history_label=args.label,
+    )
     print(df.to_string(index=False))
+    if args.fit:
+        fits = complexity.fit_results(df)
+        if fits.empty:
+            print("Complexity fit needs at least two --sizes.")
+        else:
+            print(fits.to_string(index=False))
 
 
 if __name__ == "__main__":
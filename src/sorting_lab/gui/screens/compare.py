@@ -7,6 +7,7 @@ import math
 
 from PySide6 import QtWidgets, QtCore, QtGui
 import pandas as pd
+from functools import partial
 from statistics import mean, stdev
 from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg
 from matplotlib.animation import FuncAnimation
@@ -14,7 +15,8 @@ import matplotlib.pyplot as plt
 import numpy as np
 
 from sorting_lab import algorithms
-from sorting_lab.utils import data_gen, metrics
+from sorting_lab.analysis import presortedness
+from sorting_lab.utils import data_gen, dataset_cache, metrics
 
 
 class CompareWorker(QtCore.QObject):
@@ -38,7 +40,9 @@ class CompareWorker(QtCore.QObject):
         try:
             records: list[dict[str, object]] = []
             total = len(self.algos)
-            base_data = data_gen.generate(self.dataset, self.size)
+            data = dataset_cache.default_cache().get(self.dataset, self.size)
+            input_stats = presortedness.analyze(data).columns()
+            base_data = data.tolist()
             for idx, algo_key in enumerate(self.algos, start=1):
                 if self._stop:
                     self.canceled.emit()
@@ -46,16 +50,22 @@ class CompareWorker(QtCore.QObject):
                 durations: list[float] = []
                 mems: list[float] = []
                 mem_peaks: list[float] = []
+                # Untraced timing runs, then one traced run for memory (tracemalloc skews timings).
+                sort_once = partial(algorithms.run_algorithm, algo_key, base_data)
                 for _ in range(self.runs):
                     if self._stop:
                         self.canceled.emit()
                         return
-                    result = metrics.measure(lambda: algorithms.run_algorithm(algo_key, base_data)[0])
+                    result = metrics.measure(sort_once, mode="timing")
                     durations.append(result.duration)
-                    if result.memory_mb is not None:
-                        mems.append(result.memory_mb)
-                    if result.memory_peak_mb is not None:
-                        mem_peaks.append(result.memory_peak_mb)
+                if self._stop:
+                    self.canceled.emit()
+                    return
+                result = metrics.measure(sort_once, mode="memory")
+                if result.memory_mb is not None:
+                    mems.append(result.memory_mb)
+                if result.memory_peak_mb is not None:
+                    mem_peaks.append(result.memory_peak_mb)
                 avg = mean(durations) if durations else 0.0
                 std = stdev(durations) if len(durations) > 1 else 0.0
                 memory = mean(mems) if mems else None
@@ -70,6 +80,8 @@ class CompareWorker(QtCore.QObject):
                         "std_time_s": std,
                         "memory_mb": memory,
                         "memory_peak_mb": memory_peak,
+                        "measure_mode": "separate",
+                        **input_stats,
                     }
                 )
                 self.progress.emit(idx, total, algo_key)
@@ -273,7 +285,7 @@ class CompareView(QtWidgets.QWidget):
         self.algo_list.setCurrentRow(0)
 
         self.dataset_combo = QtWidgets.QComboBox()
-        self.dataset_combo.addItems(["random", "partial", "reverse"])
+        self.dataset_combo.addItems(data_gen.dataset_names())
         self.dataset_combo.setMinimumWidth(160)
         self.dataset_combo.setSizeAdjustPolicy(QtWidgets.QComboBox.AdjustToContents)
 
@@ -435,9 +447,20 @@ class CompareView(QtWidgets.QWidget):
         toggle_layout.addWidget(self.table_toggle)
         toggle_layout.addStretch()
 
-        self.table = QtWidgets.QTableWidget(0, 7)
+        self.table = QtWidgets.QTableWidget(0, 10)
         self.table.setHorizontalHeaderLabels(
-            ["Algoritma", "Dataset", "N", "Ortalama (s)", "Std (s)", "Bellek Δ (MB)", "Bellek Peak (MB)"]
+            [
+                "Algoritma",
+                "Dataset",
+                "N",
+                "Ortalama (s)",
+                "Std (s)",
+                "Bellek Δ (MB)",
+                "Bellek Peak (MB)",
+                "Koşu",
+                "İnversiyon Oranı",
+                "Tekrar Oranı",
+            ]
         )
         self.table.horizontalHeader().setStretchLastSection(True)
         self.table.setMinimumHeight(220)
@@ -571,6 +594,12 @@ class CompareView(QtWidgets.QWidget):
             self.table.setItem(row, 5, QtWidgets.QTableWidgetItem(mem))
             mem_peak = "-" if r.get("memory_peak_mb") is None else f"{r['memory_peak_mb']:.3f}"
             self.table.setItem(row, 6, QtWidgets.QTableWidgetItem(mem_peak))
+            runs = "-" if r.get("ascending_runs") is None else str(r["ascending_runs"])
+            self.table.setItem(row, 7, QtWidgets.QTableWidgetItem(runs))
+            inv = "-" if r.get("inversion_ratio") is None else f"{r['inversion_ratio']:.4f}"
+            self.table.setItem(row, 8, QtWidgets.QTableWidgetItem(inv))
+            dup = "-" if r.get("duplicate_ratio") is None else f"{r['duplicate_ratio']:.3f}"
+            self.table.setItem(row, 9, QtWidgets.QTableWidgetItem(dup))
         self.table.resizeColumnsToContents()
 
     def _render_chart(self, df) -> None:
@@ -1116,15 +1145,25 @@ class CompareView(QtWidgets.QWidget):
             return
         data = {
             "quick": {
-                "desc": "Böl ve fethet; pivot etrafında bölme. Pratikte hızlı, worst O(n^2).",
-                "best": "Best: O(n log n) - random/partial veri seti, dengeli pivot.",
-                "worst": "Worst: O(n^2) - reverse veya zaten sıralı veri (kötü pivot).",
+                "desc": "Böl ve fethet; median-of-three pivot etrafında bölme. Pratikte hızlı.",
+                "best": "Best: O(n log n) - random, sıralı veya reverse veri (pivot ortadan seçilir).",
+                "worst": "Worst: O(n^2) - few_unique/all_equal (eşit anahtarlar tek tarafa düşer).",
+            },
+            "intro": {
+                "desc": "Üçlü bölmeli quicksort (ninther pivot); küçük parçalarda insertion, derin özyinelemede heap sort.",
+                "best": "Best: O(n) - all_equal/few_unique (eşit anahtarlar tek geçişte ayrılır).",
+                "worst": "Worst: O(n log n) - heap sort geri dönüşü O(n^2)'yi engeller.",
             },
             "heap": {
                 "desc": "Heap tabanlı; O(n log n) ve in-place.",
                 "best": "Best: O(n log n) - veri setinden bağımsız.",
                 "worst": "Worst: O(n log n) - veri setinden bağımsız.",
             },
+            "heap_floyd": {
+                "desc": "Floyd'un aşağıdan yukarı heap sort'u; d-ary heap, daha az karşılaştırma.",
+                "best": "Best: O(n log n) - veri setinden bağımsız.",
+                "worst": "Worst: O(n log n) - veri setinden bağımsız.",
+            },
             "shell": {
                 "desc": "Aralıklı insertion; pratikte hızlı, teori aralığa bağlı.",
                 "best": "Best: kısmen sıralı (partial) veri, pratikte hızlı.",
@@ -1135,11 +1174,31 @@ class CompareView(QtWidgets.QWidget):
                 "best": "Best: O(n log n) - veri setinden bağımsız.",
                 "worst": "Worst: O(n log n) - veri setinden bağımsız.",
             },
+            "natural": {
+                "desc": "Doğal sıralı koşuları bulup birleştirir; stabil, ek bellek O(n).",
+                "best": "Best: O(n) - sıralı veya reverse veri (tek koşu).",
+                "worst": "Worst: O(n log n) - random veri, kısa koşular.",
+            },
+            "parallel_merge": {
+                "desc": "Parçaları işçi süreçlerinde sıralayıp k-yollu birleştirir.",
+                "best": "Best: O(n log n / p) - büyük veri, çok çekirdek.",
+                "worst": "Worst: O(n log n) - tek çekirdek veya süreç başlatma maliyetini aşmayan küçük veri.",
+            },
             "radix": {
                 "desc": "Basamak bazlı; sayısal veride çok hızlı.",
                 "best": "Best: O(d*(n+k)) - basamak sayısı küçükse hızlı.",
                 "worst": "Worst: O(d*(n+k)) - basamak sayısı büyüdükçe artar.",
             },
+            "radix_py": {
+                "desc": "Saf Python onluk tabanlı radix; NumPy motoruyla karşılaştırma için.",
+                "best": "Best: O(d*(n+10)) - değer aralığı dar, basamak sayısı az.",
+                "worst": "Worst: O(d*(n+10)) - wide64 gibi geniş aralıklı veri.",
+            },
+            "auto": {
+                "desc": "Örneklenen girdi özelliklerine göre radix, natural, intro veya insertion seçer.",
+                "best": "Best: sıralı/ters veri (natural, O(n)) veya tamsayı (radix).",
+                "worst": "Worst: seçilen algoritmanın worst durumu (intro ile O(n log n)).",
+            },
         }
         key = item.data(QtCore.Qt.UserRole)
         info = data.get(key, {})
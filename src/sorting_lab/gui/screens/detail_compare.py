@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from functools import partial
 from statistics import mean, stdev
 
 import pandas as pd
@@ -11,8 +12,9 @@ from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg
 import matplotlib.pyplot as plt
 
 from sorting_lab import algorithms
+from sorting_lab.analysis import presortedness
 from sorting_lab.gui.screens.compare import CompareView
-from sorting_lab.utils import data_gen, metrics
+from sorting_lab.utils import dataset_cache, metrics
 
 
 class DetailCompareWorker(QtCore.QObject):
@@ -42,7 +44,9 @@ class DetailCompareWorker(QtCore.QObject):
                     if self._stop:
                         self.canceled.emit()
                         return
-                    base_data = data_gen.generate(dataset, size)
+                    data = dataset_cache.default_cache().get(dataset, size)
+                    input_stats = presortedness.analyze(data).columns()
+                    base_data = data.tolist()
                     for algo_key in self.algos:
                         if self._stop:
                             self.canceled.emit()
@@ -50,16 +54,22 @@ class DetailCompareWorker(QtCore.QObject):
                         durations: list[float] = []
                         mems: list[float] = []
                         mem_peaks: list[float] = []
+                        # Untraced timing runs, then one traced run for memory (tracemalloc skews timings).
+                        sort_once = partial(algorithms.run_algorithm, algo_key, base_data)
                         for _ in range(self.runs):
                             if self._stop:
                                 self.canceled.emit()
                                 return
-                            result = metrics.measure(lambda: algorithms.run_algorithm(algo_key, base_data)[0])
+                            result = metrics.measure(sort_once, mode="timing")
                             durations.append(result.duration)
-                            if result.memory_mb is not None:
-                                mems.append(result.memory_mb)
-                            if result.memory_peak_mb is not None:
-                                mem_peaks.append(result.memory_peak_mb)
+                        if self._stop:
+                            self.canceled.emit()
+                            return
+                        result = metrics.measure(sort_once, mode="memory")
+                        if result.memory_mb is not None:
+                            mems.append(result.memory_mb)
+                        if result.memory_peak_mb is not None:
+                            mem_peaks.append(result.memory_peak_mb)
                         avg = mean(durations) if durations else 0.0
                         std = stdev(durations) if len(durations) > 1 else 0.0
                         memory = mean(mems) if mems else None
@@ -74,6 +84,8 @@ class DetailCompareWorker(QtCore.QObject):
                                 "std_time_s": std,
                                 "memory_mb": memory,
                                 "memory_peak_mb": memory_peak,
+                                "measure_mode": "separate",
+                                **input_stats,
                             }
                         )
                         current += 1
@@ -607,9 +619,20 @@ class DetailCompareView(CompareView):
         toggle_layout.addWidget(self.table_toggle)
         toggle_layout.addStretch()
 
-        self.table = QtWidgets.QTableWidget(0, 7)
+        self.table = QtWidgets.QTableWidget(0, 10)
         self.table.setHorizontalHeaderLabels(
-            ["Algoritma", "Dataset", "N", "Ortalama (s)", "Std (s)", "Bellek Δ (MB)", "Bellek Peak (MB)"]
+            [
+                "Algoritma",
+                "Dataset",
+                "N",
+                "Ortalama (s)",
+                "Std (s)",
+                "Bellek Δ (MB)",
+                "Bellek Peak (MB)",
+                "Koşu",
+                "İnversiyon Oranı",
+                "Tekrar Oranı",
+            ]
         )
         self.table.horizontalHeader().setStretchLastSection(True)
         self.table.setMinimumHeight(220)
@@ -2,7 +2,8 @@
 
 from __future__ import annotations
 
-from typing import List
+import math
+from typing import List, Sequence
 
 from PySide6 import QtCore, QtGui, QtWidgets
 
@@ -45,13 +46,16 @@ class ArrayCanvas(QtWidgets.QWidget):
         n = len(self.data)
         bar_width = max(2, (w - 20) // max(n, 1))
         spacing = 1
-        max_val = max(self.data)
+        # Rebase on the minimum so negative datasets (wide64, gaussian) draw upright.
+        min_val = min(0, min(self.data))
+        max_val = max(self.data) - min_val
         scale = (h - 20) / max(1, max_val)
         
         # Sıralı olup olmadığını kontrol et (renk değişimi için)
         is_sorted = all(self.data[i] <= self.data[i+1] for i in range(len(self.data)-1))
         
         for idx, val in enumerate(self.data):
+            val -= min_val
             bar_h = int(val * scale)
             x = 10 + idx * (bar_width + spacing)
             y = h - 10 - bar_h
@@ -77,9 +81,14 @@ class ArrayCanvas(QtWidgets.QWidget):
 
 
 class LiveView(QtWidgets.QWidget):
+    # The whole sort is recorded as an operation log; playback samples at most this many frames.
+    max_frames = 800
+
     def __init__(self) -> None:
         super().__init__()
-        self.steps: list[list[int]] = []
+        self.steps: Sequence[list[int]] = []
+        self.frame_positions: list[int] = []
+        self.final_state: list[int] = []
         self.step_idx = 0
         self.timer = QtCore.QTimer(self)
         self.timer.setTimerType(QtCore.Qt.PreciseTimer)
@@ -179,7 +188,7 @@ class LiveView(QtWidgets.QWidget):
             self.algo_combo.addItem(algo.name, algo.key)
 
         self.dataset_combo = QtWidgets.QComboBox()
-        self.dataset_combo.addItems(["random", "partial", "reverse"])
+        self.dataset_combo.addItems(data_gen.dataset_names())
 
         self.size_spin = QtWidgets.QSpinBox()
         self.size_spin.setRange(10, 5000)
@@ -248,49 +257,57 @@ class LiveView(QtWidgets.QWidget):
         self.status.setText("Algoritma çalışıyor ve adımlar kaydediliyor...")
         QtWidgets.QApplication.processEvents()
 
-        sorted_arr, steps = algorithms.run_algorithm(algo_key, data, record_steps=True, step_limit=800)
-        # Ensure initial and final states are present
-        if not steps or steps[0] != data:
-            steps.insert(0, list(data))
-        if steps[-1] != sorted_arr:
-            steps.append(sorted_arr)
+        sorted_arr, steps = algorithms.run_algorithm(algo_key, data, record_steps=True, step_limit=None)
+        # Sample evenly across the full log so playback starts from the input (frame 0)
+        # and always reaches the sorted state.
+        stride = max(1, math.ceil(len(steps) / self.max_frames))
+        positions = list(range(0, len(steps), stride))
+        if steps and (not positions or positions[-1] != len(steps) - 1):
+            positions.append(len(steps) - 1)
 
         self.steps = steps
+        self.frame_positions = positions
+        self.final_state = sorted_arr
         self.step_idx = 0
-        self.progress.setRange(0, len(self.steps) - 1)
+        self.progress.setRange(0, max(0, len(self.frame_positions) - 1))
         self.progress.setValue(0)
 
         fps = max(1, self.speed_slider.value())
         interval_ms = max(1, int(1000 / fps))
         self.timer.start(interval_ms)
-        self.status.setText(f"▶ Oynatılıyor: {len(self.steps)} adım | Hız: {fps} FPS")
+        self.status.setText(
+            f"▶ Oynatılıyor: {len(self.frame_positions)} kare / {len(self.steps)} adım | Hız: {fps} FPS"
+        )
 
     def _on_stop(self) -> None:
         self.timer.stop()
         self.run_btn.setEnabled(True)
         self.stop_btn.setEnabled(False)
-        if self.step_idx >= len(self.steps):
+        if self.step_idx >= len(self.frame_positions):
             self.status.setText("✓ Tamamlandı! Tekrar oynatmak için 'Başlat' butonuna tıklayın.")
         else:
-            self.status.setText(f"⏸ Duraklatıldı. Adım {self.step_idx + 1}/{len(self.steps)}")
+            self.status.setText(f"⏸ Duraklatıldı. Kare {self.step_idx + 1}/{len(self.frame_positions)}")
 
     def _advance(self) -> None:
-        if not self.steps:
+        if not self.frame_positions:
             self.timer.stop()
+            self.canvas.set_data(self.final_state)
             self.status.setText("Gösterilecek adım yok.")
             self.run_btn.setEnabled(True)
             self.stop_btn.setEnabled(False)
             return
-        if self.step_idx >= len(self.steps):
+        if self.step_idx >= len(self.frame_positions):
             self.timer.stop()
+            self.canvas.set_data(self.final_state)
             self.status.setText("✓ Tamamlandı! Tüm adımlar gösterildi.")
             self.run_btn.setEnabled(True)
             self.stop_btn.setEnabled(False)
             return
-        self.canvas.set_data(self.steps[self.step_idx])
+        self.canvas.set_data(self.steps[self.frame_positions[self.step_idx]])
         self.progress.setValue(self.step_idx)
         self.step_idx += 1
         # İlerleme durumunu güncelle
-        if self.step_idx % max(1, len(self.steps) // 20) == 0:
-            percent = int((self.step_idx / len(self.steps)) * 100)
-            self.status.setText(f"▶ Oynatılıyor: {self.step_idx}/{len(self.steps)} adım ({percent}%)")
+        total = len(self.frame_positions)
+        if self.step_idx % max(1, total // 20) == 0:
+            percent = int((self.step_idx / total) * 100)
+            self.status.setText(f"▶ Oynatılıyor: {self.step_idx}/{total} kare ({percent}%)")
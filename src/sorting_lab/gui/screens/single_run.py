@@ -3,7 +3,8 @@ from __future__ import annotations
 from PySide6 import QtCore, QtGui, QtWidgets
 
 from sorting_lab import algorithms
-from sorting_lab.utils import data_gen, metrics
+from sorting_lab.analysis import presortedness
+from sorting_lab.utils import data_gen, dataset_cache, metrics
 
 
 class SingleRunView(QtWidgets.QWidget):
@@ -150,7 +151,7 @@ class SingleRunView(QtWidgets.QWidget):
         self.algo_combo.currentIndexChanged.connect(self._update_algo_info)
 
         self.dataset_combo = QtWidgets.QComboBox()
-        self.dataset_combo.addItems(["random", "partial", "reverse"])
+        self.dataset_combo.addItems(data_gen.dataset_names())
         self.dataset_combo.setMinimumWidth(160)
 
         self.size_spin = QtWidgets.QSpinBox()
@@ -231,16 +232,19 @@ class SingleRunView(QtWidgets.QWidget):
         self.runtime_value = self._stat_chip("Süre", "-")
         self.memory_value = self._stat_chip("Bellek Δ", "-")
         self.memory_peak_value = self._stat_chip("Bellek Peak", "-")
+        self.disorder_value = self._stat_chip("İnversiyon / Koşu", "-")
         chip_row.addWidget(self.dataset_value["frame"])
         chip_row.addWidget(self.size_value["frame"])
         chip_row.addWidget(self.runtime_value["frame"])
         chip_row.addWidget(self.memory_value["frame"])
         chip_row.addWidget(self.memory_peak_value["frame"])
+        chip_row.addWidget(self.disorder_value["frame"])
         chip_row.setStretch(0, 1)
         chip_row.setStretch(1, 1)
         chip_row.setStretch(2, 1)
         chip_row.setStretch(3, 1)
         chip_row.setStretch(4, 1)
+        chip_row.setStretch(5, 1)
 
         chips_container = QtWidgets.QWidget()
         chips_container.setLayout(chip_row)
@@ -253,6 +257,7 @@ class SingleRunView(QtWidgets.QWidget):
             self.runtime_value["value"],
             self.memory_value["value"],
             self.memory_peak_value["value"],
+            self.disorder_value["value"],
         ]
         self._chip_text_labels = [
             self.dataset_value["label"],
@@ -260,6 +265,7 @@ class SingleRunView(QtWidgets.QWidget):
             self.runtime_value["label"],
             self.memory_value["label"],
             self.memory_peak_value["label"],
+            self.disorder_value["label"],
         ]
         self._apply_responsive_fonts()
 
@@ -320,9 +326,11 @@ class SingleRunView(QtWidgets.QWidget):
         self._set_status("Çalıştırılıyor", "running")
         QtWidgets.QApplication.processEvents()
 
-        base_data = data_gen.generate(dataset, size)
+        data = dataset_cache.default_cache().get(dataset, size)
+        stats = presortedness.analyze(data)
+        base_data = data.tolist()
 
-        result = metrics.measure(lambda: algorithms.run_algorithm(algo_key, base_data)[0])
+        result = metrics.measure(lambda: algorithms.run_algorithm(algo_key, base_data)[0], mode="separate")
 
         sorted_arr = result.output
         self._render_preview(base_data, sorted_arr)
@@ -337,6 +345,13 @@ class SingleRunView(QtWidgets.QWidget):
             self.memory_peak_value["value"].setText(f"{result.memory_peak_mb:.3f} MB")
         else:
             self.memory_peak_value["value"].setText("ölçülmedi")
+        self.disorder_value["value"].setText(f"{stats.inversion_ratio:.3f} / {stats.ascending_runs:,}")
+        self.disorder_value["frame"].setToolTip(
+            f"Koşu: {stats.ascending_runs:,} (en uzun {stats.longest_run:,})\n"
+            f"İnversiyon: {stats.inversions:,}{'' if stats.inversions_exact else ' (tahmini)'}\n"
+            f"Tekrar oranı: {stats.duplicate_ratio:.3f}\n"
+            f"Değer aralığı: {stats.value_min} – {stats.value_max}"
+        )
         self._set_status("Tamamlandı", "done")
         self.progress.setRange(0, 1)
         self.progress.setValue(1)
@@ -378,6 +393,14 @@ class SingleRunView(QtWidgets.QWidget):
                 "use": "Kullanım: Ortalama performansı güçlü; rastgele veri setlerinde iyi sonuç verir.",
                 "note": "Not: Kötü pivot seçimi worst-case süresini artırır.",
             },
+            "intro": {
+                "title": "Introsort",
+                "desc": "Üçlü parçalamalı quick sort; küçük parçalarda insertion, derinlik aşılınca heap sort.",
+                "time": "Zaman: Avg/Worst O(n log n); az farklı anahtarda O(n)'e yaklaşır.",
+                "space": "Bellek: O(log n) yığın, in-place, stabil değil.",
+                "use": "Kullanım: Tekrarlı anahtarlar veya kötü pivot riski olan veriler.",
+                "note": "Not: Küçük parça eşiği `cutoff` ile ayarlanır (varsayılan 16).",
+            },
             "heap": {
                 "title": "Heap Sort",
                 "desc": "Max-heap kurar ve kökü sona atarak sıralar.",
@@ -402,13 +425,29 @@ class SingleRunView(QtWidgets.QWidget):
                 "use": "Kullanım: Stabil sıralama isteyenlerde veya büyük n için güvenli.",
                 "note": "Not: Ek bellek gereksinimi vardır.",
             },
+            "natural": {
+                "title": "Natural Merge Sort",
+                "desc": "Mevcut sıralı/ters koşuları bulur, Powersort yığınıyla birleştirir (galloping).",
+                "time": "Zaman: Best O(n), Avg/Worst O(n log n).",
+                "space": "Bellek: O(n), stabil.",
+                "use": "Kullanım: Kısmen sıralı (partial) ve ters sıralı veriler.",
+                "note": "Not: Kısa koşular binary insertion ile minimum uzunluğa tamamlanır.",
+            },
             "radix": {
                 "title": "Radix Sort",
                 "desc": "Basamaklara göre sıralar; sayısal veride çok hızlıdır.",
                 "time": "Zaman: O(d * (n + k)).",
                 "space": "Bellek: O(n + k), stabil, in-place değil.",
                 "use": "Kullanım: Büyük sayısal veri setlerinde çok etkilidir.",
-                "note": "Not: Negatif sayı desteği yoktur.",
+                "note": "Not: Yalnızca tamsayılar; negatif değerler sign-bias ile desteklenir.",
+            },
+            "auto": {
+                "title": "Auto (Adaptive)",
+                "desc": "Girdiden örnek alır; koşu yapısı, değer aralığı, tekrar oranı ve tipe göre algoritma seçer.",
+                "time": "Zaman: Seçilen algoritmanınki + O(örnek) örnekleme.",
+                "space": "Bellek: Seçilen algoritmaya bağlı.",
+                "use": "Kullanım: Girdinin yapısı bilinmediğinde.",
+                "note": "Not: Eşikler JSON profilinden yüklenebilir; karar `logging` ile kaydedilir.",
             },
         }
         key = self.algo_combo.currentData()
@@ -2,61 +2,431 @@
 
 from __future__ import annotations
 
-import random
-from typing import List
+import inspect
+import struct
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, Sequence
 
+import numpy as np
 
-def random_array(n: int, seed: int | None = None) -> List[int]:
-    """Generate a random array of size n."""
-    if seed is not None:
-        random.seed(seed)
-    return [random.randint(0, n * 10) for _ in range(n)]
+# Bump whenever a generator's output for a given (size, seed, params) changes;
+# dataset caches key on it.
+GENERATOR_VERSION = 2
 
+# Raw dataset header: magic, format version, dtype code, padding, element count.
+RAW_MAGIC = b"SLDS"
+RAW_VERSION = 1
+RAW_HEADER = struct.Struct("<4sBB2xQ")
+RAW_DTYPES = {1: np.dtype("<i8"), 2: np.dtype("<u4")}
+DATASET_DTYPES = {"int64": 1, "uint32": 2}
 
-def partially_sorted_array(n: int, sorted_ratio: float = 0.5, seed: int | None = None) -> List[int]:
-    """Generate a partially sorted array; sorted_ratio in [0,1]."""
-    if seed is not None:
-        random.seed(seed)
+
+def _rng(seed: Any) -> np.random.Generator:
+    """Independent PCG64 stream for one call; ``None`` draws fresh OS entropy.
+
+    No global state is touched, so concurrent generators never disturb each other.
+    """
+    return seed if isinstance(seed, np.random.Generator) else np.random.Generator(np.random.PCG64(seed))
+
+
+def _output(values: np.ndarray, as_array: bool) -> Any:
+    return values if as_array else values.tolist()
+
+
+def _sorted_unique(values: np.ndarray, kind: str | None = None) -> np.ndarray:
+    # sort + mask; np.unique is several times slower on large int64 arrays.
+    values = np.sort(values, kind=kind)
+    keep = np.empty(len(values), dtype=bool)
+    keep[:1] = True
+    np.not_equal(values[1:], values[:-1], out=keep[1:])
+    return values[keep]
+
+
+def _distinct_sorted(rng: np.random.Generator, n: int, high: int) -> np.ndarray:
+    """n distinct values from [0, high], sorted, without materialising the range."""
+    values = _sorted_unique(rng.integers(0, high, size=n, endpoint=True, dtype=np.int64))
+    while len(values) < n:
+        extra = np.sort(rng.integers(0, high, size=2 * (n - len(values)), endpoint=True, dtype=np.int64))
+        # Two sorted runs: the stable (run-merging) sort combines them in linear time.
+        values = _sorted_unique(np.concatenate([values, extra]), kind="stable")
+    if len(values) > n:
+        values = np.delete(values, rng.choice(len(values), size=len(values) - n, replace=False))
+    return values
+
+
+def _block_partial(
+    rng: np.random.Generator, size: int, start: int, stop: int, sorted_ratio: float = 0.5
+) -> np.ndarray:
+    # Chunk j gets distinct sorted values from its own slice of [0, 10 * size], so
+    # concatenated chunks stay globally sorted; the shuffled share is permuted
+    # within the chunk.
     if not 0.0 <= sorted_ratio <= 1.0:
         raise ValueError("sorted_ratio must be between 0 and 1.")
-    if n <= 0:
-        return []
-    values = random.sample(range(n * 10 + 1), k=n)
-    values.sort()
-    if n == 1 or sorted_ratio >= 1.0:
-        return values
-    shuffle_count = max(1, int(n * (1.0 - sorted_ratio)))
-    indices = random.sample(range(n), k=shuffle_count)
-    subset = [values[i] for i in indices]
-    random.shuffle(subset)
-    for idx, val in zip(indices, subset):
-        values[idx] = val
-    if all(values[i] <= values[i + 1] for i in range(n - 1)):
-        if values[0] != values[-1]:
-            values[0], values[-1] = values[-1], values[0]
+    m = stop - start
+    lo = start * 10
+    hi = size * 10 if stop == size else stop * 10 - 1
+    values = lo + _distinct_sorted(rng, m, hi - lo)
+    if m > 1 and sorted_ratio < 1.0:
+        shuffle_count = max(1, int(m * (1.0 - sorted_ratio)))
+        indices = rng.choice(m, size=shuffle_count, replace=False)
+        values[indices] = rng.permutation(values[indices])
+    return values
+
+
+def _block_iid(draw: Callable[..., np.ndarray]) -> Callable[..., np.ndarray]:
+    def block(rng: np.random.Generator, size: int, start: int, stop: int, **params: Any) -> np.ndarray:
+        return draw(rng, size, stop - start, **params)
+
+    return block
+
+
+def _block_few_unique(rng: np.random.Generator, size: int, start: int, stop: int, unique: int = 8) -> np.ndarray:
+    if unique < 1:
+        raise ValueError("unique must be at least 1.")
+    return rng.integers(0, unique, size=stop - start, dtype=np.int64) * max(1, (size * 10) // unique)
+
+
+def _block_sawtooth(rng: np.random.Generator, size: int, start: int, stop: int, teeth: int = 8) -> np.ndarray:
+    if teeth < 1:
+        raise ValueError("teeth must be at least 1.")
+    return np.arange(start, stop, dtype=np.int64) % max(1, -(-size // teeth))
+
+
+def _block_sorted_tail(rng: np.random.Generator, size: int, start: int, stop: int, tail: float = 0.1) -> np.ndarray:
+    if not 0.0 <= tail <= 1.0:
+        raise ValueError("tail must be between 0 and 1.")
+    head = size - int(round(size * tail))
+    values = np.arange(start, stop, dtype=np.int64)
+    cut = min(max(head - start, 0), stop - start)
+    values[cut:] = rng.integers(0, max(size, 1), size=len(values) - cut, dtype=np.int64)
     return values
 
 
-def reverse_sorted_array(n: int) -> List[int]:
+def _block_gaussian(
+    rng: np.random.Generator, size: int, start: int, stop: int, mean: float | None = None, std: float | None = None
+) -> np.ndarray:
+    mean = 5.0 * size if mean is None else mean
+    std = float(max(size, 1)) if std is None else std
+    if std < 0:
+        raise ValueError("std must be non-negative.")
+    return np.rint(rng.normal(mean, std, size=stop - start)).astype(np.int64)
+
+
+def _block_zipf(rng: np.random.Generator, size: int, start: int, stop: int, a: float = 1.5) -> np.ndarray:
+    if a <= 1.0:
+        raise ValueError("a must be greater than 1.")
+    return rng.zipf(a, size=stop - start).astype(np.int64)
+
+
+_INT64 = np.iinfo(np.int64)
+
+# Chunk builders: values for global positions [start, stop) of a ``size``-element dataset.
+_BLOCKS: dict[str, Callable[..., np.ndarray]] = {
+    "random": _block_iid(lambda rng, size, m: rng.integers(0, size * 10, size=m, endpoint=True, dtype=np.int64)),
+    "partial": _block_partial,
+    "reverse": lambda rng, size, start, stop: np.arange(size - start, size - stop, -1, dtype=np.int64),
+    "few_unique": _block_few_unique,
+    "all_equal": lambda rng, size, start, stop, value=42: np.full(stop - start, value, dtype=np.int64),
+    "sawtooth": _block_sawtooth,
+    "organ_pipe": lambda rng, size, start, stop: np.minimum(
+        np.arange(start, stop, dtype=np.int64), size - 1 - np.arange(start, stop, dtype=np.int64)
+    ),
+    "sorted_tail": _block_sorted_tail,
+    "zipf": _block_zipf,
+    "gaussian": _block_gaussian,
+    "wide64": _block_iid(
+        lambda rng, size, m: rng.integers(_INT64.min, _INT64.max, size=m, endpoint=True, dtype=np.int64)
+    ),
+}
+
+
+def _iter_nearly_sorted(
+    rng: np.random.Generator, size: int, chunk_size: int, inversions: int | None = None
+) -> Iterator[np.ndarray]:
+    # Pair slots p = (2p, 2p+1) are picked by sequential hypergeometric draws, so
+    # exactly ``inversions`` disjoint adjacent swaps land across the stream.
+    if inversions is None:
+        inversions = max(1, size // 100)
+    if inversions < 0:
+        raise ValueError("inversions must be non-negative.")
+    remaining_k = min(inversions, size // 2)
+    remaining_slots = size // 2
+    carry: int | None = None
+    next_slot = 0
+    for start in range(0, size, chunk_size):
+        stop = min(start + chunk_size, size)
+        values = np.arange(start, stop, dtype=np.int64)
+        if carry is not None:
+            values[0] = carry
+            carry = None
+        # Slots whose first position falls in this chunk.
+        slot_stop = min((stop + 1) // 2, size // 2)
+        slots = slot_stop - next_slot
+        if slots > 0 and remaining_k:
+            if remaining_slots > slots:
+                picked = int(rng.hypergeometric(slots, remaining_slots - slots, remaining_k))
+            else:
+                picked = remaining_k
+            chosen = next_slot + rng.choice(slots, size=picked, replace=False)
+            remaining_k -= picked
+            firsts = 2 * chosen - start
+            inside = firsts + 1 < len(values)
+            straddles = not inside.all()
+            firsts = firsts[inside]
+            values[firsts], values[firsts + 1] = values[firsts + 1], values[firsts].copy()
+            if straddles:
+                # The pair straddles the chunk boundary: finish the swap in the next chunk.
+                values[-1] += 1
+                carry = stop - 1
+        remaining_slots -= max(slots, 0)
+        next_slot = max(next_slot, slot_stop)
+        yield values
+
+
+def _whole(kind: str, n: int, rng: np.random.Generator | None, as_array: bool, **params: Any) -> Any:
+    n = max(n, 0)
+    return _output(_BLOCKS[kind](rng, n, 0, n, **params), as_array)
+
+
+def random_array(n: int, seed: Any = None, as_array: bool = False) -> Any:
+    """Generate n uniform integers in [0, 10n]."""
+    return _whole("random", n, _rng(seed), as_array)
+
+
+def partially_sorted_array(n: int, sorted_ratio: float = 0.5, seed: Any = None, as_array: bool = False) -> Any:
+    """Generate a partially sorted array; sorted_ratio in [0,1].
+
+    n distinct values from [0, 10n] are sorted, then a random ``1 - sorted_ratio``
+    share of positions have their values shuffled among themselves.
+    """
+    n = max(n, 0)
+    values = _block_partial(_rng(seed), n, 0, n, sorted_ratio=sorted_ratio)
+    if n > 1 and np.all(values[:-1] <= values[1:]) and sorted_ratio < 1.0:
+        values[0], values[-1] = values[-1], values[0]
+    return _output(values, as_array)
+
+
+def reverse_sorted_array(n: int, as_array: bool = False) -> Any:
     """Generate a reverse-sorted array."""
-    return list(range(n, 0, -1))
+    return _whole("reverse", n, None, as_array)
+
 
+def few_unique_array(n: int, unique: int = 8, seed: Any = None, as_array: bool = False) -> Any:
+    """n values drawn uniformly from ``unique`` distinct keys spread over [0, 10n]."""
+    return _whole("few_unique", n, _rng(seed), as_array, unique=unique)
 
-def generate(dataset: str, size: int, seed: int | None = None) -> List[int]:
-    """Create an array by dataset type."""
+
+def all_equal_array(n: int, value: int = 42, as_array: bool = False) -> Any:
+    """n copies of ``value``."""
+    return _whole("all_equal", n, None, as_array, value=value)
+
+
+def sawtooth_array(n: int, teeth: int = 8, as_array: bool = False) -> Any:
+    """``teeth`` ascending ramps 0..n/teeth laid end to end."""
+    return _whole("sawtooth", n, None, as_array, teeth=teeth)
+
+
+def organ_pipe_array(n: int, as_array: bool = False) -> Any:
+    """Ascending to the middle, then descending: 0, 1, ..., m, ..., 1, 0."""
+    return _whole("organ_pipe", n, None, as_array)
+
+
+def nearly_sorted_array(n: int, inversions: int | None = None, seed: Any = None, as_array: bool = False) -> Any:
+    """Sorted 0..n-1 with exactly ``inversions`` disjoint adjacent pairs swapped.
+
+    Defaults to 1% of n (at least one); capped at n // 2.
+    """
+    chunks = list(_iter_nearly_sorted(_rng(seed), max(n, 0), max(n, 1), inversions))
+    return _output(chunks[0] if chunks else np.empty(0, dtype=np.int64), as_array)
+
+
+def sorted_tail_array(n: int, tail: float = 0.1, seed: Any = None, as_array: bool = False) -> Any:
+    """Sorted prefix 0..m-1 followed by a random tail of ``tail * n`` values in [0, n)."""
+    return _whole("sorted_tail", n, _rng(seed), as_array, tail=tail)
+
+
+def zipf_array(n: int, a: float = 1.5, seed: Any = None, as_array: bool = False) -> Any:
+    """Zipf-distributed keys (exponent ``a`` > 1): a few values dominate."""
+    return _whole("zipf", n, _rng(seed), as_array, a=a)
+
+
+def gaussian_array(
+    n: int, mean: float | None = None, std: float | None = None, seed: Any = None, as_array: bool = False
+) -> Any:
+    """Normally distributed integers; defaults to mean 5n and standard deviation n."""
+    return _whole("gaussian", n, _rng(seed), as_array, mean=mean, std=std)
+
+
+def wide64_array(n: int, seed: Any = None, as_array: bool = False) -> Any:
+    """Uniform signed 64-bit values, exercising every radix digit."""
+    return _whole("wide64", n, _rng(seed), as_array)
+
+
+# Dataset kinds accepted by generate(); the CLI and GUI offer these names.
+DATASETS: dict[str, Callable[..., Any]] = {
+    "random": random_array,
+    "partial": partially_sorted_array,
+    "reverse": reverse_sorted_array,
+    "few_unique": few_unique_array,
+    "all_equal": all_equal_array,
+    "sawtooth": sawtooth_array,
+    "organ_pipe": organ_pipe_array,
+    "nearly_sorted": nearly_sorted_array,
+    "sorted_tail": sorted_tail_array,
+    "zipf": zipf_array,
+    "gaussian": gaussian_array,
+    "wide64": wide64_array,
+}
+_ALIASES = {"partially_sorted": "partial"}
+
+
+def dataset_names() -> list[str]:
+    return list(DATASETS)
+
+
+def generate(dataset: str, size: int, seed: Any = None, as_array: bool = False, **params: Any) -> Any:
+    """Create an array by dataset type; ``params`` go to the underlying generator.
+
+    Returns a list of Python ints, or an int64 ndarray with ``as_array=True``.
+    ``seed`` may be an int, a ``SeedSequence`` or an existing ``Generator``; it is
+    ignored by deterministic layouts.
+    """
     dataset = dataset.lower()
-    if dataset == "random":
-        return random_array(size, seed=seed)
-    if dataset in {"partial", "partially_sorted"}:
-        return partially_sorted_array(size, sorted_ratio=0.5, seed=seed)
-    if dataset == "reverse":
-        return reverse_sorted_array(size)
-    raise ValueError(f"Unknown dataset type: {dataset}")
+    dataset = _ALIASES.get(dataset, dataset)
+    func = DATASETS.get(dataset)
+    if func is None:
+        raise ValueError(f"Unknown dataset type: {dataset}")
+    if "seed" in inspect.signature(func).parameters:
+        params["seed"] = seed
+    return func(size, as_array=as_array, **params)
+
+
+def iter_chunks(
+    dataset: str, size: int, chunk_size: int = 1 << 20, seed: Any = None, **params: Any
+) -> Iterator[np.ndarray]:
+    """Yield an int64 dataset in ``chunk_size`` pieces without materialising it.
+
+    Every kind is computed from global positions, so chunks share the distribution
+    of the in-memory generator. Two layouts are adapted to stay streamable: in
+    ``partial`` each chunk draws its distinct values from its own slice of the
+    value range and shuffles positions within the chunk, and ``nearly_sorted``
+    places exactly ``inversions`` disjoint adjacent swaps across the whole stream.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1.")
+    dataset = _ALIASES.get(dataset.lower(), dataset.lower())
+    if dataset not in DATASETS:
+        raise ValueError(f"Unknown dataset type: {dataset}")
+    rng = _rng(seed)
+    if dataset == "nearly_sorted":
+        yield from _iter_nearly_sorted(rng, size, chunk_size, **params)
+        return
+    block = _BLOCKS[dataset]
+    for start in range(0, size, chunk_size):
+        yield block(rng, size, start, min(start + chunk_size, size), **params)
+
+
+def _check_dtype(dtype: str) -> np.dtype:
+    if dtype not in DATASET_DTYPES:
+        raise ValueError(f"dtype must be one of {tuple(DATASET_DTYPES)}, got {dtype}.")
+    return RAW_DTYPES[DATASET_DTYPES[dtype]]
+
+
+def _fit(arr: np.ndarray, target: np.dtype, dtype: str) -> np.ndarray:
+    if arr.ndim != 1:
+        raise ValueError("Datasets must be one-dimensional.")
+    if arr.size and (arr.min() < np.iinfo(target).min or arr.max() > np.iinfo(target).max):
+        raise ValueError(f"Values do not fit in {dtype}.")
+    return arr.astype(target, copy=False)
+
+
+def write_dataset(path: str | Path, values: Sequence[int] | np.ndarray, dtype: str = "int64") -> Path:
+    """Write values as a ``.npy`` file (by suffix) or a headered raw int64/uint32 file.
+
+    The raw layout is a 16-byte header (``RAW_MAGIC``, version, dtype code, element
+    count) followed by little-endian values, so it can be memory-mapped directly.
+    """
+    arr = np.asarray(values)
+    return write_dataset_chunks(path, [arr], dtype=dtype, size=arr.size)
+
+
+def write_dataset_chunks(
+    path: str | Path, chunks: Iterable[np.ndarray], dtype: str = "int64", size: int | None = None
+) -> Path:
+    """Stream chunks (e.g. from ``iter_chunks``) into a dataset file.
+
+    Raw files get their element count patched into the header at the end; ``.npy``
+    files need the total ``size`` up front and are filled through a memory map.
+    """
+    target = _check_dtype(dtype)
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.suffix.lower() == ".npy":
+        if size is None:
+            raise ValueError("size is required to stream a .npy dataset.")
+        out = np.lib.format.open_memmap(path, mode="w+", dtype=target, shape=(size,))
+        pos = 0
+        for chunk in chunks:
+            arr = _fit(np.asarray(chunk), target, dtype)
+            if pos + len(arr) > size:
+                raise ValueError(f"Chunks hold more than {size} values.")
+            out[pos : pos + len(arr)] = arr
+            pos += len(arr)
+        out.flush()
+        del out
+        if pos != size:
+            raise ValueError(f"Chunks hold {pos} values, expected {size}.")
+        return path
+    count = 0
+    with open(path, "wb") as f:
+        f.write(RAW_HEADER.pack(RAW_MAGIC, RAW_VERSION, DATASET_DTYPES[dtype], 0))
+        for chunk in chunks:
+            arr = _fit(np.asarray(chunk), target, dtype)
+            arr.tofile(f)
+            count += len(arr)
+        f.seek(0)
+        f.write(RAW_HEADER.pack(RAW_MAGIC, RAW_VERSION, DATASET_DTYPES[dtype], count))
+    return path
+
+
+def load_dataset(path: str | Path) -> np.ndarray:
+    """Memory-map a dataset written by ``write_dataset`` (read-only, paged in lazily)."""
+    path = Path(path)
+    if path.suffix.lower() == ".npy":
+        return np.load(path, mmap_mode="r")
+    with open(path, "rb") as f:
+        header = f.read(RAW_HEADER.size)
+    if len(header) < RAW_HEADER.size:
+        raise ValueError(f"Not a dataset file: {path}")
+    magic, version, code, count = RAW_HEADER.unpack(header)
+    if magic != RAW_MAGIC or version != RAW_VERSION or code not in RAW_DTYPES:
+        raise ValueError(f"Not a dataset file: {path}")
+    if count == 0:
+        return np.empty(0, dtype=RAW_DTYPES[code])
+    return np.memmap(path, dtype=RAW_DTYPES[code], mode="r", offset=RAW_HEADER.size, shape=(count,))
 
 
 __all__ = [
+    "DATASETS",
+    "DATASET_DTYPES",
+    "GENERATOR_VERSION",
+    "RAW_MAGIC",
+    "iter_chunks",
+    "load_dataset",
+    "write_dataset",
+    "write_dataset_chunks",
     "random_array",
     "partially_sorted_array",
     "reverse_sorted_array",
+    "few_unique_array",
+    "all_equal_array",
+    "sawtooth_array",
+    "organ_pipe_array",
+    "nearly_sorted_array",
+    "sorted_tail_array",
+    "zipf_array",
+    "gaussian_array",
+    "wide64_array",
+    "dataset_names",
     "generate",
 ]
@@ -0,0 +1,193 @@
+"""Content-addressed cache of generated datasets with byte-budget LRU eviction."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from sorting_lab.utils import data_gen
+
+DEFAULT_DIR = "data/cache/datasets"
+DEFAULT_DISK_BUDGET = 2 * 1024**3
+DEFAULT_MEMORY_BUDGET = 512 * 1024**2
+# Cached callers share one seed so every run sees the same inputs.
+DEFAULT_SEED = 0
+
+
+def cache_key(kind: str, size: int, seed: int, params: dict[str, Any]) -> str:
+    """Hex digest identifying a dataset; changes whenever the generator version does."""
+    spec = {
+        "kind": kind.lower(),
+        "size": size,
+        "seed": seed,
+        "params": params,
+        "version": data_gen.GENERATOR_VERSION,
+    }
+    return hashlib.sha256(json.dumps(spec, sort_keys=True).encode()).hexdigest()
+
+
+class DatasetCache:
+    """Two-level dataset cache: an in-process LRU over an on-disk LRU of ``.npy`` files.
+
+    Both levels are bounded in bytes and evict least-recently-used entries first;
+    on disk, recency is the file's modification time, refreshed on every hit.
+    ``directory=None`` keeps the in-process level only. Returned arrays are shared
+    and read-only.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path | None = DEFAULT_DIR,
+        disk_budget: int = DEFAULT_DISK_BUDGET,
+        memory_budget: int = DEFAULT_MEMORY_BUDGET,
+    ) -> None:
+        self.directory = Path(directory) if directory is not None else None
+        self.disk_budget = disk_budget
+        self.memory_budget = memory_budget
+        self._memory: OrderedDict[str, np.ndarray] = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, kind: str, size: int, seed: int | None = DEFAULT_SEED, **params: Any) -> np.ndarray:
+        """Return the dataset ``data_gen.generate(kind, size, seed, **params)`` would build.
+
+        ``seed=None`` asks for fresh random data and bypasses the cache.
+        """
+        if seed is None:
+            return data_gen.generate(kind, size, as_array=True, **params)
+        key = cache_key(kind, size, seed, params)
+        with self._lock:
+            cached = self._memory.get(key)
+            if cached is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return cached
+        data = self._load(key)
+        if data is None:
+            with self._lock:
+                self.misses += 1
+            data = data_gen.generate(kind, size, seed=seed, as_array=True, **params)
+            self._store(key, data)
+        else:
+            with self._lock:
+                self.hits += 1
+        data.flags.writeable = False
+        self._remember(key, data)
+        return data
+
+    def clear(self) -> None:
+        """Drop every cached dataset from memory and disk."""
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+        for path in self._files():
+            path.unlink(missing_ok=True)
+
+    # In-process level -----------------------------------------------------------
+
+    def _remember(self, key: str, data: np.ndarray) -> None:
+        if data.nbytes > self.memory_budget:
+            return
+        with self._lock:
+            if key in self._memory:
+                return
+            self._memory[key] = data
+            self._memory_bytes += data.nbytes
+            while self._memory_bytes > self.memory_budget:
+                _, evicted = self._memory.popitem(last=False)
+                self._memory_bytes -= evicted.nbytes
+
+    # On-disk level --------------------------------------------------------------
+
+    def _path(self, key: str) -> Path | None:
+        return self.directory / f"{key}.npy" if self.directory is not None else None
+
+    def _files(self) -> list[Path]:
+        if self.directory is None or not self.directory.is_dir():
+            return []
+        return list(self.directory.glob("*.npy"))
+
+    def _load(self, key: str) -> np.ndarray | None:
+        path = self._path(key)
+        if path is None or not path.exists():
+            return None
+        try:
+            data = np.load(path)
+        except (OSError, ValueError):
+            path.unlink(missing_ok=True)
+            return None
+        os.utime(path)
+        return data
+
+    def _store(self, key: str, data: np.ndarray) -> None:
+        path = self._path(key)
+        if path is None or data.nbytes > self.disk_budget:
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write-then-rename so concurrent readers never see a partial file.
+        tmp = path.with_name(f"{key}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp, "wb") as f:
+            np.save(f, data)
+        os.replace(tmp, path)
+        self._evict()
+
+    def _evict(self) -> None:
+        entries = []
+        for path in self._files():
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.disk_budget:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+
+_default: DatasetCache | None = None
+_default_lock = threading.Lock()
+
+
+def default_cache() -> DatasetCache:
+    """Process-wide cache shared by the runner and GUI workers."""
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = DatasetCache()
+        return _default
+
+
+def configure(
+    directory: str | Path | None = DEFAULT_DIR,
+    disk_budget: int = DEFAULT_DISK_BUDGET,
+    memory_budget: int = DEFAULT_MEMORY_BUDGET,
+) -> DatasetCache:
+    """Replace the process-wide cache (e.g. a different directory or budget)."""
+    global _default
+    with _default_lock:
+        _default = DatasetCache(directory, disk_budget=disk_budget, memory_budget=memory_budget)
+        return _default
+
+
+__all__ = [
+    "DEFAULT_DIR",
+    "DEFAULT_DISK_BUDGET",
+    "DEFAULT_MEMORY_BUDGET",
+    "DEFAULT_SEED",
+    "DatasetCache",
+    "cache_key",
+    "configure",
+    "default_cache",
+]
@@ -0,0 +1,303 @@
+"""External-memory sort for integer files larger than RAM."""
+
+from __future__ import annotations
+
+import heapq
+import os
+import tempfile
+import time
+from dataclasses import dataclass
+from itertools import islice
+from pathlib import Path
+from typing import IO, Iterable, Iterator, List, Sequence
+
+import numpy as np
+
+from sorting_lab import algorithms
+from sorting_lab.utils import data_gen
+
+# ``dataset`` is a file written by ``data_gen.write_dataset``: ``.npy`` or headered raw.
+FORMATS = ("auto", "binary", "text", "dataset")
+DTYPES = ("int64", "int32", "uint32", "uint64")
+TEXT_SUFFIXES = {".txt", ".csv"}
+_NPY_MAGIC = b"\x93NUMPY"
+
+# Rough cost of one element while a chunk is in memory: the raw block, the Python
+# int and list slot handed to the algorithm, and the algorithm's working copy.
+ITEM_COST = 72
+DEFAULT_MEMORY_BUDGET = 256 * 1024 * 1024
+DEFAULT_FAN_IN = 16
+
+
+@dataclass
+class ExternalSortStats:
+    items: int
+    runs: int
+    merge_passes: int
+    run_generation_s: float
+    merge_s: float
+
+    @property
+    def total_s(self) -> float:
+        return self.run_generation_s + self.merge_s
+
+
+def resolve_format(path: str | Path, fmt: str = "auto") -> str:
+    """Return ``"binary"``, ``"text"`` or ``"dataset"``; ``auto`` decides by file suffix."""
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown file format: {fmt}")
+    if fmt != "auto":
+        return fmt
+    suffix = Path(path).suffix.lower()
+    if suffix in TEXT_SUFFIXES:
+        return "text"
+    return "dataset" if suffix == ".npy" else "binary"
+
+
+def _has_dataset_header(path: str | Path) -> bool:
+    """Whether ``path`` starts with a ``.npy`` or raw dataset header."""
+    try:
+        with open(path, "rb") as f:
+            head = f.read(len(_NPY_MAGIC))
+    except OSError:
+        return False
+    return head.startswith(_NPY_MAGIC) or head.startswith(data_gen.RAW_MAGIC)
+
+
+def _dataset_dtype(values: np.ndarray, path: str | Path) -> str:
+    for name, code in data_gen.DATASET_DTYPES.items():
+        if values.dtype == data_gen.RAW_DTYPES[code]:
+            return name
+    raise ValueError(f"{path} holds {values.dtype} values; dataset files hold {', '.join(data_gen.DATASET_DTYPES)}.")
+
+
+def _read_blocks(f: IO, fmt: str, dtype: np.dtype, block_items: int) -> Iterator[List[int]]:
+    """Yield consecutive blocks of at most ``block_items`` values as Python ints."""
+    while True:
+        if fmt == "binary":
+            block = np.fromfile(f, dtype=dtype, count=block_items).tolist()
+        else:
+            block = [int(line) for line in islice(f, block_items) if line.strip()]
+        if not block:
+            return
+        yield block
+
+
+def _write_block(f: IO, fmt: str, dtype: np.dtype, block: List[int]) -> None:
+    if not block:
+        return
+    if fmt == "binary":
+        np.asarray(block, dtype=dtype).tofile(f)
+    else:
+        f.write("\n".join(map(str, block)))
+        f.write("\n")
+
+
+def _open(path: str | Path, fmt: str, mode: str) -> IO:
+    # Explicit buffer sizes keep reads and writes block-sized.
+    if fmt == "binary":
+        return open(path, mode + "b", buffering=1 << 20)
+    return open(path, mode, buffering=1 << 20, newline="\n")
+
+
+def _merged_blocks(sources: List[Path], run_dtype: np.dtype, block_items: int) -> Iterator[List[int]]:
+    """k-way merge sorted binary runs, yielding the result in blocks of ``block_items``."""
+    handles = [_open(path, "binary", "r") for path in sources]
+    try:
+
+        def values(f: IO) -> Iterator[int]:
+            for block in _read_blocks(f, "binary", run_dtype, block_items):
+                yield from block
+
+        buffer: List[int] = []
+        for value in heapq.merge(*(values(f) for f in handles)):
+            buffer.append(value)
+            if len(buffer) >= block_items:
+                yield buffer
+                buffer = []
+        if buffer:
+            yield buffer
+    finally:
+        for f in handles:
+            f.close()
+
+
+def _merge_files(
+    sources: List[Path], dest: Path, fmt: str, dtype: np.dtype, run_dtype: np.dtype, block_items: int, items: int
+) -> None:
+    """k-way merge sorted binary runs into ``dest`` with block-buffered I/O."""
+    blocks = _merged_blocks(sources, run_dtype, block_items)
+    if fmt == "dataset":
+        # Layout (.npy or headered raw) follows the suffix, as in ``data_gen.write_dataset``.
+        data_gen.write_dataset_chunks(
+            dest, (np.asarray(block, dtype=dtype) for block in blocks), dtype.name, size=items
+        )
+        return
+    with _open(dest, fmt, "w") as out:
+        for block in blocks:
+            _write_block(out, fmt, dtype, block)
+
+
+def _rechunk(blocks: Iterable[Sequence[int]], chunk_items: int) -> Iterator[List[int]]:
+    """Regroup incoming blocks of any size into lists of ``chunk_items`` values."""
+    pending: List[int] = []
+    for block in blocks:
+        pending.extend(block.tolist() if isinstance(block, np.ndarray) else block)
+        while len(pending) >= chunk_items:
+            yield pending[:chunk_items]
+            del pending[:chunk_items]
+    if pending:
+        yield pending
+
+
+def _sort_blocks(
+    blocks: Iterable[Sequence[int]],
+    output_path: str | Path,
+    *,
+    algorithm: str,
+    memory_budget: int,
+    fan_in: int,
+    out_fmt: str,
+    dtype: str,
+    run_dtype: np.dtype,
+    tmp_dir: str | Path | None,
+) -> ExternalSortStats:
+    if algorithm not in algorithms.keys():
+        raise ValueError(f"Unknown algorithm key: {algorithm}")
+    if fan_in < 2:
+        raise ValueError("fan_in must be at least 2.")
+    if memory_budget < ITEM_COST:
+        raise ValueError(f"memory_budget must be at least {ITEM_COST} bytes.")
+    value_dtype = np.dtype(dtype)
+    chunk_items = memory_budget // ITEM_COST
+    block_items = max(1, chunk_items // (fan_in + 1))
+
+    with tempfile.TemporaryDirectory(prefix="sorting-lab-", dir=tmp_dir) as tmp:
+        tmp_path = Path(tmp)
+        runs: List[Path] = []
+        items = 0
+        start = time.perf_counter()
+        for chunk in _rechunk(blocks, chunk_items):
+            sorted_chunk, _ = algorithms.run_algorithm(algorithm, chunk)
+            run = tmp_path / f"run-{len(runs):06d}.bin"
+            with _open(run, "binary", "w") as out:
+                _write_block(out, "binary", run_dtype, sorted_chunk)
+            runs.append(run)
+            items += len(chunk)
+        run_generation_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        run_count = len(runs)
+        passes = 0
+        while len(runs) > fan_in:
+            merged: List[Path] = []
+            for group_start in range(0, len(runs), fan_in):
+                group = runs[group_start : group_start + fan_in]
+                dest = tmp_path / f"pass{passes}-{len(merged):06d}.bin"
+                _merge_files(group, dest, "binary", run_dtype, run_dtype, block_items, items)
+                for path in group:
+                    os.remove(path)
+                merged.append(dest)
+            runs = merged
+            passes += 1
+        _merge_files(runs, Path(output_path), out_fmt, value_dtype, run_dtype, block_items, items)
+        passes += 1
+        merge_s = time.perf_counter() - start
+
+    return ExternalSortStats(
+        items=items,
+        runs=run_count,
+        merge_passes=passes,
+        run_generation_s=run_generation_s,
+        merge_s=merge_s,
+    )
+
+
+def external_sort(
+    input_path: str | Path,
+    output_path: str | Path,
+    *,
+    algorithm: str = "radix",
+    memory_budget: int = DEFAULT_MEMORY_BUDGET,
+    fan_in: int = DEFAULT_FAN_IN,
+    fmt: str = "auto",
+    dtype: str = "int64",
+    tmp_dir: str | Path | None = None,
+) -> ExternalSortStats:
+    """Sort an integer file that may not fit in memory.
+
+    Run generation reads chunks of ``memory_budget // ITEM_COST`` values, sorts each
+    with the registered ``algorithm`` and spills it as a binary run to a temporary
+    directory. The merge phase combines at most ``fan_in`` runs at a time (extra
+    passes when there are more) through ``heapq.merge``, reading and writing in
+    blocks that split the budget across the open runs. Binary files hold native
+    ``dtype`` values; text files hold one integer per line. Dataset files
+    (``make-dataset``/``data_gen.write_dataset``) are recognised by their header even
+    when ``fmt`` says binary, are read through ``data_gen.load_dataset`` and take
+    their dtype from it. The output uses the input's format.
+    """
+    if dtype not in DTYPES:
+        raise ValueError(f"dtype must be one of {DTYPES}, got {dtype}.")
+    fmt = resolve_format(input_path, fmt)
+    if fmt == "binary" and _has_dataset_header(input_path):
+        fmt = "dataset"
+    block_items = max(1, memory_budget // ITEM_COST)
+    options = dict(algorithm=algorithm, memory_budget=memory_budget, fan_in=fan_in, out_fmt=fmt, tmp_dir=tmp_dir)
+    if fmt == "dataset":
+        values = data_gen.load_dataset(input_path)
+        dtype = _dataset_dtype(values, input_path)
+        blocks = (values[start : start + block_items] for start in range(0, len(values), block_items))
+        return _sort_blocks(blocks, output_path, dtype=dtype, run_dtype=np.dtype(dtype), **options)
+    value_dtype = np.dtype(dtype)
+    run_dtype = value_dtype if fmt == "binary" else np.dtype(np.int64)
+    with _open(input_path, fmt, "r") as f:
+        blocks = _read_blocks(f, fmt, value_dtype, block_items)
+        return _sort_blocks(blocks, output_path, dtype=dtype, run_dtype=run_dtype, **options)
+
+
+def sort_chunks(
+    chunks: Iterable[Sequence[int]],
+    output_path: str | Path,
+    *,
+    algorithm: str = "radix",
+    memory_budget: int = DEFAULT_MEMORY_BUDGET,
+    fan_in: int = DEFAULT_FAN_IN,
+    fmt: str = "auto",
+    dtype: str = "int64",
+    tmp_dir: str | Path | None = None,
+) -> ExternalSortStats:
+    """External sort of a stream of chunks (e.g. ``data_gen.iter_chunks``) into a file.
+
+    Chunks are regrouped to the memory budget as they arrive, so the full stream is
+    never held at once. ``fmt`` applies to the output file; ``dataset`` (the
+    default for ``.npy``) writes a file ``data_gen.load_dataset`` can open.
+    """
+    if dtype not in DTYPES:
+        raise ValueError(f"dtype must be one of {DTYPES}, got {dtype}.")
+    fmt = resolve_format(output_path, fmt)
+    if fmt == "dataset" and dtype not in data_gen.DATASET_DTYPES:
+        raise ValueError(f"Dataset files hold {', '.join(data_gen.DATASET_DTYPES)} values, not {dtype}.")
+    return _sort_blocks(
+        chunks,
+        output_path,
+        algorithm=algorithm,
+        memory_budget=memory_budget,
+        fan_in=fan_in,
+        out_fmt=fmt,
+        dtype=dtype,
+        run_dtype=np.dtype(dtype),
+        tmp_dir=tmp_dir,
+    )
+
+
+__all__ = [
+    "DEFAULT_FAN_IN",
+    "DEFAULT_MEMORY_BUDGET",
+    "DTYPES",
+    "ExternalSortStats",
+    "FORMATS",
+    "ITEM_COST",
+    "external_sort",
+    "resolve_format",
+    "sort_chunks",
+]
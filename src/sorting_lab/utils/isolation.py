@@ -0,0 +1,243 @@
+"""Process-isolated benchmark trials on a recycled forkserver worker."""
+
+from __future__ import annotations
+
+import multiprocessing
+import multiprocessing.forkserver
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from statistics import mean, stdev
+from typing import Any, Sequence
+
+import numpy as np
+
+from sorting_lab.utils import metrics
+
+DEFAULT_RECYCLE_AFTER = 8
+# Imported once by the forkserver so every worker forks with them already loaded.
+_PRELOAD = ["numpy", "sorting_lab.algorithms", "sorting_lab.utils.metrics"]
+
+_MB = 1024 * 1024
+
+
+@dataclass
+class IsolatedResult:
+    duration: float
+    memory_mb: float | None
+    memory_peak_mb: float | None
+    # Worker RSS high-water mark during the call minus its RSS just before it.
+    rss_delta_mb: float | None
+    mode: str
+    pid: int
+    gc_collections: int = 0
+    gc_pause_s: float = 0.0
+    # Worker RSS high-water mark (VmHWM) during the call, also for untraced calls.
+    rss_peak_mb: float | None = None
+
+
+def _rss() -> int | None:
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def _trial(
+    data: Any, algo_key: str, options: dict[str, Any], mode: str, batch: int = 1, gc_mode: str = "enabled"
+) -> IsolatedResult:
+    """Worker side: attach the dataset, run ``batch`` measured calls, report their metrics."""
+    from sorting_lab import algorithms
+
+    shm = None
+    if isinstance(data, tuple):
+        name, length, dtype = data
+        shm = shared_memory.SharedMemory(name=name)
+        values: Any = np.ndarray((length,), dtype=dtype, buffer=shm.buf)
+        # Every trial sees the same input, as with read-only cached datasets.
+        values.flags.writeable = False
+    else:
+        values = data
+    try:
+        # Conversion happens here, outside the measured call, as in the in-process runner.
+        if not algorithms.ALGORITHMS[algo_key].accepts_arrays and isinstance(values, np.ndarray):
+            values = values.tolist()
+        rss_before = _rss()
+        hwm = metrics.peak_rss_source() == "vmhwm" and metrics.reset_peak_rss()
+
+        def calls() -> None:
+            for _ in range(batch):
+                algorithms.run_algorithm(algo_key, values, **options)
+
+        result = metrics.measure(calls, mode=mode, gc_mode=gc_mode)
+        peak = metrics._read_hwm() if hwm else None
+        rss_delta = (peak - rss_before) / _MB if peak is not None and rss_before is not None else None
+        del values
+        return IsolatedResult(
+            duration=result.duration,
+            memory_mb=result.memory_mb,
+            memory_peak_mb=result.memory_peak_mb,
+            rss_delta_mb=rss_delta,
+            mode=mode,
+            pid=os.getpid(),
+            gc_collections=result.gc_collections,
+            gc_pause_s=result.gc_pause_s,
+            rss_peak_mb=peak / _MB if peak is not None else None,
+        )
+    finally:
+        if shm is not None:
+            shm.close()
+
+
+class IsolatedRunner:
+    """Runs trials one at a time in a forkserver worker that is replaced every
+    ``recycle_after`` tasks, so allocator state and leftover RSS from earlier
+    trials cannot leak into later ones.
+
+    Datasets are placed in shared memory once (``share``) and attached by the
+    worker instead of being pickled per trial. Use as a context manager, or call
+    ``close`` to stop the worker and release shared segments.
+    """
+
+    def __init__(self, recycle_after: int = DEFAULT_RECYCLE_AFTER) -> None:
+        if recycle_after < 1:
+            raise ValueError("recycle_after must be at least 1.")
+        self.recycle_after = recycle_after
+        methods = multiprocessing.get_all_start_methods()
+        self._ctx = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+        if self._ctx.get_start_method() == "forkserver":
+            self._ctx.set_forkserver_preload(_PRELOAD)
+            # Start the server now so it has imported _PRELOAD before the first trial;
+            # workers forked from it later start warm. A warm-up task would instead
+            # use up one of the first worker's ``recycle_after`` slots.
+            multiprocessing.forkserver.ensure_running()
+        # Recycled by hand: ProcessPoolExecutor(max_tasks_per_child=...) needs Python 3.11.
+        self._executor: ProcessPoolExecutor | None = None
+        self._tasks = 0
+        self._segments: list[shared_memory.SharedMemory] = []
+
+    def _worker(self) -> ProcessPoolExecutor:
+        """The current one-worker pool, replaced once it has run ``recycle_after`` tasks."""
+        if self._executor is not None and self._tasks >= self.recycle_after:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=1, mp_context=self._ctx)
+            self._tasks = 0
+        self._tasks += 1
+        return self._executor
+
+    def share(self, data: Sequence[Any]) -> Any:
+        """Handle for ``data`` to pass to ``run``: shared memory for numeric data, else the data itself."""
+        values = data if isinstance(data, np.ndarray) else np.asarray(data) if len(data) else None
+        if values is None or values.ndim != 1 or values.dtype.kind not in "iuf":
+            return list(data)
+        shm = shared_memory.SharedMemory(create=True, size=max(1, values.nbytes))
+        np.ndarray(values.shape, dtype=values.dtype, buffer=shm.buf)[:] = values
+        self._segments.append(shm)
+        return (shm.name, len(values), values.dtype.str)
+
+    def run(
+        self,
+        algo_key: str,
+        handle: Any,
+        mode: str = "timing",
+        options: dict[str, Any] | None = None,
+        batch: int = 1,
+        gc_mode: str = "enabled",
+    ) -> IsolatedResult:
+        """Run ``batch`` back-to-back calls of ``algo_key`` on a shared dataset in the worker.
+
+        ``duration`` and the GC figures cover the whole batch.
+        """
+        return self._worker().submit(_trial, handle, algo_key, dict(options or {}), mode, batch, gc_mode).result()
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+        while self._segments:
+            shm = self._segments.pop()
+            shm.close()
+            shm.unlink()
+
+    def __enter__(self) -> "IsolatedRunner":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def run_trials(
+    runner: IsolatedRunner,
+    algo_key: str,
+    handle: Any,
+    runs: int = 3,
+    *,
+    mode: str = "separate",
+    memory_runs: int = 1,
+    options: dict[str, Any] | None = None,
+    adaptive: metrics.AdaptiveConfig | None = None,
+    gc_mode: str = "enabled",
+) -> metrics.TrialStats:
+    """Isolated counterpart of ``metrics.run_trials`` for one algorithm and shared dataset.
+
+    Modes, ``adaptive`` and ``gc_mode`` mean the same as in ``metrics``; a batch runs inside one
+    worker task. Every task additionally reports the worker's RSS delta, averaged
+    into ``TrialStats.rss_delta_mb``. In separate mode the RSS peak is taken from
+    the untraced timing tasks when the worker can read VmHWM.
+    """
+    if mode not in metrics.MODES:
+        raise ValueError(f"mode must be one of {metrics.MODES}, got {mode}.")
+    trial_mode = "timing" if mode == "separate" else mode
+    timed: list[IsolatedResult] = []
+    calls = 0
+
+    def sample(batch: int) -> float:
+        nonlocal calls
+        result = runner.run(algo_key, handle, trial_mode, options, batch, gc_mode)
+        timed.append(result)
+        calls += batch
+        return result.duration
+
+    if adaptive is not None:
+        raw, batch = metrics.adaptive_samples(sample, adaptive, batchable=trial_mode == "timing")
+        summary = metrics.summarize(raw, adaptive.mad_threshold, batch)
+        durations = metrics.reject_outliers(raw, adaptive.mad_threshold)
+    else:
+        durations = [sample(1) for _ in range(runs)]
+        summary = metrics.summarize(durations) if durations else None
+    traced = timed
+    if mode == "separate":
+        traced = [runner.run(algo_key, handle, "memory", options, gc_mode=gc_mode) for _ in range(memory_runs)]
+
+    def avg(values: list[float | None]) -> float | None:
+        present = [v for v in values if v is not None]
+        return mean(present) if present else None
+
+    memory_peak = avg([r.memory_peak_mb for r in traced])
+    untraced_peak = avg([r.rss_peak_mb for r in timed])
+    if mode == "separate" and untraced_peak is not None:
+        memory_peak = untraced_peak
+
+    return metrics.TrialStats(
+        durations=durations,
+        avg=mean(durations) if durations else 0.0,
+        std=stdev(durations) if len(durations) > 1 else 0.0,
+        memory_mb=avg([r.memory_mb for r in traced]),
+        memory_peak_mb=memory_peak,
+        mode=mode,
+        rss_delta_mb=avg([r.rss_delta_mb for r in timed + traced]),
+        summary=summary,
+        gc_collections=sum(r.gc_collections for r in timed) / calls if calls else 0.0,
+        gc_pause_s=sum(r.gc_pause_s for r in timed) / calls if calls else 0.0,
+        gc_mode=gc_mode,
+    )
+
+
+__all__ = ["DEFAULT_RECYCLE_AFTER", "IsolatedResult", "IsolatedRunner", "run_trials"]
@@ -1,11 +1,14 @@
 from __future__ import annotations
 
+import gc
+import math
 import threading
 import time
 import tracemalloc
+from contextlib import contextmanager
 from dataclasses import dataclass
-from statistics import mean, stdev
-from typing import Any, Callable, Iterable, List
+from statistics import mean, median, quantiles, stdev
+from typing import Any, Callable, Iterable, Iterator, List
 
 try:
     import psutil
@@ -13,61 +16,178 @@ except ImportError:  # pragma: no cover - dependency expected
     psutil = None
 
 
+# timing:   untraced runs only; memory fields are None.
+# memory:   traced runs only; durations include tracing overhead.
+# separate: untraced timing runs, then traced memory runs (the default).
+# combined: timing and memory from the same traced run (the old behaviour).
+MODES = ("separate", "timing", "memory", "combined")
+
+# enabled:  the cyclic collector runs as usual.
+# disabled: gc.disable() for the measured call; nothing is collected.
+# freeze:   gc.freeze() moves existing objects to the permanent generation, so
+#           collections still run but only scan objects the call allocates.
+GC_MODES = ("enabled", "disabled", "freeze")
+
+
 @dataclass
 class MeasureResult:
     duration: float
     memory_mb: float | None
     memory_peak_mb: float | None
     output: Any
+    # Which MODES entry produced the numbers.
+    mode: str = "combined"
+    # Cyclic GC passes and their total pause inside the timed call.
+    gc_collections: int = 0
+    gc_pause_s: float = 0.0
+
 
+def _check_mode(mode: str) -> None:
+    if mode not in MODES:
+        raise ValueError(f"mode must be one of {MODES}, got {mode}.")
+
+
+@dataclass
+class GCStats:
+    collections: int = 0
+    pause_s: float = 0.0
 
-def measure(func: Callable[..., Any], *args: Any, **kwargs: Any) -> MeasureResult:
-    """Measure runtime, Python allocation peak (extra) and process RSS peak of callable."""
-    process = psutil.Process() if psutil else None
-    mem_before = process.memory_info().rss if process else None
-    peak_rss = mem_before
+
+@contextmanager
+def gc_control(gc_mode: str = "enabled") -> Iterator[GCStats]:
+    """Apply ``gc_mode`` for the block and yield its ``GCStats`` (collections, pause time)."""
+    if gc_mode not in GC_MODES:
+        raise ValueError(f"gc_mode must be one of {GC_MODES}, got {gc_mode}.")
+    stats = GCStats()
+    started: list[float] = []
+
+    def callback(phase: str, info: dict[str, Any]) -> None:
+        if phase == "start":
+            started.append(time.perf_counter())
+        elif started:
+            stats.pause_s += time.perf_counter() - started.pop()
+            stats.collections += 1
+
+    was_enabled = gc.isenabled()
+    if gc_mode == "disabled":
+        gc.disable()
+    elif gc_mode == "freeze":
+        gc.freeze()
+    gc.callbacks.append(callback)
+    try:
+        yield stats
+    finally:
+        gc.callbacks.remove(callback)
+        if gc_mode == "freeze":
+            gc.unfreeze()
+        elif was_enabled:
+            gc.enable()
+
+
+def _timed(func: Callable[..., Any], args: tuple, kwargs: dict) -> tuple[float, Any]:
+    start = time.perf_counter()
+    output = func(*args, **kwargs)
+    return time.perf_counter() - start, output
+
+
+_PROC_STATUS = "/proc/self/status"
+_CLEAR_REFS = "/proc/self/clear_refs"
+_hwm_supported: bool | None = None
+
+
+def _read_hwm() -> int | None:
+    """Kernel RSS high-water mark (VmHWM) of this process in bytes, if available."""
+    try:
+        with open(_PROC_STATUS, encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def reset_peak_rss() -> bool:
+    """Reset VmHWM to the current RSS (Linux >= 4.0); False when unsupported."""
+    try:
+        with open(_CLEAR_REFS, "w", encoding="ascii") as f:
+            f.write("5")
+    except OSError:
+        return False
+    return True
+
+
+def peak_rss_source() -> str | None:
+    """How ``memory_peak_mb`` is measured: ``"vmhwm"``, ``"sampler"`` or None."""
+    global _hwm_supported
+    if _hwm_supported is None:
+        _hwm_supported = _read_hwm() is not None and reset_peak_rss()
+    if _hwm_supported:
+        return "vmhwm"
+    return "sampler" if psutil else None
+
+
+def _rss_sampler() -> tuple[Callable[[], None], Callable[[], int]]:
+    """Fallback RSS peak tracking via a psutil thread polling every 10 ms; returns ``(stop, peak)``."""
+    process = psutil.Process()
+    peak_rss = process.memory_info().rss
     stop_event = threading.Event()
     peak_lock = threading.Lock()
-    tracing_started = False
-    py_current_before = None
-
-    if tracemalloc.is_tracing():
-        py_current_before, _ = tracemalloc.get_traced_memory()
-        tracemalloc.reset_peak()
-    else:
-        tracemalloc.start()
-        tracing_started = True
-        py_current_before, _ = tracemalloc.get_traced_memory()
 
     def sampler() -> None:
         nonlocal peak_rss
         while not stop_event.is_set():
             try:
-                rss = process.memory_info().rss if process else None
+                rss = process.memory_info().rss
             except Exception:
                 break
-            if rss is not None:
-                with peak_lock:
-                    if peak_rss is None or rss > peak_rss:
-                        peak_rss = rss
+            with peak_lock:
+                peak_rss = max(peak_rss, rss)
             stop_event.wait(0.01)
 
-    thread = None
-    if process is not None:
-        thread = threading.Thread(target=sampler, daemon=True)
-        thread.start()
-    start = time.perf_counter()
-    output = func(*args, **kwargs)
-    duration = time.perf_counter() - start
-    mem_after = process.memory_info().rss if process else None
-    if process is not None:
+    thread = threading.Thread(target=sampler, daemon=True)
+    thread.start()
+
+    def stop() -> None:
+        nonlocal peak_rss
+        rss = process.memory_info().rss
         stop_event.set()
-        if thread is not None:
-            thread.join(timeout=1.0)
-    if mem_after is not None:
+        thread.join(timeout=1.0)
+        with peak_lock:
+            peak_rss = max(peak_rss, rss)
+
+    def peak() -> int:
         with peak_lock:
-            if peak_rss is None or mem_after > peak_rss:
-                peak_rss = mem_after
+            return peak_rss
+
+    return stop, peak
+
+
+def _traced(func: Callable[..., Any], args: tuple, kwargs: dict) -> MeasureResult:
+    """Run func under tracemalloc, reading the RSS peak from the kernel (or a sampler)."""
+    source = peak_rss_source()
+    tracing_started = False
+    py_current_before = None
+
+    if tracemalloc.is_tracing():
+        py_current_before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+    else:
+        tracemalloc.start()
+        tracing_started = True
+        py_current_before, _ = tracemalloc.get_traced_memory()
+
+    sampler = _rss_sampler() if source == "sampler" else None
+    if source == "vmhwm":
+        reset_peak_rss()
+    duration, output = _timed(func, args, kwargs)
+    peak_rss = None
+    if source == "vmhwm":
+        peak_rss = _read_hwm()
+    elif sampler is not None:
+        stop, peak = sampler
+        stop()
+        peak_rss = peak()
     _, py_peak = tracemalloc.get_traced_memory()
     if tracing_started:
         tracemalloc.stop()
@@ -80,6 +200,181 @@ def measure(func: Callable[..., Any], *args: Any, **kwargs: Any) -> MeasureResul
     return MeasureResult(duration=duration, memory_mb=memory_mb, memory_peak_mb=memory_peak_mb, output=output)
 
 
+def measure(
+    func: Callable[..., Any], *args: Any, mode: str = "combined", gc_mode: str = "enabled", **kwargs: Any
+) -> MeasureResult:
+    """Measure runtime, Python allocation peak (extra) and process RSS peak of callable.
+
+    ``mode`` picks the traced calls (see ``MODES``); ``gc_mode`` one of ``GC_MODES``.
+    """
+    _check_mode(mode)
+    if mode in ("timing", "separate"):
+        hwm = mode == "separate" and peak_rss_source() == "vmhwm" and reset_peak_rss()
+        with gc_control(gc_mode) as gc_stats:
+            duration, output = _timed(func, args, kwargs)
+        peak_rss = _read_hwm() if hwm else None
+        result = MeasureResult(duration=duration, memory_mb=None, memory_peak_mb=None, output=output)
+        if mode == "separate":
+            with gc_control(gc_mode):
+                traced = _traced(func, args, kwargs)
+            result.memory_mb, result.memory_peak_mb = traced.memory_mb, traced.memory_peak_mb
+            if peak_rss is not None:
+                result.memory_peak_mb = peak_rss / (1024 * 1024)
+    else:
+        with gc_control(gc_mode) as gc_stats:
+            result = _traced(func, args, kwargs)
+    result.mode = mode
+    result.gc_collections = gc_stats.collections
+    result.gc_pause_s = gc_stats.pause_s
+    return result
+
+
+@dataclass(frozen=True)
+class AdaptiveConfig:
+    """Stopping rules for ``run_trials(..., adaptive=...)``."""
+
+    # Timed samples always taken, and the cap on them.
+    min_runs: int = 5
+    max_runs: int = 100
+    # Untimed calls before batch calibration.
+    warmup: int = 1
+    # Stop once the 95% CI half-width is at most this fraction of the mean...
+    target_ci: float = 0.02
+    # ...or once this much wall time has gone into the cell.
+    time_budget_s: float = 1.0
+    # Calls shorter than this are batched so one sample lasts at least this long.
+    min_sample_s: float = 0.002
+    max_batch: int = 1 << 16
+    # Modified z-score (0.6745 * |x - median| / MAD) above which a sample is dropped.
+    mad_threshold: float = 3.5
+
+
+@dataclass(frozen=True)
+class TimingSummary:
+    samples: int
+    outliers: int
+    batch: int
+    mean: float
+    std: float
+    median: float
+    min: float
+    p5: float
+    p95: float
+    ci_low: float | None
+    ci_high: float | None
+
+    @property
+    def relative_ci(self) -> float | None:
+        """95% CI half-width over the mean."""
+        if self.ci_low is None or self.ci_high is None or self.mean <= 0:
+            return None
+        return (self.ci_high - self.ci_low) / 2 / self.mean
+
+    def columns(self) -> dict[str, Any]:
+        """Flat record fields for runner result tables."""
+        return {
+            "samples": self.samples,
+            "outliers": self.outliers,
+            "batch": self.batch,
+            "median_time_s": self.median,
+            "min_time_s": self.min,
+            "p5_time_s": self.p5,
+            "p95_time_s": self.p95,
+            "ci95_low_s": self.ci_low,
+            "ci95_high_s": self.ci_high,
+        }
+
+
+# Two-sided 95% Student t quantiles for 1..30 degrees of freedom.
+_T95 = (
+    12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+    2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+    2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042,
+)  # fmt: skip
+
+
+def _t95(df: int) -> float:
+    # Beyond the table 1.96 + 2.5/df stays within 0.002 of the exact quantile.
+    return _T95[df - 1] if df <= len(_T95) else 1.96 + 2.5 / df
+
+
+def reject_outliers(durations: List[float], threshold: float = 3.5) -> List[float]:
+    """Drop samples whose modified z-score against the median/MAD exceeds ``threshold``."""
+    if len(durations) < 3:
+        return list(durations)
+    mid = median(durations)
+    mad = median(abs(d - mid) for d in durations)
+    if mad == 0:
+        return list(durations)
+    return [d for d in durations if 0.6745 * abs(d - mid) / mad <= threshold]
+
+
+def summarize(durations: List[float], mad_threshold: float | None = None, batch: int = 1) -> TimingSummary:
+    """Median, min, p5/p95, mean and 95% t confidence interval of ``durations``.
+
+    With ``mad_threshold`` outliers are rejected first and counted in ``outliers``.
+    """
+    if not durations:
+        raise ValueError("summarize needs at least one duration.")
+    kept = reject_outliers(durations, mad_threshold) if mad_threshold is not None else list(durations)
+    avg = mean(kept)
+    if len(kept) > 1:
+        std = stdev(kept)
+        cuts = quantiles(kept, n=20, method="inclusive")
+        p5, p95 = cuts[0], cuts[-1]
+        half = _t95(len(kept) - 1) * std / math.sqrt(len(kept))
+        ci_low, ci_high = avg - half, avg + half
+    else:
+        std = 0.0
+        p5 = p95 = kept[0]
+        ci_low = ci_high = None
+    return TimingSummary(
+        samples=len(kept),
+        outliers=len(durations) - len(kept),
+        batch=batch,
+        mean=avg,
+        std=std,
+        median=median(kept),
+        min=min(kept),
+        p5=p5,
+        p95=p95,
+        ci_low=ci_low,
+        ci_high=ci_high,
+    )
+
+
+def adaptive_samples(
+    sample: Callable[[int], float], config: AdaptiveConfig, batchable: bool = True
+) -> tuple[List[float], int]:
+    """Collect per-call durations from ``sample(batch)`` until ``config`` says stop.
+
+    Returns ``(durations, batch)``.
+    """
+    if config.min_runs < 2 or config.max_runs < config.min_runs:
+        raise ValueError("AdaptiveConfig needs 2 <= min_runs <= max_runs.")
+    start = time.perf_counter()
+    for _ in range(config.warmup):
+        sample(1)
+    batch = 1
+    while batchable and batch < config.max_batch:
+        total = sample(batch)
+        if total >= config.min_sample_s:
+            break
+        estimate = math.ceil(batch * config.min_sample_s / total) if total > 0 else batch * 2
+        batch = min(config.max_batch, max(batch * 2, estimate))
+    durations: List[float] = []
+    while len(durations) < config.max_runs:
+        durations.append(sample(batch) / batch)
+        if len(durations) < config.min_runs:
+            continue
+        summary = summarize(durations, config.mad_threshold, batch)
+        relative = summary.relative_ci
+        converged = summary.samples >= config.min_runs and relative is not None and relative <= config.target_ci
+        if converged or time.perf_counter() - start >= config.time_budget_s:
+            break
+    return durations, batch
+
+
 @dataclass
 class TrialStats:
     durations: List[float]
@@ -87,25 +382,144 @@ class TrialStats:
     std: float
     memory_mb: float | None
     memory_peak_mb: float | None
+    mode: str = "combined"
+    # Only set by isolated trials (see ``isolation.run_trials``).
+    rss_delta_mb: float | None = None
+    summary: TimingSummary | None = None
+    # GC passes and pause seconds per timed call.
+    gc_collections: float = 0.0
+    gc_pause_s: float = 0.0
+    gc_mode: str = "enabled"
 
 
-def run_trials(func: Callable[..., Any], runs: int = 3, *args: Any, **kwargs: Any) -> TrialStats:
-    """Execute function multiple times, returning timing stats."""
-    durations: List[float] = []
+def run_trials(
+    func: Callable[..., Any],
+    runs: int = 3,
+    *args: Any,
+    mode: str = "separate",
+    memory_runs: int = 1,
+    adaptive: AdaptiveConfig | None = None,
+    gc_mode: str = "enabled",
+    **kwargs: Any,
+) -> TrialStats:
+    """Execute function multiple times, returning timing stats.
+
+    ``mode`` and ``gc_mode`` as in ``measure``; ``adaptive`` replaces the fixed ``runs``.
+    """
+    _check_mode(mode)
+    calls = 0
+    gc_totals = GCStats()
     mem_samples: list[float] = []
     mem_peak_samples: list[float] = []
-    for _ in range(runs):
-        result = measure(func, *args, **kwargs)
-        durations.append(result.duration)
+
+    def add_memory(result: MeasureResult) -> None:
         if result.memory_mb is not None:
             mem_samples.append(result.memory_mb)
         if result.memory_peak_mb is not None:
             mem_peak_samples.append(result.memory_peak_mb)
+
+    traced_timing = mode in ("memory", "combined")
+    hwm = mode == "separate" and peak_rss_source() == "vmhwm"
+    untraced_peaks: list[float] = []
+
+    def sample(batch: int) -> float:
+        nonlocal calls
+        with gc_control(gc_mode) as gc_stats:
+            if traced_timing:
+                result = _traced(func, args, kwargs)
+                add_memory(result)
+                duration = result.duration
+            else:
+                if hwm:
+                    reset_peak_rss()
+                start = time.perf_counter()
+                for _ in range(batch):
+                    func(*args, **kwargs)
+                duration = time.perf_counter() - start
+                peak_rss = _read_hwm() if hwm else None
+                if peak_rss is not None:
+                    untraced_peaks.append(peak_rss / (1024 * 1024))
+        calls += batch
+        gc_totals.collections += gc_stats.collections
+        gc_totals.pause_s += gc_stats.pause_s
+        return duration
+
+    if adaptive is not None:
+        raw, batch = adaptive_samples(sample, adaptive, batchable=not traced_timing)
+        summary = summarize(raw, adaptive.mad_threshold, batch)
+        durations = reject_outliers(raw, adaptive.mad_threshold)
+    else:
+        durations = [sample(1) for _ in range(runs)]
+        summary = summarize(durations) if durations else None
+    if mode == "separate":
+        for _ in range(memory_runs):
+            with gc_control(gc_mode):
+                add_memory(_traced(func, args, kwargs))
+        if untraced_peaks:
+            mem_peak_samples = untraced_peaks
     avg = mean(durations) if durations else 0.0
     std_val = stdev(durations) if len(durations) > 1 else 0.0
     memory = mean(mem_samples) if mem_samples else None
     memory_peak = mean(mem_peak_samples) if mem_peak_samples else None
-    return TrialStats(durations=durations, avg=avg, std=std_val, memory_mb=memory, memory_peak_mb=memory_peak)
+    return TrialStats(
+        durations=durations,
+        avg=avg,
+        std=std_val,
+        memory_mb=memory,
+        memory_peak_mb=memory_peak,
+        mode=mode,
+        summary=summary,
+        gc_collections=gc_totals.collections / calls if calls else 0.0,
+        gc_pause_s=gc_totals.pause_s / calls if calls else 0.0,
+        gc_mode=gc_mode,
+    )
+
+
+def count_comparisons(func: Callable[[list[Any]], Any], data: Iterable[Any]) -> int:
+    """Run func on comparison-counting proxies of data and return the comparison count."""
+    counter = [0]
+
+    class _Counted:
+        __slots__ = ("value",)
+
+        def __init__(self, value: Any) -> None:
+            self.value = value
+
+        def __lt__(self, other: "_Counted") -> bool:
+            counter[0] += 1
+            return self.value < other.value
+
+        def __le__(self, other: "_Counted") -> bool:
+            counter[0] += 1
+            return self.value <= other.value
+
+        def __gt__(self, other: "_Counted") -> bool:
+            counter[0] += 1
+            return self.value > other.value
+
+        def __ge__(self, other: "_Counted") -> bool:
+            counter[0] += 1
+            return self.value >= other.value
+
+    func([_Counted(value) for value in data])
+    return counter[0]
 
 
-__all__ = ["MeasureResult", "TrialStats", "measure", "run_trials"]
+__all__ = [
+    "AdaptiveConfig",
+    "GCStats",
+    "GC_MODES",
+    "MODES",
+    "MeasureResult",
+    "TimingSummary",
+    "TrialStats",
+    "adaptive_samples",
+    "count_comparisons",
+    "gc_control",
+    "measure",
+    "peak_rss_source",
+    "reset_peak_rss",
+    "reject_outliers",
+    "run_trials",
+    "summarize",
+]
@@ -3,8 +3,20 @@ from __future__ import annotations
 import sys
 from pathlib import Path
 
+import pytest
+
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 SRC_PATH = PROJECT_ROOT / "src"
 if str(SRC_PATH) not in sys.path:
     sys.path.insert(0, str(SRC_PATH))
+
+
+@pytest.fixture(autouse=True)
+def _isolated_dataset_cache(tmp_path, monkeypatch):
+    """Keep the runner's process-wide dataset cache out of the working tree."""
+    from sorting_lab.utils import dataset_cache
+
+    directory = tmp_path / "dataset-cache"
+    monkeypatch.setattr(dataset_cache, "DEFAULT_DIR", str(directory))
+    monkeypatch.setattr(dataset_cache, "_default", dataset_cache.DatasetCache(directory))
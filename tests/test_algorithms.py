@@ -20,6 +20,273 @@ def test_algorithms_sort_correctly(algo_key, data):
     assert len(steps) <= 10
 
 
-def test_radix_sort_rejects_negative_values():
+@pytest.mark.parametrize("algo_key", ["radix", "radix_py"])
+def test_radix_sort_handles_negative_values(algo_key):
+    data = [3, -1, 2, -(2**40), 0, 2**40, -1]
+    result, _ = algorithms.run_algorithm(algo_key, data)
+    assert result == sorted(data)
+
+
+@pytest.mark.parametrize("digit_bits", [8, 11, 16])
+def test_radix_numpy_digit_widths(digit_bits):
+    np = pytest.importorskip("numpy")
+    rng = np.random.default_rng(7)
+    data = rng.integers(-(2**62), 2**62, size=5000)
+    result, steps = algorithms.run_algorithm("radix", data, backend="numpy", digit_bits=digit_bits)
+    assert result == sorted(data.tolist())
+    assert steps == []
+
+
+@pytest.mark.parametrize("workers", [2, 3])
+def test_radix_numpy_threaded_stripes(workers):
+    np = pytest.importorskip("numpy")
+    from sorting_lab.algorithms.radix_sort import MIN_STRIPE, radix_sort_array
+
+    values = np.random.default_rng(7).integers(-(2**40), 2**40, size=3 * MIN_STRIPE + 11)
+    assert np.array_equal(radix_sort_array(values, workers=workers), np.sort(values))
+
+
+@pytest.mark.parametrize("dtype", ["int8", "int16", "int32", "uint16", "uint32"])
+def test_radix_numpy_narrow_dtypes(dtype):
+    np = pytest.importorskip("numpy")
+    from sorting_lab.algorithms.radix_sort import radix_sort_array
+
+    info = np.iinfo(dtype)
+    values = np.random.default_rng(7).integers(info.min, info.max, size=1001, endpoint=True).astype(dtype)
+    values[:3] = [info.min, info.max, 0]
+    result = radix_sort_array(values)
+    assert result.dtype == values.dtype
+    assert np.array_equal(result, np.sort(values))
+    assert algorithms.run_algorithm("radix", values)[0] == sorted(values.tolist())
+
+
+def test_radix_sort_rejects_non_integers():
+    with pytest.raises(ValueError):
+        algorithms.run_algorithm("radix", [1.5, 0.5])
+
+
+@pytest.mark.parametrize("cutoff", [1, 4, 16])
+def test_introsort_few_distinct_keys(cutoff):
+    data = [(i * 7919) % 3 for i in range(2000)] + list(range(50, 0, -1))
+    result, _ = algorithms.run_algorithm("intro", data, cutoff=cutoff)
+    assert result == sorted(data)
+
+
+@pytest.mark.parametrize("record_steps", [False, True])
+@pytest.mark.parametrize("max_depth", [0, 1])
+def test_introsort_falls_back_to_heap_sort(monkeypatch, record_steps, max_depth):
+    import importlib
+
+    quick_sort = importlib.import_module("sorting_lab.algorithms.quick_sort")
+    calls = []
+    real_heap_sort = quick_sort.heap_sort
+
+    def counting_heap_sort(items, **kwargs):
+        calls.append(len(items))
+        return real_heap_sort(items, **kwargs)
+
+    monkeypatch.setattr(quick_sort, "heap_sort", counting_heap_sort)
+    data = [(i * 7919) % 1000 for i in range(500)]
+    result, _ = quick_sort.introsort(data, record_steps=record_steps, step_limit=None, max_depth=max_depth)
+    assert result == sorted(data)
+    assert calls and (max_depth or calls == [500])
+    with pytest.raises(ValueError):
+        quick_sort.introsort(data, max_depth=-1)
+
+
+class _Keyed:
+    def __init__(self, key, tag):
+        self.key = key
+        self.tag = tag
+
+    def __lt__(self, other):
+        return self.key < other.key
+
+    def __le__(self, other):
+        return self.key <= other.key
+
+    def __gt__(self, other):
+        return self.key > other.key
+
+
+def test_merge_sort_is_stable():
+    data = [_Keyed(k, i) for i, k in enumerate([3, 1, 3, 2, 1, 3, 2, 0, 1])]
+    result, _ = algorithms.run_algorithm("merge", data)
+    assert [(x.key, x.tag) for x in result] == sorted((x.key, x.tag) for x in data)
+
+
+@pytest.mark.parametrize("reverse", [False, True])
+def test_merge_sort_needs_one_auxiliary_buffer(reverse):
+    import sys
+    import tracemalloc
+
+    n = 50_000
+    data = list(range(n))[:: -1 if reverse else 1]
+    tracemalloc.start()
+    try:
+        algorithms.run_algorithm("merge", data)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    # The working copy of the input plus one n-slot buffer; no temporary grows with n.
+    slot = sys.getsizeof([None]) - sys.getsizeof([])
+    assert peak < 2.2 * n * slot
+
+
+def test_natural_merge_sort_is_stable_and_adaptive():
+    keys = list(range(200)) + list(range(300, 100, -1)) + [5] * 40 + [(i * 37) % 97 for i in range(500)]
+    data = [_Keyed(k, i) for i, k in enumerate(keys)]
+    result, _ = algorithms.run_algorithm("natural", data)
+    assert [(x.key, x.tag) for x in result] == sorted((x.key, x.tag) for x in data)
+
+    from sorting_lab.utils import metrics
+
+    def comparisons(values):
+        return metrics.count_comparisons(lambda items: algorithms.run_algorithm("natural", items), values)
+
+    n = 1000
+    # One ascending or one strictly descending run: a single scan, no merging.
+    assert comparisons(list(range(n))) == n - 1
+    assert comparisons(list(range(n, 0, -1))) == n - 1
+    # Two runs cost one scan plus one (galloping) merge, far below n log2 n.
+    assert comparisons(list(range(n // 2)) * 2) <= 2 * n + 50
+
+
+@pytest.mark.parametrize("arity", [2, 3, 4])
+def test_floyd_heap_sort_saves_comparisons(arity):
+    from sorting_lab.utils import metrics
+
+    data = [(i * 7919) % 1009 for i in range(2000)]
+    result, _ = algorithms.run_algorithm("heap_floyd", data, arity=arity)
+    assert result == sorted(data)
+    baseline = metrics.count_comparisons(lambda items: algorithms.run_algorithm("heap", items), data)
+    floyd = metrics.count_comparisons(lambda items: algorithms.run_algorithm("heap_floyd", items, arity=arity), data)
+    assert floyd < baseline
+
+
+@pytest.mark.parametrize("gaps", ["shell", "knuth", "ciura", "tokuda", "sedgewick", "pratt"])
+def test_shell_sort_gap_sequences(gaps):
+    data = [(i * 7919) % 1009 for i in range(3000)]
+    result, _ = algorithms.run_algorithm("shell", data, gaps=gaps)
+    assert result == sorted(data)
+
+
+def test_shell_sort_rejects_unknown_gap_sequence():
+    with pytest.raises(ValueError):
+        algorithms.run_algorithm("shell", [2, 1], gaps="fibonacci")
+
+
+@pytest.mark.parametrize("algo_key", algorithms.keys())
+def test_step_log_replays_to_sorted_output(algo_key):
+    from sorting_lab.algorithms.steps import StepLog
+
+    data = [(i * 7919) % 1009 - 300 for i in range(600)]
+    result, steps = algorithms.run_algorithm(algo_key, data, record_steps=True, step_limit=None)
+    assert isinstance(steps, StepLog)
+    assert steps.initial == steps[0] == data
+    assert len(steps) == steps.operations + 1
+    assert steps[-1] == result
+    middle = len(steps) // 2
+    assert steps[middle] == list(steps)[middle]
+
+
+def test_step_log_stays_compact():
+    import tracemalloc
+
+    from sorting_lab.algorithms.steps import StepLog
+    from sorting_lab.utils import data_gen
+
+    log = StepLog(range(100_000), keyframe_every=1 << 20)
+    for i in range(50_000):
+        log.swap(i, 99_999 - i)
+    assert log.nbytes < 1024 * 1024
+    assert log[0] == list(range(100_000))
+    assert log[-1] == list(range(99_999, -1, -1))
+
+    # A full capture of quick sort on 100k random values: about 900k operations.
+    data = data_gen.generate("random", 100_000, seed=1)
+    tracemalloc.start()
+    try:
+        result, steps = algorithms.run_algorithm("quick", data, record_steps=True, step_limit=None)
+        held, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert steps.operations > 500_000
+    # The log together with the sorted output list (0.8 MB of it).
+    assert held < 3 * 1024 * 1024
+    assert steps[0] == data and steps[-1] == result
+
+
+@pytest.mark.parametrize("algo_key", algorithms.keys())
+def test_fast_path_matches_instrumented_path(algo_key):
+    data = [(i * 7919) % 1009 - 300 for i in range(700)]
+    fast, fast_steps = algorithms.run_algorithm(algo_key, data)
+    instrumented, _ = algorithms.run_algorithm(algo_key, data, record_steps=True, step_limit=0)
+    assert fast == instrumented == sorted(data)
+    assert fast_steps == []
+
+
+@pytest.mark.parametrize("algo_key", ["quick", "intro", "heap", "heap_floyd", "shell", "merge", "natural"])
+def test_fast_path_compares_in_lockstep_with_instrumented_path(algo_key):
+    from sorting_lab.utils import metrics
+
+    # Same comparisons in the same number means the twins run the same algorithm,
+    # not merely two algorithms that both sort.
+    datasets = [
+        [(i * 7919) % 1009 - 300 for i in range(700)],
+        [(i * 37) % 5 for i in range(500)],
+        list(range(300)) + list(range(600, 300, -1)) + list(range(100)),
+    ]
+    for data in datasets:
+        fast = metrics.count_comparisons(lambda items: algorithms.run_algorithm(algo_key, items), data)
+        instrumented = metrics.count_comparisons(
+            lambda items: algorithms.run_algorithm(algo_key, items, record_steps=True, step_limit=None), data
+        )
+        assert fast == instrumented
+
+
+@pytest.mark.parametrize("workers,chunk_size", [(1, None), (2, None), (3, 37)])
+def test_parallel_merge_workers_and_chunks(workers, chunk_size):
+    ints = [(i * 7919) % 1009 - 300 for i in range(1000)]
+    floats = [x / 7 for x in ints]
+    for data in (ints, floats):
+        result, steps = algorithms.run_algorithm("parallel_merge", data, workers=workers, chunk_size=chunk_size)
+        assert result == sorted(data)
+        assert steps == []
+
+
+def test_auto_dispatch_and_profile(tmp_path, caplog):
+    import logging
+
+    np = pytest.importorskip("numpy")
+    from sorting_lab.algorithms.auto_sort import AutoProfile, choose, load_profile, save_profile
+    from sorting_lab.utils import data_gen
+
+    profile = AutoProfile()
+    cases = {
+        ("random", 10): "insertion",
+        ("reverse", 5000): "natural",
+        ("random", 5000): "radix",
+        ("wide64", 5000): "radix",
+    }
+    for (kind, n), expected in cases.items():
+        data = data_gen.generate(kind, n, seed=1)
+        assert choose(data, profile).algorithm == expected
+        assert algorithms.run_algorithm("auto", data)[0] == sorted(data)
+    floats = np.random.default_rng(2).random(3000)
+    assert choose(floats, profile).algorithm == "intro"
+    assert choose(np.sort(floats), profile).algorithm == "natural"
+    assert algorithms.run_algorithm("auto", floats)[0] == sorted(floats.tolist())
+    # A non-integer outside the sample makes radix bail out to introsort.
+    mixed = data_gen.generate("random", 5000, seed=3)
+    mixed[100] = 0.5
+    with caplog.at_level(logging.INFO, logger="sorting_lab.algorithms.auto_sort"):
+        assert algorithms.run_algorithm("auto", mixed)[0] == sorted(mixed)
+    assert "falling back to intro" in caplog.text
+
+    path = save_profile(AutoProfile(radix_min_n=10**9, radix_wide_min_n=10**9), tmp_path / "p.json")
+    random_data = data_gen.generate("random", 5000, seed=1)
+    assert choose(random_data, load_profile(path)).algorithm == "intro"
+    (tmp_path / "bad.json").write_text('{"bogus": 1}')
     with pytest.raises(ValueError):
-        algorithms.run_algorithm("radix", [3, -1, 2])
+        load_profile(tmp_path / "bad.json")
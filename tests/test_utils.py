@@ -18,6 +18,42 @@ def test_partially_sorted_array_is_not_fully_sorted():
     assert arr != sorted(arr)
 
 
+def test_generators_use_independent_seeded_streams():
+    import random
+
+    import numpy as np
+
+    for kind in ("random", "partial", "reverse"):
+        random.seed(1)
+        first = data_gen.generate(kind, 500, seed=9)
+        random.seed(2)
+        assert data_gen.generate(kind, 500, seed=9) == first
+        as_array = data_gen.generate(kind, 500, seed=9, as_array=True)
+        assert isinstance(as_array, np.ndarray) and as_array.dtype == np.int64
+        assert as_array.tolist() == first
+    partial = data_gen.generate("partial", 500, seed=9)
+    assert len(set(partial)) == 500 and sorted(partial) != partial
+
+
+def test_stress_dataset_families():
+    import pytest
+
+    for kind in data_gen.dataset_names():
+        assert len(data_gen.generate(kind, 257, seed=1)) == 257
+        assert data_gen.generate(kind, 0, seed=1) == []
+    assert len(set(data_gen.generate("few_unique", 1000, seed=1, unique=3))) <= 3
+    assert set(data_gen.generate("all_equal", 50)) == {42}
+    assert data_gen.generate("organ_pipe", 7) == [0, 1, 2, 3, 2, 1, 0]
+    assert data_gen.generate("sawtooth", 8, teeth=2) == [0, 1, 2, 3, 0, 1, 2, 3]
+    nearly = data_gen.generate("nearly_sorted", 1000, seed=2, inversions=13)
+    assert sum(a > b for a, b in zip(nearly, nearly[1:])) == 13 and sorted(nearly) == list(range(1000))
+    tail = data_gen.generate("sorted_tail", 100, seed=3, tail=0.25)
+    assert tail[:75] == list(range(75))
+    assert min(data_gen.generate("wide64", 1000, seed=4)) < -(2**62)
+    with pytest.raises(TypeError):
+        data_gen.generate("zipf", 10, bogus=1)
+
+
 def test_generate_rejects_unknown_dataset():
     try:
         data_gen.generate("unknown", 10)
@@ -39,3 +75,482 @@ def test_metrics_measure_and_trials():
     stats = metrics.run_trials(lambda: sum(range(1000)), runs=2)
     assert len(stats.durations) == 2
     assert stats.avg >= 0
+
+
+def test_external_sort_multi_pass_binary_and_text(tmp_path):
+    import numpy as np
+
+    from sorting_lab.utils import external_sort
+
+    values = np.random.default_rng(3).integers(-(10**12), 10**12, size=5000)
+    values.tofile(tmp_path / "in.bin")
+    stats = external_sort.external_sort(
+        tmp_path / "in.bin", tmp_path / "out.bin", algorithm="merge", memory_budget=500 * external_sort.ITEM_COST, fan_in=3
+    )
+    assert stats.items == 5000 and stats.runs == 10 and stats.merge_passes == 3
+    assert np.array_equal(np.fromfile(tmp_path / "out.bin", dtype=np.int64), np.sort(values))
+
+    (tmp_path / "in.txt").write_text("\n".join(map(str, values[:700].tolist())) + "\n")
+    external_sort.external_sort(tmp_path / "in.txt", tmp_path / "out.txt", memory_budget=100 * external_sort.ITEM_COST)
+    assert [int(x) for x in (tmp_path / "out.txt").read_text().split()] == sorted(values[:700].tolist())
+
+
+def test_dataset_files_round_trip_through_memmap(tmp_path):
+    import numpy as np
+
+    from sorting_lab import algorithms
+
+    values = data_gen.generate("random", 300, seed=5)
+    for name, dtype in (("data.npy", "int64"), ("data.i64", "int64"), ("data.u32", "uint32")):
+        path = data_gen.write_dataset(tmp_path / name, values, dtype=dtype)
+        loaded = data_gen.load_dataset(path)
+        assert isinstance(loaded, np.memmap)
+        assert loaded.tolist() == values
+        for key in ("radix", "merge"):
+            assert algorithms.run_algorithm(key, loaded[:200])[0] == sorted(values[:200])
+    try:
+        data_gen.write_dataset(tmp_path / "neg.u32", [-1, 2], dtype="uint32")
+    except ValueError:
+        pass
+    else:  # pragma: no cover - guard against silent failures
+        raise AssertionError("Expected ValueError for values outside uint32")
+
+
+def test_dataset_cache_hits_and_evicts(tmp_path):
+    import numpy as np
+
+    from sorting_lab.utils import dataset_cache
+
+    cache = dataset_cache.DatasetCache(tmp_path, disk_budget=3000, memory_budget=1000)
+    first = cache.get("random", 100, seed=1)
+    assert not first.flags.writeable
+    assert np.array_equal(cache.get("random", 100, seed=1), first)
+    assert (cache.hits, cache.misses) == (1, 1)
+    # A fresh instance (new process) is served from disk.
+    assert np.array_equal(dataset_cache.DatasetCache(tmp_path).get("random", 100, seed=1), first)
+    assert cache.get("random", 100, seed=2).tolist() != first.tolist()
+
+    for seed in range(3, 8):
+        cache.get("random", 100, seed=seed)
+    files = list(tmp_path.glob("*.npy"))
+    assert sum(f.stat().st_size for f in files) <= 3000
+    assert cache._memory_bytes <= 1000
+
+
+def test_chunked_generation_streams_into_files_and_external_sort(tmp_path):
+    import numpy as np
+
+    from sorting_lab.utils import external_sort
+
+    chunks = list(data_gen.iter_chunks("nearly_sorted", 1000, chunk_size=64, seed=1, inversions=40))
+    assert [len(c) for c in chunks] == [64] * 15 + [40]
+    stream = np.concatenate(chunks)
+    assert int((stream[:-1] > stream[1:]).sum()) == 40
+    assert np.array_equal(np.sort(stream), np.arange(1000))
+    partial = np.concatenate(list(data_gen.iter_chunks("partial", 1000, chunk_size=300, seed=2)))
+    assert len(np.unique(partial)) == 1000
+    assert np.array_equal(
+        np.concatenate(list(data_gen.iter_chunks("random", 500, chunk_size=500, seed=3))),
+        data_gen.generate("random", 500, seed=3, as_array=True),
+    )
+
+    for name in ("data.npy", "data.u32"):
+        path = data_gen.write_dataset_chunks(
+            tmp_path / name, data_gen.iter_chunks("zipf", 777, chunk_size=100, seed=4), "uint32", size=777
+        )
+        assert len(data_gen.load_dataset(path)) == 777
+
+    stats = external_sort.sort_chunks(
+        data_gen.iter_chunks("random", 3000, chunk_size=128, seed=5),
+        tmp_path / "sorted.bin",
+        algorithm="merge",
+        memory_budget=500 * external_sort.ITEM_COST,
+        fan_in=4,
+    )
+    assert stats.items == 3000 and stats.runs == 6
+    expected = np.sort(data_gen.generate("random", 3000, seed=5, as_array=True))
+    assert np.array_equal(np.fromfile(tmp_path / "sorted.bin", dtype=np.int64), expected)
+
+
+def test_presortedness_stats_and_runner_columns():
+    import numpy as np
+
+    from sorting_lab.analysis import presortedness, runner
+
+    data = [3, 1, 2, 2, 5, 4, 0]
+    brute = sum(data[i] > data[j] for i in range(len(data)) for j in range(i + 1, len(data)))
+    for values in (data, np.array(data), [str(x) for x in data]):
+        stats = presortedness.analyze(values)
+        assert (stats.ascending_runs, stats.longest_run, stats.inversions) == (4, 4, brute)
+        assert stats.duplicate_ratio == 1 - 6 / 7
+    assert presortedness.analyze(list(range(10, 0, -1))).inversion_ratio == 1.0
+    assert presortedness.analyze(data).value_range == 5
+    nearly = data_gen.generate("nearly_sorted", 5000, seed=1, inversions=9)
+    assert presortedness.count_inversions(nearly) == 9
+    random_values = data_gen.generate("random", 20000, seed=2, as_array=True)
+    exact = presortedness.count_inversions(random_values)
+    estimate = presortedness.analyze(random_values, exact=False)
+    assert not estimate.inversions_exact and abs(estimate.inversions / exact - 1) < 0.02
+
+    df = runner.run_experiments(["merge"], [200], "nearly_sorted", runs=1, save_path=None)
+    assert {"ascending_runs", "inversions", "inversion_ratio", "duplicate_ratio", "value_range"} <= set(df.columns)
+    assert df["min_runs"].iloc[0] == 1 and "runs" not in df.columns
+    assert df["samples"].iloc[0] >= 2
+
+
+def test_measure_modes_keep_tracing_out_of_timings():
+    import tracemalloc
+
+    import pytest
+
+    traced_during_call = []
+
+    def probe():
+        traced_during_call.append(tracemalloc.is_tracing())
+        return [0] * 1000
+
+    timing = metrics.measure(probe, mode="timing")
+    assert (timing.mode, timing.memory_mb, timing.memory_peak_mb) == ("timing", None, None)
+    separate = metrics.measure(probe, mode="separate")
+    assert separate.mode == "separate" and separate.memory_mb is not None
+    assert traced_during_call == [False, False, True]
+
+    traced_during_call.clear()
+    stats = metrics.run_trials(probe, runs=3)
+    assert stats.mode == "separate" and len(stats.durations) == 3
+    assert traced_during_call == [False, False, False, True]
+    assert metrics.run_trials(probe, runs=2, mode="timing").memory_mb is None
+    with pytest.raises(ValueError):
+        metrics.measure(probe, mode="bogus")
+
+
+def test_peak_rss_comes_from_kernel_high_water_mark():
+    import threading
+
+    import pytest
+
+    if metrics.peak_rss_source() != "vmhwm":
+        pytest.skip("VmHWM reset needs Linux /proc/self/clear_refs")
+    threads = threading.active_count()
+    # A short-lived 64 MB spike, freed before the call returns; no sampler thread runs alongside.
+    spike = metrics.measure(lambda: (len(b"x" * (64 << 20)), threading.active_count()), mode="memory")
+    baseline = metrics.measure(lambda: 0, mode="memory")
+    assert spike.memory_peak_mb - baseline.memory_peak_mb > 60
+    assert spike.output[1] == threads
+
+    import tracemalloc
+
+    # In separate mode the RSS peak belongs to the untraced call, the allocation delta to the traced one.
+    def untraced_spike():
+        return len(b"x" * (64 << 20)) if not tracemalloc.is_tracing() else 0
+
+    separate = metrics.measure(untraced_spike, mode="separate")
+    assert separate.memory_peak_mb - baseline.memory_peak_mb > 60
+    assert separate.memory_mb < 1
+    trials = metrics.run_trials(untraced_spike, runs=2)
+    assert trials.memory_peak_mb - baseline.memory_peak_mb > 60
+    assert trials.memory_mb < 1
+
+
+def test_isolated_trials_share_data_and_recycle_workers():
+    import numpy as np
+
+    from sorting_lab.analysis.runner import run_experiments
+    from sorting_lab.utils import isolation
+
+    data = np.arange(2000, 0, -1, dtype=np.int64)
+    with isolation.IsolatedRunner(recycle_after=2) as runner:
+        handle = runner.share(data)
+        assert isinstance(handle, tuple)
+        pids = [runner.run("merge", handle).pid for _ in range(4)]
+        stats = isolation.run_trials(runner, "radix", handle, runs=2)
+        text = runner.run("merge", runner.share(["b", "a"]))
+    # Two tasks per worker: the first four trials span exactly two processes.
+    assert pids[0] == pids[1] != pids[2] == pids[3]
+    assert len(stats.durations) == 2 and stats.memory_mb is not None
+    if metrics.peak_rss_source() == "vmhwm":
+        assert stats.rss_delta_mb is not None
+    assert text.duration > 0
+
+    df = run_experiments(["merge"], [200], "random", runs=1, save_path=None, isolate=True)
+    assert bool(df["isolated"].iloc[0]) and "rss_delta_mb" in df.columns
+
+
+def test_adaptive_trials_batch_reject_outliers_and_report_ci():
+    from sorting_lab.analysis.runner import run_experiments
+
+    durations = [1.0, 1.1, 0.9, 1.0, 1.05, 9.0]
+    summary = metrics.summarize(durations, mad_threshold=3.5)
+    assert summary.outliers == 1 and summary.samples == 5
+    assert summary.min == 0.9 and summary.p5 <= summary.median <= summary.p95 < 9.0
+    assert summary.ci_low < summary.mean < summary.ci_high
+
+    config = metrics.AdaptiveConfig(min_runs=3, max_runs=20, time_budget_s=0.5)
+    calls = [0]
+
+    def tiny() -> None:
+        calls[0] += 1
+
+    stats = metrics.run_trials(tiny, adaptive=config, mode="timing")
+    # A sub-microsecond call is batched until one sample lasts min_sample_s.
+    assert stats.summary.batch > 1
+    assert 3 <= stats.summary.samples + stats.summary.outliers <= 20
+    assert calls[0] >= stats.summary.batch * 3
+
+    df = run_experiments(["merge"], [200], "random", runs=2, save_path=None, adaptive=config)
+    row = df.iloc[0]
+    assert row["samples"] >= 2 and row["ci95_low_s"] <= row["avg_time_s"] <= row["ci95_high_s"]
+    assert row["min_time_s"] <= row["median_time_s"] <= row["p95_time_s"]
+
+
+def test_gc_control_counts_collections_and_restores_state():
+    import gc
+
+    import pytest
+
+    def churn() -> int:
+        # Reference cycles force the cyclic collector to run.
+        for _ in range(20000):
+            a: list = []
+            a.append(a)
+        return 1
+
+    enabled = metrics.measure(churn, mode="timing")
+    assert enabled.gc_collections > 0 and enabled.gc_pause_s > 0
+    disabled = metrics.measure(churn, mode="timing", gc_mode="disabled")
+    assert disabled.gc_collections == 0 and gc.isenabled()
+    frozen = metrics.measure(churn, mode="separate", gc_mode="freeze")
+    assert frozen.gc_collections > 0 and gc.get_freeze_count() == 0
+    stats = metrics.run_trials(churn, runs=2, gc_mode="disabled")
+    assert stats.gc_collections == 0 and stats.gc_mode == "disabled"
+    with pytest.raises(ValueError):
+        metrics.measure(churn, gc_mode="off")
+
+
+def test_complexity_fit_picks_model_and_extrapolates(tmp_path):
+    import math
+
+    import pandas as pd
+
+    from sorting_lab.analysis import complexity, report
+
+    sizes = [1000, 2000, 4000, 8000, 16000]
+    rows = []
+    for n in sizes:
+        rows.append({"algorithm": "quick", "dataset": "random", "size": n, "avg_time_s": 3e-8 * n * math.log2(n)})
+        rows.append({"algorithm": "quick", "dataset": "reverse", "size": n, "avg_time_s": 2e-9 * n * n})
+    rows.append({"algorithm": "merge", "dataset": "random", "size": 1000, "avg_time_s": 1e-3})
+    df = pd.DataFrame(rows)
+
+    fits = complexity.fit_results(df, extrapolate=[100000]).set_index("dataset")
+    # merge has a single size and is skipped.
+    assert list(fits.index) == ["random", "reverse"]
+    assert fits.loc["random", "best_model"] == "n log n" and 1.0 < fits.loc["random", "exponent"] < 1.2
+    assert fits.loc["reverse", "best_model"] == "n^2" and abs(fits.loc["reverse", "exponent"] - 2) < 1e-9
+    assert abs(fits.loc["reverse", "c_n2"] - 2e-9) < 1e-15
+    assert abs(fits.loc["reverse", "predicted_s_100000"] - 20.0) < 1e-6
+
+    results = tmp_path / "results.csv"
+    df.to_csv(results, index=False)
+    report.generate_report(str(results), str(tmp_path / "report.html"), extrapolate=[100000])
+    assert "Karmaşıklık Uyumu" in (tmp_path / "report.html").read_text(encoding="utf-8")
+
+
+def test_history_records_runs_and_compare_flags_regressions(tmp_path, capsys):
+    import pandas as pd
+    import pytest
+
+    from sorting_lab import cli
+    from sorting_lab.analysis import history
+
+    db = tmp_path / "history.sqlite"
+    base = pd.DataFrame(
+        {
+            "algorithm": ["quick", "merge"],
+            "dataset": ["random", "random"],
+            "size": [1000, 1000],
+            "median_time_s": [1.0, 1.0],
+            "ci95_low_s": [0.98, 0.98],
+            "ci95_high_s": [1.02, 1.02],
+            "memory_mb": [2.0, 2.0],
+        }
+    )
+    slow = base.copy()
+    # quick: 30% slower with separated CIs; merge: allocates 50% more.
+    slow.loc[0, ["median_time_s", "ci95_low_s", "ci95_high_s"]] = [1.3, 1.28, 1.32]
+    slow.loc[1, "memory_mb"] = 3.0
+    first = history.record_run(base, db, commit="abc1234")
+    second = history.record_run(slow, db, commit="def5678", label="candidate")
+    assert (first, second) == (1, 2)
+    runs = history.list_runs(db)
+    assert list(runs["cells"]) == [2, 2] and runs["machine"].nunique() == 1
+
+    meta, rows = history.load_run(db, "abc")
+    assert meta["id"] == 1 and len(rows) == 2
+    cells = history.compare_runs(rows, history.load_run(db, "latest")[1]).set_index("algorithm")
+    assert cells.loc["quick", "slower"] and not cells.loc["quick", "more_memory"]
+    assert cells.loc["merge", "more_memory"] and not cells.loc["merge", "slower"]
+
+    cli.main(["compare", "latest", "latest", "--db", str(db)])
+    with pytest.raises(SystemExit) as exc:
+        cli.main(["compare", "abc1234", "--db", str(db)])
+    assert exc.value.code == 1
+    assert "2 of 2 cells regressed." in capsys.readouterr().out
+
+    # With sample percentiles a higher median is not enough: the fastest candidate
+    # sample must clear both the baseline's fastest (by the threshold) and its p95.
+    spread = base.assign(variant="", min_time_s=[0.9, 0.9], p95_time_s=[1.2, 1.2])
+    drift = spread.assign(median_time_s=[1.3, 1.3], min_time_s=[1.1, 1.4])
+    cells = history.compare_runs(spread, drift).set_index("algorithm")
+    assert not cells.loc["quick", "slower"] and cells.loc["merge", "slower"]
+    # No absolute floor: a sub-millisecond cell that gets 10x slower is still caught.
+    tiny = spread.assign(median_time_s=[1e-4, 1e-4], min_time_s=[9e-5, 9e-5], p95_time_s=[1.2e-4, 1.2e-4])
+    tenfold = tiny.assign(median_time_s=[1e-3, 1e-4], min_time_s=[9e-4, 9e-5], p95_time_s=[1.2e-3, 1.2e-4])
+    cells = history.compare_runs(tiny, tenfold).set_index("algorithm")
+    assert cells.loc["quick", "slower"] and not cells.loc["merge", "slower"]
+
+
+def test_compare_passes_two_runs_of_the_same_code(tmp_path, capsys):
+    import pandas as pd
+
+    from sorting_lab import cli
+    from sorting_lab.analysis import history
+
+    # Recorded from two runs of unchanged code on one machine: the small cells'
+    # medians drift by 20-60%, but each candidate's fastest sample stays within
+    # the baseline's spread.
+    db = str(tmp_path / "history.sqlite")
+    base = pd.DataFrame(
+        {
+            "algorithm": ["quick", "merge", "quick", "merge"],
+            "dataset": ["random"] * 4,
+            "size": [200, 400, 800, 8000],
+            "median_time_s": [0.000114, 0.000880, 0.000774, 0.0231],
+            "min_time_s": [0.000112, 0.000678, 0.000752, 0.0224],
+            "p95_time_s": [0.000190, 0.001101, 0.000987, 0.0262],
+            "memory_mb": [0.01, 0.02, 0.03, 0.6],
+        }
+    )
+    cand = base.assign(
+        median_time_s=[0.000177, 0.001420, 0.000967, 0.0250],
+        min_time_s=[0.000128, 0.000808, 0.000945, 0.0231],
+        p95_time_s=[0.000199, 0.001530, 0.001006, 0.0271],
+    )
+    history.record_run(base, db, commit="abc1234")
+    history.record_run(cand, db, commit="abc1234")
+    cli.main(["compare", "1", "2", "--db", db])
+    assert "0 of 4 cells regressed." in capsys.readouterr().out
+
+
+def test_gap_sweep_requires_shell_sort():
+    import pytest
+
+    from sorting_lab import cli
+    from sorting_lab.analysis.runner import run_experiments
+
+    with pytest.raises(SystemExit, match="add shell to --algos"):
+        cli.main(["--algos", "quick", "--sizes", "10", "--gaps", "ciura", "--save", "", "--history", ""])
+    with pytest.raises(ValueError):
+        run_experiments(["quick"], [10], "random", save_path=None, gap_sequences=["ciura"])
+    df = run_experiments(["shell"], [50], "random", runs=2, save_path=None, gap_sequences=["ciura", "knuth"])
+    assert sorted(df["gap_sequence"]) == ["ciura", "knuth"]
+
+
+def test_instrumentation_overhead_times_the_same_implementation(monkeypatch):
+    from sorting_lab import algorithms
+    from sorting_lab.analysis import runner
+
+    calls = []
+    real_run = algorithms.run_algorithm
+
+    def spy(key, data, **options):
+        calls.append((key, options.get("backend"), options.get("record_steps", False)))
+        return real_run(key, data, **options)
+
+    monkeypatch.setattr(algorithms, "run_algorithm", spy)
+    df = runner.run_instrumentation_overhead(["radix", "auto", "quick"], [500], "random", runs=1)
+    assert df["algorithm"].tolist() == ["radix", "quick"]
+    assert {(backend, recorded) for key, backend, recorded in calls if key == "radix"} == {
+        ("python", False),
+        ("python", True),
+    }
+
+
+def test_worker_scaling_requires_parallel_algorithms():
+    import pytest
+
+    from sorting_lab import cli
+    from sorting_lab.analysis.runner import run_scaling
+
+    with pytest.raises(SystemExit, match="drop quick,merge from --algos"):
+        cli.main(["--algos", "quick,merge", "--sizes", "1000", "--workers", "1,2"])
+    with pytest.raises(ValueError):
+        run_scaling(["radix", "quick"], [1000], "random", [1, 2], runs=1)
+    df = run_scaling(["radix"], [1000], "random", [2], runs=1)
+    assert df["workers"].tolist() == [1, 2]
+
+
+def test_comparison_counts_cover_parallel_algorithms(monkeypatch):
+    import os
+
+    import numpy as np
+    import pandas as pd
+
+    from sorting_lab import algorithms
+    from sorting_lab.analysis.runner import run_experiments
+
+    # workers defaults to the CPU count; make sure the pool path would be taken.
+    monkeypatch.setattr(os, "cpu_count", lambda: 2)
+    df = run_experiments(["parallel_merge", "radix"], [500], "random", runs=1, save_path=None, count_comparisons=True)
+    counts = dict(zip(df["algorithm"], df["comparisons"]))
+    assert counts["parallel_merge"] > 0 and pd.isna(counts["radix"])
+    for items in ([], [7], np.array([7])):
+        result, _ = algorithms.run_algorithm("parallel_merge", items, workers=2)
+        assert all(type(v) is int for v in result)
+
+
+def test_sort_file_reports_overflow_and_io_errors(tmp_path):
+    import pytest
+
+    from sorting_lab import cli
+
+    out = str(tmp_path / "out.bin")
+    with pytest.raises(SystemExit, match="int32"):
+        cli.main(["sort-file", "--generate", "wide64", "--size", "1000", "--dtype", "int32", out])
+    with pytest.raises(SystemExit, match="No such file"):
+        cli.main(["sort-file", str(tmp_path / "missing.bin"), out])
+    with pytest.raises(SystemExit, match="No such file"):
+        cli.main(["sort-file", "--generate", "random", "--size", "10", str(tmp_path / "no" / "dir" / "out.bin")])
+
+
+def test_sort_file_keeps_dataset_files_loadable(tmp_path, capsys):
+    import numpy as np
+
+    from sorting_lab import cli
+
+    for name, dtype in (("d.npy", "int64"), ("d.bin", "int64"), ("d.u32", "uint32")):
+        source = tmp_path / name
+        out = tmp_path / f"out-{name}"
+        cli.main(["make-dataset", "random", "1000", str(source), "--dtype", dtype, "--seed", "4"])
+        cli.main(["sort-file", str(source), str(out), "--format", "binary", "--memory-mb", "1", "--algo", "merge"])
+        assert "items:            1000" in capsys.readouterr().out
+        result = data_gen.load_dataset(out)
+        assert result.dtype == data_gen.load_dataset(source).dtype
+        assert np.array_equal(result, np.sort(data_gen.load_dataset(source)))
+
+
+def test_sort_file_generate_writes_dataset_files(tmp_path, capsys):
+    import numpy as np
+    import pytest
+
+    from sorting_lab import cli
+
+    expected = np.sort(data_gen.generate("zipf", 3000, seed=6, as_array=True))
+    for name, extra in (("out.npy", []), ("out.bin", ["--format", "dataset"]), ("out.u32", ["--format", "dataset"])):
+        dtype = "uint32" if name.endswith("u32") else "int64"
+        argv = ["sort-file", "--generate", "zipf", "--size", "3000", "--seed", "6", str(tmp_path / name)]
+        cli.main(argv + ["--dtype", dtype, "--memory-mb", "1", "--algo", "merge"] + extra)
+        result = data_gen.load_dataset(tmp_path / name)
+        assert result.dtype == np.dtype(dtype) and np.array_equal(result, expected)
+    with pytest.raises(SystemExit, match="Dataset files hold"):
+        cli.main(["sort-file", "--generate", "random", "--size", "10", "--dtype", "int32", str(tmp_path / "x.npy")])